@@ -1,10 +1,22 @@
-from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QComboBox, QPushButton, QTimeEdit, QFileDialog
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QComboBox, QPushButton, QTimeEdit, QFileDialog, QMessageBox
 from PyQt6.QtCore import QTime
-import json
+from recurrence import RecurrenceError, validate_rule
+from reminder_core.model import PRIORITIES, QT_TIME_FORMAT
+
+# 重複規則的預設選項 (顯示文字, 規則字串),None 代表自訂規則
+REPEAT_PRESETS = [
+    ("每天", ""),
+    ("平日", "weekdays"),
+    ("週末", "weekly:5,6"),
+    ("每 30 分鐘", "every:30"),
+    ("每月 1 日", "monthly:1"),
+    ("自訂", None),
+]
 
 class AddReminderDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.reminder = None  # 儲存後的提醒事件
         self.init_UI()
 
     def init_UI(self):
@@ -19,6 +31,7 @@ class AddReminderDialog(QDialog):
         time_layout = QHBoxLayout()
         time_label = QLabel("時間:")
         self.time_edit = QTimeEdit()
+        self.time_edit.setDisplayFormat(QT_TIME_FORMAT)  # 24 小時制並可設定秒數,與儲存格式一致
         self.time_edit.setTime(QTime.currentTime())
         time_layout.addWidget(time_label)
         time_layout.addWidget(self.time_edit)
@@ -41,6 +54,44 @@ class AddReminderDialog(QDialog):
         type_layout.addWidget(self.type_combo)
         main_layout.addLayout(type_layout)
 
+        # 建立重複規則選擇框
+        repeat_layout = QHBoxLayout()
+        repeat_label = QLabel("重複:")
+        self.repeat_combo = QComboBox()
+        for text, rule in REPEAT_PRESETS:
+            self.repeat_combo.addItem(text, rule)
+        self.repeat_edit = QLineEdit()
+        self.repeat_edit.setPlaceholderText("例如 weekly:0,2,4 或 cron:0 9 * * 1-5")
+        self.repeat_edit.setEnabled(False)
+        self.repeat_combo.currentIndexChanged.connect(
+            lambda: self.repeat_edit.setEnabled(self.repeat_combo.currentData() is None)
+        )
+        repeat_layout.addWidget(repeat_label)
+        repeat_layout.addWidget(self.repeat_combo)
+        repeat_layout.addWidget(self.repeat_edit)
+        main_layout.addLayout(repeat_layout)
+
+        # 建立群組選擇框,可以直接輸入新的群組名稱
+        group_layout = QHBoxLayout()
+        group_label = QLabel("群組:")
+        self.group_combo = QComboBox()
+        self.group_combo.setEditable(True)
+        self.group_combo.lineEdit().setPlaceholderText("不分組")
+        group_layout.addWidget(group_label)
+        group_layout.addWidget(self.group_combo)
+        main_layout.addLayout(group_layout)
+
+        # 建立優先順序選擇框,同時觸發多個提醒時優先顯示高優先順序的提醒
+        priority_layout = QHBoxLayout()
+        priority_label = QLabel("優先順序:")
+        self.priority_combo = QComboBox()
+        for priority in PRIORITIES:
+            self.priority_combo.addItem(priority, "" if priority == "一般" else priority)  # 「一般」存成空字串
+        self.priority_combo.setCurrentText("一般")
+        priority_layout.addWidget(priority_label)
+        priority_layout.addWidget(self.priority_combo)
+        main_layout.addLayout(priority_layout)
+
         # 建立提醒圖片輸入框
         image_layout = QHBoxLayout()
         image_label = QLabel("提醒圖片:")
@@ -62,6 +113,28 @@ class AddReminderDialog(QDialog):
         button_layout.addWidget(cancel_button)
         main_layout.addLayout(button_layout)
 
+    def reset(self):
+        """
+        清空欄位,讓對話框可以重複使用。
+        """
+        self.reminder = None
+        self.time_edit.setTime(QTime.currentTime())
+        self.action_edit.clear()
+        self.type_combo.setCurrentIndex(0)
+        self.repeat_combo.setCurrentIndex(0)
+        self.repeat_edit.clear()
+        self.priority_combo.setCurrentText("一般")
+        self.image_edit.clear()
+
+    def set_groups(self, names):
+        """
+        更新群組選項並清空目前的選擇。
+        """
+        self.group_combo.clear()
+        self.group_combo.addItems(names)
+        self.group_combo.setCurrentIndex(-1)
+        self.group_combo.clearEditText()
+
     def select_image(self):
         """
         選擇提醒圖片。
@@ -70,33 +143,33 @@ class AddReminderDialog(QDialog):
         file_dialog.setNameFilter("Image files (*.png *.jpg *.gif)")
         file_dialog.setFileMode(QFileDialog.FileMode.ExistingFiles)
 
-        if file_dialog.exec() == QFileDialog.AcceptMode.AcceptOpen:
+        if file_dialog.exec() == QDialog.DialogCode.Accepted:
             selected_files = file_dialog.selectedFiles()
             if selected_files:
                 self.image_edit.setText(selected_files[0])  # 顯示選擇的圖片路徑
 
     def save_reminder(self):
         """
-        儲存提醒到 JSON 檔案。
+        建立提醒事件並關閉對話框,由呼叫端寫入儲存後端。
         """
+        repeat = self.repeat_combo.currentData()
+        if repeat is None:
+            repeat = self.repeat_edit.text().strip()
+        try:
+            validate_rule(repeat)
+        except RecurrenceError as error:
+            QMessageBox.warning(self, "重複規則錯誤", str(error))
+            return
+
         reminder = {
-            'time': self.time_edit.time().toString("HH:mm:ss"),
+            'time': self.time_edit.time().toString(QT_TIME_FORMAT),
             'action': self.action_edit.text(),
             'type': self.type_combo.currentText(),
-            'image': self.image_edit.text()
+            'image': self.image_edit.text(),
+            'repeat': repeat,
+            'group': self.group_combo.currentText().strip(),
+            'priority': self.priority_combo.currentData()
         }
 
-        # 讀取現有的提醒檔案
-        try:
-            with open('reminders.json', 'r', encoding='utf-8') as file:
-                reminders = json.load(file)
-        except FileNotFoundError:
-            reminders = []
-
-        reminders.append(reminder)
-
-        # 儲存回 JSON 檔案
-        with open('reminders.json', 'w', encoding='utf-8') as file:
-            json.dump(reminders, file, ensure_ascii=False, indent=4)
-
+        self.reminder = reminder
         self.accept()  # 關閉對話框
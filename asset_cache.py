@@ -0,0 +1,96 @@
+import os
+from collections import OrderedDict
+
+from PyQt6.QtGui import QMovie
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_PRELOAD_MINUTES = 5
+
+
+class AssetCache:
+    """
+    提醒圖片的 LRU 快取。
+    相同路徑的提醒共用同一份資源;超過記憶體上限時淘汰最久未使用的項目。
+    音效不在這裡快取,由 media_playback.PlaybackService 在播放執行緒中預先載入與播放。
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # (種類, 路徑) -> (資源, 估計位元組數)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _get(self, kind, path, loader):
+        key = (kind, path)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[0]
+        self.misses += 1
+        asset, size = loader(path)
+        self._entries[key] = (asset, size)
+        self.bytes += size
+        self._evict()
+        return asset
+
+    def _evict(self):
+        # 至少保留最新的一個項目,避免單一大檔案反覆載入
+        while self.bytes > self.max_bytes and len(self._entries) > 1:
+            _, (asset, size) = self._entries.popitem(last=False)
+            self.bytes -= size
+            self.evictions += 1
+            if hasattr(asset, "deleteLater"):
+                asset.deleteLater()
+
+    def movie(self, path):
+        """
+        取得已預先解碼所有影格的 QMovie。
+        """
+        return self._get("movie", path, load_movie)
+
+    def preload(self, reminders):
+        """
+        預先載入彈窗提醒使用的圖片,讓觸發時不必等待磁碟讀取與解碼。
+        """
+        for reminder in reminders:
+            path = reminder.get("image")
+            if reminder.get("type") == "彈幕" or not path or not os.path.exists(path):
+                continue
+            key = ("movie", path)
+            if key in self._entries:
+                self._entries.move_to_end(key)  # 預載不計入命中統計
+            else:
+                self._get("movie", path, load_movie)
+
+    def stats(self):
+        """
+        回傳命中率與記憶體使用統計。
+        """
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+
+def load_movie(path):
+    """
+    讀取動畫並解碼全部影格到記憶體,回傳 (QMovie, 估計位元組數)。
+    """
+    movie = QMovie(path)
+    movie.setCacheMode(QMovie.CacheMode.CacheAll)
+    frame_count = max(movie.frameCount(), 1)
+    for frame in range(frame_count):
+        movie.jumpToFrame(frame)
+    movie.jumpToFrame(0)
+    size = movie.currentPixmap().size()
+    return movie, size.width() * size.height() * 4 * frame_count
+
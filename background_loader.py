@@ -0,0 +1,54 @@
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from reminder_client import ReminderClient
+from reminder_store import ReminderStore
+
+
+def reminder_loader(store=None, client=None):
+    """
+    回傳可在背景執行緒呼叫的讀取函式。
+    背景執行緒使用自己的連線;記憶體資料庫無法跨執行緒共用,此時回傳 None。
+    """
+    if client is not None:
+        path = client.path
+
+        def load():
+            thread_client = ReminderClient(path)
+            try:
+                return thread_client.list()
+            finally:
+                thread_client.close()
+
+        return load
+    if store.path == ":memory:":
+        return None
+
+    def load():
+        thread_store = ReminderStore(store.path, legacy_json=None)
+        try:
+            return thread_store.load()
+        finally:
+            thread_store.close()
+
+    return load
+
+
+class BackgroundLoader(QThread):
+    """
+    在背景執行緒讀取提醒事件,完成後透過 loaded 訊號送回 GUI 執行緒。
+    """
+
+    loaded = pyqtSignal(list)
+    failed = pyqtSignal(str)
+
+    def __init__(self, load, parent=None):
+        super().__init__(parent)
+        self.load = load
+
+    def run(self):
+        try:
+            reminders = self.load()
+        except Exception as error:
+            self.failed.emit(str(error))
+            return
+        self.loaded.emit(reminders)
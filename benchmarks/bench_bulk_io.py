@@ -0,0 +1,53 @@
+"""
+量測批次匯入/匯出的吞吐量(每秒筆數)。
+
+用法: python benchmarks/bench_bulk_io.py [筆數]
+"""
+import csv
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_common import synthetic_reminders
+from bulk_io import export_file, import_file
+from reminder_store import FIELDS, ReminderStore
+
+
+def write_inputs(directory, count):
+    reminders = synthetic_reminders(count, rules=("",))
+    csv_path = os.path.join(directory, "input.csv")
+    with open(csv_path, "w", encoding="utf-8", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(reminders)
+    jsonl_path = os.path.join(directory, "input.jsonl")
+    with open(jsonl_path, "w", encoding="utf-8") as file:
+        for reminder in reminders:
+            file.write(json.dumps(reminder, ensure_ascii=False) + "\n")
+    return csv_path, jsonl_path
+
+
+def main(count):
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path, jsonl_path = write_inputs(directory, count)
+        for path in (csv_path, jsonl_path):
+            name = os.path.splitext(path)[1]
+            store = ReminderStore(os.path.join(directory, "bench%s.db" % name), legacy_json=None)
+            start = time.perf_counter()
+            report = import_file(store, path)
+            elapsed = time.perf_counter() - start
+            print("匯入 %-6s %d 筆: %.1f s, %.0f 筆/秒 (重複 %d)" % (name, report.read, elapsed, report.read / elapsed, report.duplicates))
+
+            start = time.perf_counter()
+            exported = export_file(store, os.path.join(directory, "export%s" % name))
+            elapsed = time.perf_counter() - start
+            print("匯出 %-6s %d 筆: %.1f s, %.0f 筆/秒" % (name, exported, elapsed, exported / elapsed))
+            store.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,80 @@
+"""
+基準測試共用的合成資料與計時函式。各腳本先把專案根目錄加入 sys.path 再匯入本模組。
+"""
+import random
+import time
+from datetime import datetime
+
+from reminder_store import PRIORITIES
+
+PHRASES = ("喝水", "起來走動", "開會", "午餐", "寫週報", "看信箱", "stand up", "daily standup", "review PR", "打電話給客戶", "吃藥", "休息眼睛")
+RULES = ("", "", "", "weekdays", "weekly:5,6", "every:15", "every:60", "monthly:1", "cron:*/30 9-17 * * 1-5")
+START = datetime(2024, 3, 4, 8, 0, 0).timestamp()
+
+
+def synthetic_reminders(count, seed=0, rules=RULES):
+    """
+    產生 count 筆提醒,時間、重複規則、類型與內容隨機但可重現。
+    rules=("",) 時每筆每天只觸發一次。
+    """
+    rng = random.Random(seed)
+    return [
+        {
+            "id": index + 1,
+            "time": "%02d:%02d:%02d" % (rng.randrange(24), rng.randrange(60), rng.randrange(60)),
+            "action": "%s %d" % (rng.choice(PHRASES), index),
+            "type": rng.choice(("彈窗", "彈幕")),
+            "image": "",
+            "repeat": rng.choice(rules),
+        }
+        for index in range(count)
+    ]
+
+
+def grouped_reminders(count, group_size):
+    """
+    產生 count 筆從 START 開始每秒一筆的提醒,每 group_size 筆為一個群組。
+    """
+    return [
+        {
+            "id": index + 1,
+            "time": "%02d:%02d:%02d" % (8 + index // 3600 % 12, index // 60 % 60, index % 60),
+            "action": "提醒 %d" % index,
+            "type": "彈窗",
+            "image": "",
+            "repeat": "",
+            "group": "群組 %d" % (index // group_size),
+        }
+        for index in range(count)
+    ]
+
+
+def burst_reminders(count, distinct):
+    """
+    產生同一秒觸發的 count 筆提醒(distinct 種內容,優先順序混合),再加上一秒後到期的下一個提醒。
+    """
+    reminders = [
+        {
+            "id": index + 1,
+            "time": "09:00:00",
+            "action": "提醒 %d" % (index % distinct),
+            "type": "彈窗",
+            "image": "",
+            "priority": PRIORITIES[index % distinct % len(PRIORITIES)],
+        }
+        for index in range(count)
+    ]
+    reminders.append({"id": count + 1, "time": "09:00:01", "action": "下一個提醒", "type": "彈窗", "image": ""})
+    return reminders
+
+
+def timed_ms(func, repeat=1):
+    """
+    執行 func repeat 次,回傳 (最快一次的耗時 ms, 最後一次的結果)。
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
@@ -0,0 +1,91 @@
+"""
+突發模式:同一秒觸發大量提醒(內容有重複、優先順序混合),再加上一秒後到期的下一個提醒。
+比較逐一阻塞顯示(舊版 checkReminders 對每筆呼叫 msg.exec())與 DispatchQueue:
+量測排程器路徑的耗時、下一個提醒被延誤的時間,以及佇列的合併、去重、丟棄與顯示順序。
+
+用法: python benchmarks/bench_dispatch.py [提醒數量] [不同內容數量]
+"""
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_common import burst_reminders
+from reminder_core.dispatch import DispatchQueue, Dispatcher, priority_rank
+from reminder_scheduler import ReminderScheduler
+from reminder_store import PRIORITIES
+from simulated_clock import SimulatedClock
+
+START = datetime(2024, 3, 4, 8, 59, 0).timestamp()
+USER_SECONDS = 2  # 舊版每個強制回應視窗等待使用者關閉的時間
+
+
+def run(reminders, queue, clock, notify, blocking=False):
+    """
+    觸發同一秒的提醒,回傳 (dispatcher, pop_due() 耗時 ms, dispatch() 耗時 ms, 下一個提醒延誤的秒數)。
+    blocking 時在 dispatch() 裡直接顯示(舊做法),否則由呼叫端在排程器之外 drain()。
+    """
+    scheduler = ReminderScheduler(reminders, now=clock.time)
+    dispatcher = Dispatcher(queue=queue)
+    dispatcher.attach(notify=notify)
+    if not blocking:
+        dispatcher.wake = lambda: None
+    clock.advance_to(scheduler.next_due())
+    start = time.perf_counter()
+    fired = scheduler.pop_due()
+    pop_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    for reminder in fired:
+        dispatcher.dispatch(reminder)
+    dispatch_ms = (time.perf_counter() - start) * 1000
+    due = scheduler.next_due()
+    clock.advance_to(due)
+    late = clock.time() - due
+    scheduler.pop_due()
+    return dispatcher, pop_ms, dispatch_ms, late
+
+
+def main(count, distinct):
+    reminders = burst_reminders(count, distinct)
+    print("同一秒觸發 %d 個提醒(%d 種內容,%s 各佔三分之一),一秒後還有一個提醒" % (count, distinct, "/".join(PRIORITIES)))
+
+    # 舊做法:沒有速率限制與去重,每則通知都阻塞到使用者關閉
+    clock = SimulatedClock(START)
+    unlimited = DispatchQueue(rate=1e9, burst=count + 1, dedup_seconds=0, max_depth=count + 2, now=clock.time)
+    _, _, _, late = run(reminders, unlimited, clock, lambda *args, **kwargs: clock.advance(USER_SECONDS), blocking=True)
+    print("逐一阻塞顯示: 顯示 %d 則,下一個提醒延誤 %.0f 秒" % (count, late))
+
+    clock = SimulatedClock(START)
+    queue = DispatchQueue(now=clock.time)
+    shown = []
+    dispatcher, pop_ms, dispatch_ms, late = run(reminders, queue, clock, lambda message, **kwargs: shown.append((clock.time(), message)))
+    print("DispatchQueue: pop_due() %.2f ms,排入佇列 %.2f ms(每筆 %.2f µs),下一個提醒延誤 %.0f 秒" % (
+        pop_ms, dispatch_ms, dispatch_ms * 1000 / count, late))
+
+    # 以模擬時間 drain 到佇列清空
+    start = time.perf_counter()
+    drain_calls = 0
+    while True:
+        seconds = dispatcher.drain()
+        drain_calls += 1
+        if seconds is None:
+            break
+        clock.advance(seconds)
+    drain_ms = (time.perf_counter() - start) * 1000
+    first = shown[0][0]
+    print("顯示 %d 則,前 10 秒 %d 則,全部顯示完 %.0f 秒;drain() %d 次共 %.2f ms" % (
+        len(shown), sum(1 for at, _ in shown if at - first < 10), shown[-1][0] - first, drain_calls, drain_ms))
+    print("佇列統計: %s" % queue.stats())
+
+    ranks = {reminder["action"]: priority_rank(reminder) for reminder in reminders}
+    order = [ranks[message] for at, message in shown]
+    print("顯示順序: %s" % ("依優先順序" if order == sorted(order) else "錯誤 %s" % order))
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 10000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 100,
+    )
@@ -0,0 +1,71 @@
+"""
+量測群組啟用/停用與稍後提醒的成本:
+切換一個群組只寫入 groups 表的一列,與逐筆改寫群組內的提醒(舊做法)比較;
+另外量測排程器在觸發時檢查停用群組的額外成本,以及插入稍後提醒的成本。
+
+用法: python benchmarks/bench_groups.py [提醒數量] [群組大小]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_common import START, grouped_reminders, timed_ms
+from reminder_scheduler import ReminderScheduler
+from reminder_store import ReminderStore
+from simulated_clock import SimulatedClock
+
+def run_scheduler(reminders, disabled):
+    # 以模擬時鐘跑完一小時內的所有觸發,回傳 (觸發次數, 耗時 ms)
+    clock = SimulatedClock(START)
+    scheduler = ReminderScheduler(reminders, now=clock.time)
+    scheduler.disabled_groups = disabled
+    fired = 0
+    elapsed = 0.0
+    while True:
+        due = scheduler.next_due()
+        if due is None or due > START + 3600:
+            break
+        clock.advance_to(due)
+        start = time.perf_counter()
+        fired += len(scheduler.pop_due())
+        elapsed += time.perf_counter() - start
+    return fired, elapsed * 1000
+
+
+def main(count, group_size):
+    reminders = grouped_reminders(count, group_size)
+    group = reminders[0]["group"]
+    members = [reminder for reminder in reminders if reminder["group"] == group]
+    print("提醒數 %d,群組大小 %d" % (count, len(members)))
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = ReminderStore(os.path.join(directory, "reminders.db"), legacy_json=None)
+        store.add_many(reminders)
+        toggle_ms, _ = timed_ms(lambda: store.set_group_enabled(group, False))
+        print("切換群組(一列): %.3f ms" % toggle_ms)
+
+        # 舊做法:每筆提醒各自帶旗標,停用群組要逐筆改寫
+        def rewrite():
+            with store.conn:
+                store.conn.executemany("UPDATE reminders SET action = action || '' WHERE id = ?", [(reminder["id"],) for reminder in members])
+
+        print("逐筆改寫群組內的提醒: %.3f ms" % timed_ms(rewrite)[0])
+        store.close()
+
+    fired, enabled_ms = run_scheduler(reminders, set())
+    print("排程一小時(全部啟用): %d 次觸發 %.1f ms" % (fired, enabled_ms))
+    fired, disabled_ms = run_scheduler(reminders, {group})
+    print("排程一小時(停用 %s): %d 次觸發 %.1f ms" % (group, fired, disabled_ms))
+
+    clock = SimulatedClock(START)
+    scheduler = ReminderScheduler(reminders, now=clock.time)
+    snooze_ms, _ = timed_ms(lambda: [scheduler.snooze(reminder, 600) for reminder in members])
+    print("稍後提醒: 每筆 %.2f µs" % (snooze_ms * 1000 / len(members)))
+
+
+if __name__ == "__main__":
+    arguments = [int(argument) for argument in sys.argv[1:]]
+    main(arguments[0] if arguments else 100000, arguments[1] if len(arguments) > 1 else 10000)
@@ -0,0 +1,82 @@
+"""
+量測觸發紀錄:record() 在 GUI 執行緒上的成本、批次寫入的速度,
+以及報表從每日/每月統計讀取與直接彙總原始事件的比較(壓縮前後)。
+
+用法: python benchmarks/bench_history.py [提醒數量] [天數] [每天觸發次數]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_common import timed_ms
+from fire_history import EVENT_KINDS, FireHistory, day_key
+
+OUTCOMES = ("dismissed", "dismissed", "dismissed", "snoozed", "missed")
+
+
+def scan_summary(history, start, end):
+    # 沒有每日統計時的做法:每次開啟報表都彙總原始事件
+    rows = history.conn.execute(
+        "SELECT reminder_id, kind, COUNT(*) FROM events WHERE time >= ? AND time < ? GROUP BY reminder_id, kind", (start, end)
+    ).fetchall()
+    result = {}
+    for reminder_id, kind, count in rows:
+        result.setdefault(reminder_id, dict.fromkeys(EVENT_KINDS, 0))[EVENT_KINDS[kind]] = count
+    return result
+
+
+def main(reminders, days, per_day):
+    rng = random.Random(0)
+    end = datetime(2024, 12, 31, 23, 0).timestamp()
+    start = end - days * 86400
+    with tempfile.TemporaryDirectory() as directory:
+        history = FireHistory(os.path.join(directory, "history.db"), threaded=False)
+        # 產生 days 天的事件,每天每個提醒觸發 per_day 次並有一個回應
+        total = 0
+        record_s = 0.0
+        for day in range(days):
+            events = []
+            for reminder_id in range(1, reminders + 1):
+                for fire in range(per_day):
+                    moment = start + day * 86400 + fire * 3600 + reminder_id % 3600
+                    events.append((reminder_id, "fired", moment))
+                    events.append((reminder_id, rng.choice(OUTCOMES), moment + 30))
+            started = time.perf_counter()
+            for reminder_id, kind, moment in events:
+                history.record(reminder_id, kind, moment)
+            record_s += time.perf_counter() - started
+            history.flush()
+            total += len(events)
+        print("%d 個提醒 × %d 天 × 每天 %d 次:%d 筆事件" % (reminders, days, per_day, total))
+        print("record(): 每筆 %.2f µs(GUI 執行緒上的成本)" % (record_s * 1e6 / total))
+
+        for _ in range(10000):
+            history.record(1, "fired", end)
+        flush_ms, _ = timed_ms(history.flush)
+        print("批次寫入 10000 筆: %.1f ms" % flush_ms)
+
+        today = datetime.fromtimestamp(end).replace(hour=0)
+        for label, days_back in (("今天", 1), ("最近 30 天", 30), ("最近一年", 365)):
+            first = (today - timedelta(days=days_back - 1)).timestamp()  # 當地午夜
+            scan_ms, expected = timed_ms(lambda: scan_summary(history, first, end + 3600))
+            rollup_ms, summary = timed_ms(lambda: history.summary(day_key(first), day_key(end)))
+            check = "" if summary == expected else "  <-- 結果不一致"
+            print("報表 %-8s 彙總原始事件 %8.1f ms,統計表 %6.2f ms%s" % (label, scan_ms, rollup_ms, check))
+
+        compact_ms, deleted = timed_ms(lambda: history.compact(now=end))
+        print("壓縮: 刪除 %d 筆原始事件 %.1f ms" % (deleted, compact_ms))
+        rollup_ms, summary = timed_ms(lambda: history.summary(day_key(end - 365 * 86400 + 1), day_key(end)))
+        print("壓縮後報表(最近一年)統計表 %.2f ms,提醒 1 觸發 %d 次" % (rollup_ms, summary[1]["fired"]))
+        history.close()
+        print("檔案大小: %.1f MB" % (os.path.getsize(os.path.join(directory, "history.db")) / 1e6))
+
+
+if __name__ == "__main__":
+    arguments = [int(argument) for argument in sys.argv[1:]]
+    defaults = [100, 365, 8]
+    main(*(arguments + defaults[len(arguments):]))
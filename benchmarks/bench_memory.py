@@ -0,0 +1,54 @@
+"""
+以 tracemalloc 比較「每筆一個 dict」與 CompactReminders 欄位陣列的記憶體用量。
+
+用法: python benchmarks/bench_memory.py [提醒數量]
+"""
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compact_reminders import CompactReminders
+
+TYPES = ["彈窗", "彈幕"]
+IMAGES = ["", "images/drink_water.gif", "images/tea_time.gif", "images/meditation.gif"]
+
+
+def generate(count, seed=0):
+    # 模擬從 JSON 讀入的資料:每筆的字串都是獨立的物件
+    rng = random.Random(seed)
+    for index in range(count):
+        yield {
+            "time": "%02d:%02d:%02d" % (rng.randrange(24), rng.randrange(60), rng.randrange(60)),
+            "action": "提醒 %d" % index,
+            "type": "".join(rng.choice(TYPES)),
+            "image": "".join(rng.choice(IMAGES)),
+        }
+
+
+def measure(build):
+    tracemalloc.start()
+    start = time.perf_counter()
+    data = build()
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return data, current, elapsed
+
+
+def main(count):
+    dicts, dict_bytes, dict_seconds = measure(lambda: list(generate(count)))
+    del dicts
+    compact, compact_bytes, compact_seconds = measure(lambda: CompactReminders(generate(count)))
+    assert len(compact) == count and compact[0]["time"]
+    print("%d 筆提醒" % count)
+    print("dict 列表:        %8.1f MB (%.0f bytes/筆), 建立 %.2f s" % (dict_bytes / 1e6, dict_bytes / count, dict_seconds))
+    print("CompactReminders: %8.1f MB (%.0f bytes/筆), 建立 %.2f s" % (compact_bytes / 1e6, compact_bytes / count, compact_seconds))
+    print("節省 %.1f%%" % (100 - compact_bytes * 100 / dict_bytes))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
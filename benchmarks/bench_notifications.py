@@ -0,0 +1,39 @@
+"""
+壓力模式:同一秒觸發大量提醒,量測通知層對事件迴圈的阻塞時間。
+
+用法: python benchmarks/bench_notifications.py [提醒數量]
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtWidgets import QApplication
+
+from notifications import NotificationManager
+
+
+def main(count):
+    app = QApplication.instance() or QApplication(sys.argv)
+    manager = NotificationManager()
+
+    start = time.perf_counter()
+    for index in range(count):
+        manager.notify("提醒 %d" % index)
+    post_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    app.processEvents()
+    flush_ms = (time.perf_counter() - start) * 1000
+
+    print("觸發 %d 個提醒" % count)
+    print("notify() 總耗時: %.2f ms (每次 %.1f µs)" % (post_ms, post_ms * 1000 / count))
+    print("合併與顯示耗時: %.2f ms" % flush_ms)
+    print("統計: %s" % manager.stats())
+    manager.dismiss_all()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
@@ -0,0 +1,96 @@
+"""
+50 個彈幕提醒同時觸發時,量測 GUI 執行緒的畫面間隔(每 16 ms 一次的計時器實際間隔)。
+比較在 GUI 執行緒播放與在播放執行緒播放兩種做法;GUI 執行緒另外量測同樣限制 3 個頻道的結果,
+區分上限與執行緒各自的效果。
+
+播放頻道以模擬物件取代:第一次載入音源時 sleep 模擬解碼與音訊裝置設定,
+之後經過固定時間發出播放結束,因此不需要音效檔案或音訊裝置。
+
+用法: python benchmarks/bench_playback.py [提醒數量] [載入耗時 ms]
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from PyQt6.QtWidgets import QApplication
+
+from media_playback import PlaybackService
+from notifications import NotificationManager
+
+FRAME_MS = 16
+PLAY_MS = 500
+
+
+def simulated_channel(setup_ms):
+    class SimulatedChannel(QObject):
+        finished = pyqtSignal()
+
+        def __init__(self, parent=None):
+            super().__init__(parent)
+            self.path = None
+
+        def load(self, path):
+            if path != self.path:
+                time.sleep(setup_ms / 1000)  # 解碼與音訊裝置設定
+                self.path = path
+
+        def play(self, path):
+            self.load(path)
+            QTimer.singleShot(PLAY_MS, self.finished.emit)
+
+    return SimulatedChannel
+
+
+def measure(app, count, setup_ms, threaded, max_concurrent):
+    playback = PlaybackService(max_concurrent, simulated_channel(setup_ms), threaded)
+    notifier = NotificationManager()
+    gaps = []
+    last = [time.perf_counter()]
+
+    def frame():
+        now = time.perf_counter()
+        gaps.append((now - last[0]) * 1000)
+        last[0] = now
+
+    timer = QTimer()
+    timer.setInterval(FRAME_MS)
+    timer.timeout.connect(frame)
+    timer.start()
+
+    def fire():
+        for index in range(count):
+            playback.play("sound-%d.wav" % index)
+            notifier.notify("彈幕 %d" % index)
+
+    QTimer.singleShot(100, fire)
+    end = time.perf_counter() + 1.5
+    while time.perf_counter() < end:
+        app.processEvents()
+        time.sleep(0.001)
+    timer.stop()
+    notifier.dismiss_all()
+    stats = playback.stats()
+    playback.stop()
+    gaps.sort()
+    return gaps[-1], gaps[int(len(gaps) * 0.99) - 1], stats
+
+
+def main(count, setup_ms):
+    app = QApplication.instance() or QApplication(sys.argv)
+    print("%d 個彈幕同時觸發,每次載入音源 %.0f ms" % (count, setup_ms))
+    print("%18s %14s %16s  %s" % ("做法", "最長間隔(ms)", "p99 間隔(ms)", "播放統計"))
+    for name, threaded, max_concurrent in (
+        ("GUI 執行緒,不限量", False, count),
+        ("GUI 執行緒,上限 3", False, 3),
+        ("播放執行緒,上限 3", True, 3),
+    ):
+        worst, p99, stats = measure(app, count, setup_ms, threaded, max_concurrent)
+        print("%18s %14.1f %16.1f  %s" % (name, worst, p99, stats))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50, float(sys.argv[2]) if len(sys.argv) > 2 else 20)
@@ -0,0 +1,42 @@
+"""
+量測重複規則的下一次觸發時間計算,以及時間區間查詢的速度。
+
+用法: python benchmarks/bench_recurrence.py [規則數量]
+"""
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_common import synthetic_reminders
+from reminder_scheduler import ReminderScheduler, next_fire_after
+
+RULES = ["", "weekdays", "weekly:5,6", "every:15", "every:60", "monthly:1", "monthly:31", "cron:*/30 9-17 * * 1-5"]
+
+
+def main(count):
+    reminders = synthetic_reminders(count, rules=RULES)
+    now = datetime(2024, 1, 31, 12, 0, 0)
+
+    start = time.perf_counter()
+    for reminder in reminders:
+        next_fire_after(reminder, now)
+    elapsed = time.perf_counter() - start
+    print("next_occurrence: %d 條規則 %.1f ms (每條 %.2f µs)" % (count, elapsed * 1000, elapsed * 1e6 / count))
+
+    start = time.perf_counter()
+    timestamp = now.timestamp()
+    scheduler = ReminderScheduler(reminders, now=lambda: timestamp)
+    print("建立排程索引: %.1f ms" % ((time.perf_counter() - start) * 1000))
+
+    for minutes in (1, 10, 60):
+        start = time.perf_counter()
+        fires = scheduler.fires_between(timestamp, timestamp + minutes * 60)
+        elapsed = time.perf_counter() - start
+        print("查詢 %3d 分鐘區間: %6d 次觸發, %.2f ms" % (minutes, len(fires), elapsed * 1000))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,61 @@
+"""
+比較舊版每秒輪詢(線性掃描)與最小堆積排程器的喚醒次數與每次喚醒成本。
+
+用法: python benchmarks/bench_scheduler.py [提醒數量 ...]
+"""
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_common import synthetic_reminders
+from reminder_scheduler import ReminderScheduler
+
+
+def bench_scan(reminders, ticks=50):
+    # 舊版 checkReminders:每秒格式化當前時間並逐一比對字串
+    start = time.perf_counter()
+    moment = datetime(2024, 1, 1, 8, 0, 0)
+    for tick in range(ticks):
+        current_time = (moment + timedelta(seconds=tick)).strftime("%H:%M:%S")
+        for reminder in reminders:
+            if reminder["time"] == current_time:
+                pass
+    per_tick = (time.perf_counter() - start) / ticks
+    return 86400, per_tick
+
+
+def bench_heap(reminders):
+    # 以模擬時鐘跑完一整天,只在下一個到期時間喚醒
+    clock = [datetime(2024, 1, 1, 0, 0, 0).timestamp()]
+    scheduler = ReminderScheduler(reminders, now=lambda: clock[0])
+    end = clock[0] + 86400
+    wakeups = 0
+    fired = 0
+    elapsed = 0.0
+    while True:
+        due = scheduler.next_due()
+        if due is None or due >= end:
+            break
+        clock[0] = due
+        start = time.perf_counter()
+        fired += len(scheduler.pop_due())
+        elapsed += time.perf_counter() - start
+        wakeups += 1
+    return wakeups, elapsed / max(wakeups, 1), fired
+
+
+def main(sizes):
+    print("%10s %14s %16s %14s %16s" % ("提醒數", "輪詢喚醒/日", "輪詢每次(ms)", "堆積喚醒/日", "堆積每次(ms)"))
+    for size in sizes:
+        reminders = synthetic_reminders(size, rules=("",))
+        scan_wakeups, scan_cost = bench_scan(reminders)
+        heap_wakeups, heap_cost, fired = bench_heap(reminders)
+        assert fired == size
+        print("%10d %14d %16.4f %14d %16.4f" % (size, scan_wakeups, scan_cost * 1000, heap_wakeups, heap_cost * 1000))
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000])
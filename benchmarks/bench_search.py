@@ -0,0 +1,51 @@
+"""
+量測設定頁面搜尋的查詢延遲:逐筆比對字串(舊版 setFilterFixedString 的做法)
+與 ReminderIndex(時間索引 + 反向索引)比較,另外量測增量更新索引的成本。
+
+用法: python benchmarks/bench_search.py [提醒數量 ...]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_common import synthetic_reminders, timed_ms
+from reminder_index import ReminderIndex
+from reminder_scheduler import parse_time_of_day
+
+QUERIES = ("喝", "喝水", "打電話給客", "stand", "review pr", "08:00-12:00", "22:00-02:00 吃藥", "找不到的字")
+
+
+def scan(reminders, query):
+    # 舊版:每次輸入都比對每一筆提醒的每個欄位,時間區間只能靠逐筆解析
+    query = query.lower()
+    if "-" in query and ":" in query:
+        start, _, end = query.partition(" ")[0].partition("-")
+        low, high = parse_time_of_day(start + ":00"), parse_time_of_day(end + ":00")
+        return [reminder for reminder in reminders if (low <= parse_time_of_day(reminder["time"]) <= high) != (low > high)]
+    return [reminder for reminder in reminders if any(query in str(value).lower() for value in reminder.values())]
+
+
+def main(sizes):
+    for size in sizes:
+        reminders = synthetic_reminders(size)
+        index = ReminderIndex(reminders)
+        build_ms, _ = timed_ms(lambda: len(index))
+        print("提醒數 %d,建立索引 %.1f ms" % (size, build_ms))
+        print("%22s %12s %12s %10s" % ("查詢", "逐筆(ms)", "索引(ms)", "結果數"))
+        for query in QUERIES:
+            scan_ms, _ = timed_ms(lambda: scan(reminders, query), repeat=5)
+            index_ms, result = timed_ms(lambda: index.search(query), repeat=5)
+            print("%22s %12.2f %12.3f %10d" % (query, scan_ms, index_ms, len(result)))
+        # 增量更新:新增再刪除一筆
+        reminder = {"id": size + 1, "time": "12:00:00", "action": "新的提醒 stand up", "type": "彈窗"}
+        start = time.perf_counter()
+        for _ in range(100):
+            index.add(reminder)
+            index.remove(reminder["id"])
+        print("新增+刪除一筆 %.3f ms\n" % ((time.perf_counter() - start) * 10))
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 100000])
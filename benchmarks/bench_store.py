@@ -0,0 +1,62 @@
+"""
+比較舊版「整份重寫 reminders.json」與 SQLite 儲存後端的單筆編輯延遲。
+
+用法: python benchmarks/bench_store.py [提醒數量 ...]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_common import synthetic_reminders
+from reminder_store import ReminderStore
+
+EDITS = 20
+
+
+def bench_json_rewrite(directory, reminders):
+    # 舊版 AddReminderDialog.save_reminder:讀取、解析、附加、整份寫回
+    path = os.path.join(directory, "reminders.json")
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(reminders, file, ensure_ascii=False, indent=4)
+    new_reminder = {"time": "12:00:00", "action": "新提醒", "type": "彈窗", "image": ""}
+    start = time.perf_counter()
+    for _ in range(EDITS):
+        with open(path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+        data.append(new_reminder)
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(data, file, ensure_ascii=False, indent=4)
+    return (time.perf_counter() - start) / EDITS
+
+
+def bench_store(directory, reminders):
+    store = ReminderStore(os.path.join(directory, "reminders.db"), legacy_json=None)
+    store.add_many([dict(reminder) for reminder in reminders])
+    start = time.perf_counter()
+    for _ in range(EDITS):
+        reminder = {"time": "12:00:00", "action": "新提醒", "type": "彈窗", "image": ""}
+        store.add(reminder)
+        reminder["action"] = "修改後的提醒"
+        store.update(reminder)
+        store.delete(reminder["id"])
+    elapsed = (time.perf_counter() - start) / (EDITS * 3)
+    store.close()
+    return elapsed
+
+
+def main(sizes):
+    print("%10s %18s %18s" % ("提醒數", "JSON 重寫(ms)", "SQLite 編輯(ms)"))
+    for size in sizes:
+        reminders = synthetic_reminders(size, rules=("",))
+        with tempfile.TemporaryDirectory() as directory:
+            json_cost = bench_json_rewrite(directory, reminders)
+            store_cost = bench_store(directory, reminders)
+        print("%10d %18.3f %18.3f" % (size, json_cost * 1000, store_cost * 1000))
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 100000, 1000000])
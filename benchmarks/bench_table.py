@@ -0,0 +1,88 @@
+"""
+以 offscreen QPA 量測設定對話框的開啟時間與新增/刪除延遲,
+並與舊版 QTableWidget 逐列重建的做法比較。
+
+用法: python benchmarks/bench_table.py [提醒數量 ...]
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtWidgets import QApplication, QTableWidget, QTableWidgetItem
+
+from bench_common import synthetic_reminders
+
+
+def populate_table_widget(table, reminders):
+    # 舊版 SettingsDialog.populate_table
+    table.setRowCount(0)
+    for reminder in reminders:
+        row_position = table.rowCount()
+        table.insertRow(row_position)
+        table.setItem(row_position, 0, QTableWidgetItem(reminder["time"]))
+        table.setItem(row_position, 1, QTableWidgetItem(reminder["action"]))
+        table.setItem(row_position, 2, QTableWidgetItem(reminder["type"]))
+        table.setItem(row_position, 3, QTableWidgetItem(reminder.get("image", "")))
+
+
+def timed(app, func):
+    start = time.perf_counter()
+    func()
+    app.processEvents()
+    return (time.perf_counter() - start) * 1000
+
+
+def bench_old(app, reminders):
+    table = QTableWidget()
+    table.setColumnCount(4)
+    table.show()
+    open_ms = timed(app, lambda: populate_table_widget(table, reminders))
+    # 舊版新增/刪除後都會整張表重建
+    reminders.append({"time": "12:00:00", "action": "新提醒", "type": "彈窗", "image": ""})
+    add_ms = timed(app, lambda: populate_table_widget(table, reminders))
+    reminders.pop()
+    delete_ms = timed(app, lambda: populate_table_widget(table, reminders))
+    table.close()
+    return open_ms, add_ms, delete_ms
+
+
+def bench_new(app, reminders):
+    import main2
+    import settings_dialog
+    from reminder_store import ReminderStore
+
+    store = ReminderStore(":memory:", legacy_json=None)
+    store.add_many(reminders)
+    window = main2.ReminderApp(store)
+    dialog = None
+
+    def open_dialog():
+        nonlocal dialog
+        dialog = settings_dialog.SettingsDialog(window, window.core)
+        dialog.show()
+
+    open_ms = timed(app, open_dialog)
+    new_reminder = {"time": "12:00:00", "action": "新提醒", "type": "彈窗", "image": ""}
+    add_ms = timed(app, lambda: window.core.add(new_reminder))
+    delete_ms = timed(app, lambda: window.core.remove(window.core.reminders[-1]))
+    dialog.close()
+    window.playback.stop()
+    window.core.close()
+    store.close()
+    return open_ms, add_ms, delete_ms
+
+
+def main(sizes):
+    app = QApplication.instance() or QApplication(sys.argv)
+    print("%10s %8s %12s %12s %12s" % ("提醒數", "實作", "開啟(ms)", "新增(ms)", "刪除(ms)"))
+    for size in sizes:
+        for name, bench in (("QTableWidget", bench_old), ("QTableView", bench_new)):
+            result = bench(app, synthetic_reminders(size, rules=("",)))
+            print("%10d %8s %12.1f %12.1f %12.1f" % ((size, name) + result))
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [100000])
@@ -0,0 +1,198 @@
+"""
+以模擬時鐘重播一整年的排程,檢查夏令時間切換、休眠喚醒與時區改變時的觸發行為。
+任何檢查失敗時以結束碼 1 結束。
+
+用法: python benchmarks/replay_year.py [年份] [時區 ...]
+"""
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from recurrence import occurrences
+from reminder_scheduler import ClockMonitor, ReminderScheduler, parse_time_of_day, to_local, to_timestamp
+from simulated_clock import SimulatedClock
+
+REMINDERS = [
+    {"id": 1, "time": "09:00:00", "repeat": ""},
+    {"id": 2, "time": "02:30:00", "repeat": ""},  # 夏令時間開始當天不存在
+    {"id": 3, "time": "01:30:00", "repeat": ""},  # 夏令時間結束當天出現兩次
+    {"id": 4, "time": "08:00:00", "repeat": "every:30"},
+    {"id": 5, "time": "18:00:00", "repeat": "weekdays"},
+    {"id": 6, "time": "12:00:00", "repeat": "monthly:31"},
+    {"id": 7, "time": "00:00:15", "repeat": "cron:0 */6 * * *"},
+]
+
+
+def expected_fires(reminder, start, end, tz):
+    """
+    依當地時間列出 (start, end] 內的觸發時間,再換算成絕對時間並去除重複。
+    """
+    local_start = to_local(start, tz) - timedelta(days=1)
+    local_end = to_local(end, tz) + timedelta(days=1)
+    fires = set()
+    for local in occurrences(reminder["repeat"], parse_time_of_day(reminder["time"]), local_start, local_end):
+        due = to_timestamp(local, tz)
+        if start < due <= end:
+            fires.add(due)
+    return sorted(fires)
+
+
+def run(scheduler, clock, until, on_fire, events=()):
+    """
+    推進模擬時鐘到 until;events 是 (時間, 動作) 列表,動作在該時間點執行。
+    """
+    events = sorted(events, key=lambda event: event[0])
+    while True:
+        due = scheduler.next_due()
+        if events and (due is None or events[0][0] < due):
+            moment, action = events.pop(0)
+            clock.advance_to(moment)
+            action()
+            continue
+        if due is None or due > until:
+            break
+        clock.advance_to(due)
+        for reminder in scheduler.pop_due():
+            on_fire(reminder, clock.time())
+    clock.advance_to(until)
+
+
+def replay_normal(year, tz, failures):
+    start = datetime(year, 1, 1, tzinfo=tz).timestamp()
+    end = datetime(year + 1, 1, 1, tzinfo=tz).timestamp()
+    clock = SimulatedClock(start)
+    scheduler = ReminderScheduler(REMINDERS, now=clock.time, tz=tz)
+    fired = {reminder["id"]: [] for reminder in REMINDERS}
+    run(scheduler, clock, end, lambda reminder, now: fired[reminder["id"]].append(now))
+    count = 0
+    for reminder in REMINDERS:
+        expected = expected_fires(reminder, start - 1, end, tz)
+        count += len(fired[reminder["id"]])
+        if fired[reminder["id"]] != expected:
+            failures.append("%s 提醒 %d: 觸發 %d 次,預期 %d 次" % (tz, reminder["id"], len(fired[reminder["id"]]), len(expected)))
+    # 每天 09:00 的提醒一年剛好觸發 365/366 次,而且都在當地 09:00
+    days = (datetime(year + 1, 1, 1) - datetime(year, 1, 1)).days
+    daily = [to_local(moment, tz) for moment in fired[1]]
+    if len(daily) != days or any((moment.hour, moment.minute) != (9, 0) for moment in daily):
+        failures.append("%s 每日 09:00 的提醒不正確" % tz)
+    # 01:30 在夏令時間結束那天也只觸發一次
+    dates = [to_local(moment, tz).date() for moment in fired[3]]
+    if len(dates) != len(set(dates)):
+        failures.append("%s 01:30 的提醒在同一天觸發兩次" % tz)
+    return count
+
+
+def replay_with_jumps(year, tz, failures, seed=0):
+    """
+    隨機插入休眠,檢查錯過的提醒各補發一次,補發後沒有已到期的提醒。
+    """
+    rng = random.Random(seed)
+    start = datetime(year, 1, 1, tzinfo=tz).timestamp()
+    end = datetime(year + 1, 1, 1, tzinfo=tz).timestamp()
+    clock = SimulatedClock(start)
+    scheduler = ReminderScheduler(REMINDERS, now=clock.time, tz=tz)
+    monitor = ClockMonitor(wall=clock.time, monotonic=clock.monotonic)
+    catch_ups = [0]
+
+    def suspend(hours):
+        def action():
+            before = clock.time()
+            clock.suspend(hours * 3600)
+            if not monitor.check():
+                failures.append("%s 沒有偵測到休眠 %.1f 小時" % (tz, hours))
+                return
+            missed = {reminder["id"] for reminder in REMINDERS if expected_fires(reminder, before, clock.time(), tz)}
+            batch = scheduler.pop_due()
+            ids = [reminder["id"] for reminder in batch]
+            if len(ids) != len(set(ids)) or set(ids) != missed:
+                failures.append("%s 休眠 %.1f 小時後補發 %s,預期 %s" % (tz, hours, sorted(ids), sorted(missed)))
+            catch_ups[0] += len(batch)
+            scheduler.reschedule()
+            # 補發之後下一次觸發必須在現在之後
+            due = scheduler.next_due()
+            if due is not None and due <= clock.time():
+                failures.append("%s 補發後仍有已到期的提醒" % tz)
+        return action
+
+    events = []
+    moment = start
+    while moment < end - 86400 * 10:
+        moment += rng.uniform(3, 10) * 86400
+        events.append((moment, suspend(rng.uniform(0.5, 40))))
+    run(scheduler, clock, end, lambda reminder, now: None, events)
+    return len(events), catch_ups[0]
+
+
+def fall_back_transition(year, tz):
+    """
+    找出夏令時間結束(時鐘撥慢)的時間點,回傳 (epoch 秒數, 撥慢的秒數);沒有時回傳 None。
+    """
+    moment = datetime(year, 1, 1, tzinfo=tz).timestamp()
+    end = datetime(year + 1, 1, 1, tzinfo=tz).timestamp()
+    offset = datetime.fromtimestamp(moment, tz).utcoffset()
+    while moment < end:
+        moment += 3600
+        current = datetime.fromtimestamp(moment, tz).utcoffset()
+        if current < offset:
+            # 以分鐘為單位往回找到確切的切換時間
+            while datetime.fromtimestamp(moment - 60, tz).utcoffset() == current:
+                moment -= 60
+            return moment, (offset - current).total_seconds()
+        offset = current
+    return None
+
+
+def check_repeated_hour(year, tz, failures):
+    # 在重複的那一小時的第二次經過時重新排程,提醒不可以再觸發一次
+    transition = fall_back_transition(year, tz)
+    if transition is None:
+        return
+    moment, length = transition
+    reminder_local = to_local(moment - length / 2, tz)
+    reminder = {"id": 0, "time": reminder_local.strftime("%H:%M:%S"), "repeat": ""}
+    clock = SimulatedClock(moment + length / 4)
+    scheduler = ReminderScheduler([reminder], now=clock.time, tz=tz)
+    local = to_local(scheduler.next_due(), tz)
+    if local.date() == reminder_local.date():
+        failures.append("%s 在重複的時段內會再次觸發 %s 的提醒" % (tz, reminder["time"]))
+
+
+def check_timezone_change(year, tz, other, failures):
+    # 改變時區後,下一次 09:00 提醒應該依新時區的當地時間觸發
+    clock = SimulatedClock(datetime(year, 6, 1, 12, 0, tzinfo=tz).timestamp())
+    scheduler = ReminderScheduler([REMINDERS[0]], now=clock.time, tz=tz)
+    scheduler.tz = other
+    scheduler.reschedule()
+    local = to_local(scheduler.next_due(), other)
+    if (local.hour, local.minute) != (9, 0):
+        failures.append("%s -> %s 改變時區後觸發時間為 %s" % (tz, other, local))
+
+
+def main(year, zones):
+    failures = []
+    for name in zones:
+        tz = ZoneInfo(name)
+        started = time.perf_counter()
+        fires = replay_normal(year, tz, failures)
+        normal_s = time.perf_counter() - started
+        started = time.perf_counter()
+        suspends, catch_ups = replay_with_jumps(year, tz, failures)
+        jumps_s = time.perf_counter() - started
+        check_repeated_hour(year, tz, failures)
+        check_timezone_change(year, tz, ZoneInfo("Asia/Tokyo"), failures)
+        print("%-20s 一年 %6d 次觸發 %.2f s;休眠 %d 次、補發 %d 次 %.2f s" % (name, fires, normal_s, suspends, catch_ups, jumps_s))
+    for failure in failures:
+        print("失敗: " + failure)
+    print("全部通過" if not failures else "%d 項檢查失敗" % len(failures))
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    arguments = sys.argv[1:]
+    year = int(arguments.pop(0)) if arguments and arguments[0].isdigit() else 2024
+    sys.exit(main(year, arguments or ["America/New_York", "Europe/London", "Australia/Sydney", "Asia/Taipei"]))
@@ -0,0 +1,272 @@
+"""
+無頭(offscreen)基準測試套件:以合成的提醒資料與模擬時鐘量測排程器、設定表格、
+儲存後端、搜尋索引、群組、通知佇列與通知,結果輸出成 JSON,可以和之前版本的結果比較。
+
+用法:
+    python benchmarks/run_suite.py [--sizes 1000 10000 100000 1000000] [--only scheduler store ...]
+                                   [--output results.json] [--compare baseline.json] [--threshold 0.2]
+
+所有數值都是耗時(越小越好);--compare 時任何一項變慢超過 threshold 就以結束碼 1 結束。
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from bench_common import PHRASES, START, synthetic_reminders, timed_ms
+from reminder_index import ReminderIndex
+from reminder_scheduler import ReminderScheduler
+from reminder_store import ReminderStore
+from simulated_clock import SimulatedClock
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+
+
+def bench_scheduler(size, record):
+    reminders = synthetic_reminders(size)
+    clock = SimulatedClock(START)
+    build_ms, scheduler = timed_ms(lambda: ReminderScheduler(reminders, now=clock.time))
+    record("build", build_ms, "ms")
+    # 以模擬時鐘跑一小時(最多 2000 次喚醒),每次喚醒的成本就是舊版 checkReminders 的每秒成本
+    end = START + 3600
+    wakeups = fired = 0
+    elapsed = 0.0
+    while wakeups < 2000:
+        due = scheduler.next_due()
+        if due is None or due > end:
+            break
+        clock.advance_to(due)
+        start = time.perf_counter()
+        fired += len(scheduler.pop_due())
+        elapsed += time.perf_counter() - start
+        wakeups += 1
+    record("tick", elapsed * 1e6 / max(wakeups, 1), "us")
+    record("fire", elapsed * 1e6 / max(fired, 1), "us")
+    reminder = dict(reminders[0], id=0)
+    start = time.perf_counter()
+    for _ in range(1000):
+        scheduler.add(reminder)
+        scheduler.remove(reminder)
+    record("add_remove", (time.perf_counter() - start) * 1000, "us")
+
+
+def bench_store(size, record):
+    reminders = synthetic_reminders(size)
+    with tempfile.TemporaryDirectory() as directory:
+        store = ReminderStore(os.path.join(directory, "reminders.db"), legacy_json=None)
+        record("insert_many", timed_ms(lambda: store.add_many(reminders))[0], "ms")
+        record("load", timed_ms(store.load)[0], "ms")
+        start = time.perf_counter()
+        for _ in range(20):
+            reminder = {"time": "12:00:00", "action": "新提醒", "type": "彈窗", "image": ""}
+            store.add(reminder)
+            reminder["action"] = "修改後的提醒"
+            store.update(reminder)
+            store.delete(reminder["id"])
+        record("edit", (time.perf_counter() - start) * 1000 / 60, "ms")
+        record("export_json", timed_ms(lambda: store.export_json(os.path.join(directory, "export.json")))[0], "ms")
+        store.close()
+
+
+def bench_search(size, record):
+    reminders = synthetic_reminders(size)
+    index = ReminderIndex(reminders)
+    record("build", timed_ms(lambda: len(index))[0], "ms")
+    queries = ("喝", "喝水", "打電話給客", "stand", "08:00-12:00", "22:00-02:00 吃藥")
+    start = time.perf_counter()
+    for query in queries:
+        index.search(query)
+    record("query", (time.perf_counter() - start) * 1000 / len(queries), "ms")
+
+
+def bench_groups(size, record):
+    # 每 10 筆為一組以外,另有一個佔一成提醒的大群組
+    reminders = synthetic_reminders(size)
+    for reminder in reminders:
+        reminder["group"] = "大群組" if reminder["id"] % 10 == 0 else "群組 %d" % (reminder["id"] // 10)
+    with tempfile.TemporaryDirectory() as directory:
+        store = ReminderStore(os.path.join(directory, "reminders.db"), legacy_json=None)
+        store.add_many(reminders)
+        record("toggle", timed_ms(lambda: store.set_group_enabled("大群組", False))[0], "ms")
+        store.close()
+    clock = SimulatedClock(START)
+    scheduler = ReminderScheduler(reminders, now=clock.time)
+    scheduler.set_group_enabled("大群組", False)
+    clock.advance(3600)
+    record("pop_disabled", timed_ms(scheduler.pop_due)[0], "ms")
+    start = time.perf_counter()
+    for reminder in reminders[:1000]:
+        scheduler.snooze(reminder, 600)
+    record("snooze", (time.perf_counter() - start) * 1000, "us")
+
+
+def bench_dispatch(size, record):
+    from reminder_core.dispatch import DispatchQueue, Dispatcher
+    from reminder_store import PRIORITIES
+
+    # 同一秒觸發 size 個提醒,內容每 100 個重複一次,優先順序混合
+    clock = SimulatedClock(START)
+    dispatcher = Dispatcher(queue=DispatchQueue(now=clock.time))
+    dispatcher.wake = lambda: None
+    reminders = synthetic_reminders(size)
+    for reminder in reminders:
+        reminder["action"] = PHRASES[reminder["id"] % len(PHRASES)] + " %d" % (reminder["id"] % 100)
+        reminder["priority"] = PRIORITIES[reminder["id"] % len(PRIORITIES)]
+    start = time.perf_counter()
+    for reminder in reminders:
+        dispatcher.dispatch(reminder)
+    record("enqueue", (time.perf_counter() - start) * 1e6 / size, "us")
+
+    def drain():
+        while True:
+            seconds = dispatcher.drain()
+            if seconds is None:
+                return
+            clock.advance(seconds)
+
+    record("drain", timed_ms(drain)[0], "ms")
+
+
+def _qt_app():
+    from PyQt6.QtWidgets import QApplication
+
+    return QApplication.instance() or QApplication(sys.argv)
+
+
+def bench_table(size, record):
+    app = _qt_app()
+    import main2
+    import settings_dialog
+
+    store = ReminderStore(":memory:", legacy_json=None)
+    store.add_many(synthetic_reminders(size))
+    window = main2.ReminderApp(store)
+
+    def open_dialog():
+        dialog = settings_dialog.SettingsDialog(window, window.core)
+        dialog.show()
+        app.processEvents()
+        return dialog
+
+    open_ms, dialog = timed_ms(open_dialog)
+    record("open", open_ms, "ms")
+    reminder = {"time": "12:00:00", "action": "新提醒", "type": "彈窗", "image": ""}
+    record("insert", timed_ms(lambda: (window.core.add(reminder), app.processEvents()))[0], "ms")
+    record("filter", timed_ms(lambda: (dialog.filter_edit.setText("喝水"), app.processEvents()))[0], "ms")
+    record("clear_filter", timed_ms(lambda: (dialog.filter_edit.setText(""), app.processEvents()))[0], "ms")
+    record("remove", timed_ms(lambda: (window.core.remove(window.core.reminders[-1]), app.processEvents()))[0], "ms")
+    dialog.close()
+    window.playback.stop()
+    window.core.close()
+    window.deleteLater()
+    store.close()
+
+
+def bench_notifications(size, record):
+    app = _qt_app()
+    from notifications import NotificationManager
+
+    manager = NotificationManager()
+    count = min(size, 100000)  # 同一秒觸發的提醒數量
+    notify_ms, _ = timed_ms(lambda: [manager.notify("提醒 %d" % index) for index in range(count)])
+    record("notify", notify_ms * 1000 / count, "us")
+    record("flush", timed_ms(app.processEvents)[0], "ms")
+    manager.dismiss_all()
+    manager.deleteLater()
+
+
+SUITES = {
+    "scheduler": bench_scheduler,
+    "store": bench_store,
+    "search": bench_search,
+    "groups": bench_groups,
+    "dispatch": bench_dispatch,
+    "table": bench_table,
+    "notifications": bench_notifications,
+}
+
+
+def environment():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    from PyQt6.QtCore import QT_VERSION_STR
+
+    return {
+        "commit": commit,
+        "time": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "qt": QT_VERSION_STR,
+        "platform": platform.platform(),
+    }
+
+
+def run(sizes, suites):
+    results = []
+    for suite in suites:
+        for size in sizes:
+            def record(name, value, unit):
+                results.append({"suite": suite, "name": name, "size": size, "value": round(value, 4), "unit": unit})
+                print("%-14s %-14s %9d %12.3f %s" % (suite, name, size, value, unit), flush=True)
+
+            SUITES[suite](size, record)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    列出與基準結果的差異,回傳變慢超過 threshold 的項目數。
+    """
+    previous = {(item["suite"], item["name"], item["size"]): item["value"] for item in baseline["results"]}
+    regressions = 0
+    print("\n與 %s 比較:" % (baseline["environment"].get("commit") or "基準結果"))
+    for item in results:
+        old = previous.get((item["suite"], item["name"], item["size"]))
+        if not old:
+            continue
+        change = item["value"] / old - 1
+        flag = ""
+        if change > threshold:
+            regressions += 1
+            flag = "  <-- 變慢"
+        print("%-14s %-14s %9d %+8.1f%%%s" % (item["suite"], item["name"], item["size"], change * 100, flag))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="提醒引擎基準測試套件")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="提醒數量(1k 到 1M)")
+    parser.add_argument("--only", nargs="+", choices=sorted(SUITES), help="只執行指定的測試")
+    parser.add_argument("--output", help="將結果寫入 JSON 檔案")
+    parser.add_argument("--compare", help="與先前的 JSON 結果比較")
+    parser.add_argument("--threshold", type=float, default=0.2, help="視為變慢的比例(預設 0.2)")
+    args = parser.parse_args(argv)
+
+    suites = args.only or list(SUITES)
+    print("%-14s %-14s %9s %12s" % ("測試", "項目", "提醒數", "結果"))
+    report = {"environment": environment(), "results": run(args.sizes, suites)}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as file:
+            baseline = json.load(file)
+        if compare(report["results"], baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
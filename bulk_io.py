@@ -0,0 +1,181 @@
+"""
+批次匯入/匯出提醒事件(CSV 或 JSON Lines),以串流方式處理,記憶體用量固定。
+
+用法:
+    python bulk_io.py import team.csv [--db reminders.db] [--strict] [--check-images]
+    python bulk_io.py export backup.jsonl [--db reminders.db]
+
+CSV 第一列為欄位名稱: time,action,type,image,repeat,group,priority(image 之後的欄位可省略)。
+"""
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+
+from reminder_client import DaemonError, ReminderClient
+from reminder_store import DEFAULT_DB_PATH, FIELDS, ReminderStore, validate_reminder
+
+BATCH_SIZE = 10000
+MAX_REPORTED_ERRORS = 20
+
+
+def detect_format(path, file_format=None):
+    """
+    依參數或副檔名判斷檔案格式,回傳 "csv" 或 "jsonl"。
+    """
+    file_format = file_format or os.path.splitext(path)[1].lstrip(".").lower()
+    if file_format in ("jsonl", "ndjson"):
+        return "jsonl"
+    if file_format == "csv":
+        return "csv"
+    raise ValueError("不支援的檔案格式: %s" % path)
+
+
+def read_reminders(file, file_format):
+    """
+    逐筆讀取提醒,產生 (行號, 提醒或錯誤訊息)。
+    """
+    if file_format == "csv":
+        reader = csv.DictReader(file)
+        for reminder in reader:
+            yield reader.line_num, reminder
+        return
+    for line_number, line in enumerate(file, 1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError as error:
+            yield line_number, "JSON 格式錯誤: %s" % error
+
+
+class ImportReport:
+    def __init__(self):
+        self.read = 0
+        self.imported = 0
+        self.invalid = 0
+        self.errors = []  # 只保留前幾筆錯誤,避免大量錯誤佔用記憶體
+
+    @property
+    def duplicates(self):
+        return self.read - self.invalid - self.imported
+
+    def add_error(self, line_number, message):
+        self.invalid += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line_number, message))
+
+
+def _validated_batches(rows, report, strict, check_images):
+    # 每次驗證一批,只把合法的提醒交給資料庫
+    while True:
+        batch = list(itertools.islice(rows, BATCH_SIZE))
+        if not batch:
+            return
+        valid = []
+        for line_number, reminder in batch:
+            report.read += 1
+            try:
+                if isinstance(reminder, str):
+                    raise ValueError(reminder)  # 讀取時的解析錯誤
+                if not isinstance(reminder, dict):
+                    raise ValueError("每一筆必須是物件")
+                reminder = {field: reminder.get(field) or "" for field in FIELDS}
+                validate_reminder(reminder)
+                if check_images and reminder["image"] and not os.path.exists(reminder["image"]):
+                    raise ValueError("找不到圖片: %s" % reminder["image"])
+            except ValueError as error:
+                if strict:
+                    raise ValueError("第 %d 行: %s" % (line_number, error)) from error
+                report.add_error(line_number, str(error))
+                continue
+            valid.append(reminder)
+        yield valid
+
+
+def import_file(store, path, file_format=None, strict=False, check_images=False):
+    """
+    將檔案中的提醒匯入儲存後端,整個檔案在同一個交易中提交並排除重複提醒。
+    strict 為 True 時遇到錯誤會中止並回復整個匯入。
+    """
+    file_format = detect_format(path, file_format)
+    report = ImportReport()
+    with open(path, "r", encoding="utf-8-sig", newline="") as file:
+        rows = read_reminders(file, file_format)
+        report.imported = store.add_unique_batches(_validated_batches(rows, report, strict, check_images))
+    return report
+
+
+def export_file(store, path, file_format=None):
+    """
+    將儲存後端的提醒逐筆寫出,寫完後才以 rename 取代目標檔案。
+    """
+    file_format = detect_format(path, file_format)
+    temp_path = path + ".tmp"
+    count = 0
+    with open(temp_path, "w", encoding="utf-8", newline="") as file:
+        if file_format == "csv":
+            writer = csv.DictWriter(file, fieldnames=FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            for reminder in store:
+                writer.writerow(reminder)
+                count += 1
+        else:
+            for reminder in store:
+                file.write(json.dumps({field: reminder[field] for field in FIELDS}, ensure_ascii=False))
+                file.write("\n")
+                count += 1
+    os.replace(temp_path, path)
+    return count
+
+
+def notify_daemon():
+    """
+    背景服務執行中時請它立即載入匯入的提醒(否則要等到它下一次醒來)。
+    """
+    try:
+        client = ReminderClient()
+    except OSError:
+        return
+    try:
+        client.reload()
+    except (DaemonError, OSError):
+        pass
+    finally:
+        client.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="批次匯入/匯出提醒事件")
+    parser.add_argument("action", choices=("import", "export"))
+    parser.add_argument("path", help="CSV 或 JSON Lines 檔案")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help="提醒資料庫路徑")
+    parser.add_argument("--format", choices=("csv", "jsonl"), help="檔案格式(預設依副檔名判斷)")
+    parser.add_argument("--strict", action="store_true", help="遇到不合法的資料時中止整個匯入")
+    parser.add_argument("--check-images", action="store_true", help="確認圖片檔案存在")
+    args = parser.parse_args(argv)
+
+    store = ReminderStore(args.db)
+    try:
+        if args.action == "export":
+            print("已匯出 %d 筆提醒" % export_file(store, args.path, args.format))
+            return 0
+        try:
+            report = import_file(store, args.path, args.format, args.strict, args.check_images)
+        except ValueError as error:
+            print("匯入失敗,未寫入任何資料: %s" % error, file=sys.stderr)
+            return 1
+        print("讀取 %d 筆,新增 %d 筆,重複 %d 筆,不合法 %d 筆" % (report.read, report.imported, report.duplicates, report.invalid))
+        if report.imported:
+            notify_daemon()
+        for line_number, message in report.errors:
+            print("  第 %d 行: %s" % (line_number, message), file=sys.stderr)
+        return 0
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+"""
+大量提醒的欄位陣列格式,ReminderStore.export_json() 以它保存匯出的快照,
+另外用於離線分析與記憶體量測(benchmarks/bench_memory.py)。
+
+執行中的排程器、ReminderCore、背景服務與搜尋索引仍以 dict 保存提醒:它們依賴 dict 的物件身分
+(表格列、堆積項目、修改後就地更新),改用欄位陣列需要一起改寫。需要一次載入大量提醒做統計
+或轉換格式時,可以用 CompactReminders(store) 串流讀入,不會為每筆建立 dict。
+"""
+import io
+import json
+from array import array
+
+from reminder_scheduler import parse_time_of_day
+
+
+def format_time_of_day(seconds):
+    """
+    將當日秒數轉換回 "HH:mm:ss" 字串。
+    """
+    return "%02d:%02d:%02d" % (seconds // 3600, seconds // 60 % 60, seconds % 60)
+
+
+class LookupTable:
+    """
+    將重複出現的字串(提醒類型、圖片路徑、重複規則、群組)對應到小整數,每個字串只保存一份。
+    """
+
+    __slots__ = ("values", "_index")
+
+    def __init__(self):
+        self.values = []
+        self._index = {}
+
+    def __len__(self):
+        return len(self.values)
+
+    def code(self, value):
+        code = self._index.get(value)
+        if code is None:
+            code = self._index[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class CompactReminders:
+    """
+    以欄位陣列保存大量提醒事件,取代每筆一個 dict 的做法。
+    時間存成當日秒數(array('I')),類型/圖片/重複規則/群組/優先順序存成查詢表的索引,
+    可以與目前的 JSON 格式互相轉換。
+    """
+
+    __slots__ = ("ids", "times", "actions", "types", "images", "repeats", "groups", "priorities", "type_table", "image_table", "repeat_table", "group_table", "priority_table")
+
+    def __init__(self, reminders=()):
+        self.ids = array("q")  # 沒有 id 的提醒存 -1
+        self.times = array("I")
+        self.actions = []
+        self.types = array("B")
+        self.images = array("I")
+        self.repeats = array("I")  # 不同的規則與群組可能超過 65535 種
+        self.groups = array("I")
+        self.priorities = array("B")
+        self.type_table = LookupTable()
+        self.image_table = LookupTable()
+        self.repeat_table = LookupTable()
+        self.group_table = LookupTable()
+        self.priority_table = LookupTable()
+        self.extend(reminders)
+
+    def __len__(self):
+        return len(self.times)
+
+    def append(self, reminder):
+        """
+        加入一筆 dict 格式的提醒事件。
+        """
+        self.ids.append(reminder.get("id", -1))
+        self.times.append(parse_time_of_day(reminder["time"]))
+        self.actions.append(reminder.get("action") or "")
+        self.types.append(self.type_table.code(reminder["type"]))
+        self.images.append(self.image_table.code(reminder.get("image") or ""))
+        self.repeats.append(self.repeat_table.code(reminder.get("repeat") or ""))
+        self.groups.append(self.group_table.code(reminder.get("group") or ""))
+        self.priorities.append(self.priority_table.code(reminder.get("priority") or ""))
+
+    def extend(self, reminders):
+        for reminder in reminders:
+            self.append(reminder)
+
+    def __delitem__(self, index):
+        for column in (self.ids, self.times, self.actions, self.types, self.images, self.repeats, self.groups, self.priorities):
+            del column[index]
+
+    def __getitem__(self, index):
+        """
+        取出第 index 筆,轉回 dict 格式。
+        """
+        reminder = {
+            "time": format_time_of_day(self.times[index]),
+            "action": self.actions[index],
+            "type": self.type_table.values[self.types[index]],
+            "image": self.image_table.values[self.images[index]],
+        }
+        repeat = self.repeat_table.values[self.repeats[index]]
+        if repeat:
+            reminder["repeat"] = repeat
+        group = self.group_table.values[self.groups[index]]
+        if group:
+            reminder["group"] = group
+        priority = self.priority_table.values[self.priorities[index]]
+        if priority:
+            reminder["priority"] = priority
+        if self.ids[index] >= 0:
+            reminder["id"] = self.ids[index]
+        return reminder
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def seconds_at(self, index):
+        """
+        取得第 index 筆的當日秒數,不需要再解析時間字串。
+        """
+        return self.times[index]
+
+    def write_json(self, file):
+        """
+        以 reminders.json 的格式(不含 id)逐筆寫入 file,同一時間只有一筆轉回 dict。
+        輸出與 json.dump(提醒列表, indent=4) 相同。
+        """
+        file.write("[")
+        for index, reminder in enumerate(self):
+            reminder.pop("id", None)
+            file.write(",\n    " if index else "\n    ")
+            file.write(json.dumps(reminder, ensure_ascii=False, indent=4).replace("\n", "\n    "))
+        file.write("\n]" if len(self) else "]")
+
+    def to_json(self):
+        """
+        輸出成 reminders.json 的格式(不含 id)。
+        """
+        buffer = io.StringIO()
+        self.write_json(buffer)
+        return buffer.getvalue()
+
+    @classmethod
+    def from_json(cls, text):
+        return cls(json.loads(text))
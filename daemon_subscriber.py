@@ -0,0 +1,36 @@
+import json
+
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtNetwork import QLocalSocket
+
+from reminder_client import default_socket_path, encode_message
+
+
+class DaemonSubscriber(QObject):
+    """
+    以 QLocalSocket 訂閱背景服務的事件,事件透過 Qt 訊號送到 GUI 執行緒,不會阻塞事件迴圈。
+    """
+
+    fired = pyqtSignal(dict)  # 提醒觸發
+    event_received = pyqtSignal(dict)  # 所有事件(新增、修改、刪除、觸發)
+    disconnected = pyqtSignal()
+
+    def __init__(self, path=None, parent=None):
+        super().__init__(parent)
+        self.socket = QLocalSocket(self)
+        self.socket.connected.connect(self._on_connected)
+        self.socket.readyRead.connect(self._on_ready_read)
+        self.socket.disconnected.connect(self.disconnected)
+        self.socket.connectToServer(path or default_socket_path())
+
+    def _on_connected(self):
+        self.socket.write(encode_message({"command": "subscribe"}))
+
+    def _on_ready_read(self):
+        while self.socket.canReadLine():
+            message = json.loads(bytes(self.socket.readLine()).decode("utf-8"))
+            if "event" not in message:
+                continue  # 訂閱指令的回應
+            self.event_received.emit(message)
+            if message["event"] == "fire":
+                self.fired.emit(message["reminder"])
@@ -0,0 +1,249 @@
+"""
+提醒的觸發紀錄(只新增不修改)。
+
+record() 只把事件放入佇列,由背景執行緒每隔 flush_interval 秒批次寫入 SQLite,
+不會阻塞 GUI 或排程器。寫入原始事件的同一個交易中也會累加每個提醒每天與每月的統計
+(rollups),報表與紀錄頁面只讀統計表:任何期間都拆成完整的月份加上頭尾不足一個月的日子,
+讀取的列數與紀錄累積多久、期間多長都無關。
+超過 retention_days 天的原始事件會自動刪除,統計仍然保留。
+
+「fired」只由持有排程的行程(背景服務或直接開啟提醒資料庫的前端)記錄一次,
+連線到背景服務的前端只記錄使用者的回應,多個前端同時開啟也不會重複計算觸發。
+
+事件種類:
+    fired       提醒觸發
+    dismissed   按下「確定」
+    snoozed     按下「稍後提醒」
+    missed      沒有回應,通知逾時關閉
+"""
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter, deque
+from datetime import date, timedelta
+
+EVENT_KINDS = ("fired", "dismissed", "snoozed", "missed")
+KIND_CODES = {kind: code for code, kind in enumerate(EVENT_KINDS)}
+RETENTION_DAYS = 30  # 原始事件保留天數
+COMPACT_INTERVAL = 3600  # 自動壓縮的間隔(秒)
+
+
+def history_path(store_path):
+    """
+    觸發紀錄與提醒資料庫放在同一個目錄,例如 reminders.db -> /目錄/reminders-history.db。
+    另外存一個檔案,頻繁寫入紀錄不會讓其他行程誤以為提醒有變更;
+    回傳絕對路徑,背景服務與前端的工作目錄不同時仍指向同一個檔案。
+    """
+    if store_path == ":memory:":
+        return store_path
+    return os.path.abspath(os.path.splitext(store_path)[0] + "-history.db")
+
+
+def day_key(timestamp):
+    """
+    將 epoch 秒數轉換為當地日期的整數,例如 20240304。
+    """
+    local = time.localtime(timestamp)
+    return local.tm_year * 10000 + local.tm_mon * 100 + local.tm_mday
+
+
+def format_day(day):
+    return "%04d-%02d-%02d" % (day // 10000, day // 100 % 100, day % 100)
+
+
+def _to_date(day):
+    return date(day // 10000, day // 100 % 100, day % 100)
+
+
+def _to_day(value):
+    return value.year * 10000 + value.month * 100 + value.day
+
+
+def split_range(first_day, last_day):
+    """
+    將日期區間拆成 (開頭的日子, 完整的月份, 結尾的日子),每段都是 (起, 迄) 的閉區間,
+    日子以 YYYYMMDD、月份以 YYYYMM 表示;空的區段為 (1, 0)。
+    """
+    first, last = _to_date(first_day), _to_date(last_day)
+    month_start = first if first.day == 1 else (first.replace(day=28) + timedelta(days=4)).replace(day=1)
+    month_end = last.replace(day=1) - timedelta(days=1)
+    if (last + timedelta(days=1)).day == 1:
+        month_end = last  # last 是月底,整個月都包含在內
+    if month_start > month_end:
+        return (first_day, last_day), (1, 0), (1, 0)
+    head = (first_day, _to_day(month_start - timedelta(days=1))) if month_start > first else (1, 0)
+    tail = (_to_day(month_end + timedelta(days=1)), last_day) if month_end < last else (1, 0)
+    months = (month_start.year * 100 + month_start.month, month_end.year * 100 + month_end.month)
+    return head, months, tail
+
+
+class FireHistory:
+    """
+    觸發紀錄的佇列與儲存。record() 可以從任何執行緒呼叫;
+    threaded=False 時不啟動背景執行緒,需要自行呼叫 flush()(測試與基準測試用)。
+    """
+
+    def __init__(self, path, flush_interval=1.0, batch_size=1000, retention_days=RETENTION_DAYS, threaded=True):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.retention_days = retention_days
+        self.written = 0
+        self.flushes = 0
+        self._queue = deque()  # (時間, 提醒 id, 種類代碼);append/popleft 本身是執行緒安全的
+        self._lock = threading.Lock()  # 連線由背景執行緒與查詢共用
+        self._last_compact = 0.0
+        self.conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self.conn.execute("PRAGMA auto_vacuum=INCREMENTAL")  # 只對新檔案有效,壓縮後可以歸還空間
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS events (time REAL NOT NULL, reminder_id INTEGER NOT NULL, kind INTEGER NOT NULL)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS events_time ON events (time)")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS rollups ("
+            " day INTEGER NOT NULL,"
+            " reminder_id INTEGER NOT NULL,"
+            " kind INTEGER NOT NULL,"
+            " count INTEGER NOT NULL,"
+            " PRIMARY KEY (day, reminder_id, kind)) WITHOUT ROWID"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS monthly_rollups ("
+            " month INTEGER NOT NULL,"
+            " reminder_id INTEGER NOT NULL,"
+            " kind INTEGER NOT NULL,"
+            " count INTEGER NOT NULL,"
+            " PRIMARY KEY (month, reminder_id, kind)) WITHOUT ROWID"
+        )
+        self.conn.commit()
+        self._stopping = threading.Event()
+        self._wakeup = threading.Event()
+        self._thread = None
+        if threaded:
+            self._thread = threading.Thread(target=self._run, name="fire-history", daemon=True)
+            self._thread.start()
+
+    def record(self, reminder_id, kind, timestamp=None):
+        """
+        記錄一筆事件。只放入佇列,立即返回。
+        """
+        self._queue.append((time.time() if timestamp is None else timestamp, reminder_id, KIND_CODES[kind]))
+        if len(self._queue) >= self.batch_size:
+            self._wakeup.set()
+
+    def pending(self):
+        return len(self._queue)
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+            if time.time() - self._last_compact >= COMPACT_INTERVAL:
+                self.compact()
+
+    def flush(self):
+        """
+        將佇列中的事件在同一個交易中寫入,並累加每日與每月統計。回傳寫入的筆數。
+        """
+        batch = []
+        while self._queue and len(batch) < 100000:
+            batch.append(self._queue.popleft())
+        if not batch:
+            return 0
+        totals = Counter((day_key(moment), reminder_id, kind) for moment, reminder_id, kind in batch)
+        with self._lock, self.conn:
+            self.conn.executemany("INSERT INTO events (time, reminder_id, kind) VALUES (?, ?, ?)", batch)
+            self.conn.executemany(
+                "INSERT INTO rollups (day, reminder_id, kind, count) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (day, reminder_id, kind) DO UPDATE SET count = count + excluded.count",
+                [key + (count,) for key, count in totals.items()],
+            )
+            monthly = Counter()
+            for (day, reminder_id, kind), count in totals.items():
+                monthly[day // 100, reminder_id, kind] += count
+            self.conn.executemany(
+                "INSERT INTO monthly_rollups (month, reminder_id, kind, count) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (month, reminder_id, kind) DO UPDATE SET count = count + excluded.count",
+                [key + (count,) for key, count in monthly.items()],
+            )
+        self.written += len(batch)
+        self.flushes += 1
+        return len(batch)
+
+    def compact(self, now=None):
+        """
+        刪除超過保留天數的原始事件(統計已經包含它們),回傳刪除的筆數。
+        """
+        now = time.time() if now is None else now
+        self._last_compact = now
+        with self._lock:
+            with self.conn:
+                deleted = self.conn.execute("DELETE FROM events WHERE time < ?", (now - self.retention_days * 86400,)).rowcount
+            if deleted:
+                self.conn.executescript("PRAGMA incremental_vacuum")  # execute() 只會執行一步(釋放一頁)
+        return deleted
+
+    def summary(self, first_day, last_day=None):
+        """
+        回傳 {提醒 id: {種類: 次數}},統計 first_day 到 last_day(含)的期間。
+        完整的月份讀每月統計,頭尾不足一個月的日子讀每日統計。
+        """
+        last_day = first_day if last_day is None else last_day
+        head, months, tail = split_range(first_day, last_day)
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT reminder_id, kind, SUM(count) FROM ("
+                " SELECT reminder_id, kind, count FROM rollups WHERE day BETWEEN ? AND ?"
+                " UNION ALL SELECT reminder_id, kind, count FROM monthly_rollups WHERE month BETWEEN ? AND ?"
+                " UNION ALL SELECT reminder_id, kind, count FROM rollups WHERE day BETWEEN ? AND ?"
+                ") GROUP BY reminder_id, kind",
+                head + months + tail,
+            ).fetchall()
+        result = {}
+        for reminder_id, kind, count in rows:
+            result.setdefault(reminder_id, dict.fromkeys(EVENT_KINDS, 0))[EVENT_KINDS[kind]] = count
+        return result
+
+    def daily(self, reminder_id, first_day, last_day):
+        """
+        回傳 [(日期, {種類: 次數})],只列出有紀錄的日子,依日期排序。
+        """
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT day, kind, count FROM rollups WHERE day BETWEEN ? AND ? AND reminder_id = ? ORDER BY day",
+                (first_day, last_day, reminder_id),
+            ).fetchall()
+        days = {}
+        for day, kind, count in rows:
+            days.setdefault(day, dict.fromkeys(EVENT_KINDS, 0))[EVENT_KINDS[kind]] = count
+        return sorted(days.items())
+
+    def events(self, since, reminder_id=None):
+        """
+        回傳 since 之後的原始事件 [(時間, 提醒 id, 種類)],只保留最近 retention_days 天。
+        """
+        sql = "SELECT time, reminder_id, kind FROM events WHERE time >= ?"
+        parameters = (since,)
+        if reminder_id is not None:
+            sql += " AND reminder_id = ?"
+            parameters += (reminder_id,)
+        with self._lock:
+            rows = self.conn.execute(sql + " ORDER BY time", parameters).fetchall()
+        return [(moment, reminder_id, EVENT_KINDS[kind]) for moment, reminder_id, kind in rows]
+
+    def close(self):
+        """
+        停止背景執行緒並寫入剩下的事件。可以重複呼叫。
+        """
+        if self.conn is None:
+            return
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+        while self.flush():
+            pass
+        self.conn.close()
+        self.conn = None
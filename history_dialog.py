@@ -0,0 +1,79 @@
+import time
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QTableWidget, QTableWidgetItem, QHeaderView, QPushButton
+from fire_history import day_key
+
+# 統計期間的選項 (顯示文字, 天數)
+PERIODS = [("今天", 1), ("最近 7 天", 7), ("最近 30 天", 30), ("最近一年", 365)]
+HEADERS = ["提醒內容", "觸發", "完成", "稍後提醒", "錯過", "完成率"]
+
+
+class HistoryDialog(QDialog):
+    """
+    顯示每個提醒在一段期間內的完成情況,例如「喝水 6/8 次」。
+    只讀取每日統計,不會掃描原始觸發紀錄。
+    """
+
+    def __init__(self, parent, core):
+        super().__init__(parent)
+        self.core = core
+        self.history = core.history
+        self.init_UI()
+
+    def init_UI(self):
+        self.setWindowTitle("提醒紀錄")
+        self.setGeometry(100, 100, 500, 400)
+
+        # 建立主要佈局
+        main_layout = QVBoxLayout()
+        self.setLayout(main_layout)
+
+        # 建立期間選擇框
+        period_layout = QHBoxLayout()
+        period_label = QLabel("期間:")
+        self.period_combo = QComboBox()
+        for text, days in PERIODS:
+            self.period_combo.addItem(text, days)
+        self.period_combo.currentIndexChanged.connect(self.refresh)
+        period_layout.addWidget(period_label)
+        period_layout.addWidget(self.period_combo)
+        main_layout.addLayout(period_layout)
+
+        # 建立統計表格
+        self.table = QTableWidget(0, len(HEADERS))
+        self.table.setHorizontalHeaderLabels(HEADERS)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.table.setSortingEnabled(True)
+        main_layout.addWidget(self.table)
+
+        # 建立確定按鈕
+        ok_button = QPushButton("確定")
+        ok_button.clicked.connect(self.accept)
+        main_layout.addWidget(ok_button)
+
+    def refresh(self):
+        """
+        依選擇的期間重新讀取統計。還在佇列中的事件先寫入,剛關閉的通知也會算進去。
+        """
+        self.history.flush()
+        now = time.time()
+        days = self.period_combo.currentData()
+        summary = self.history.summary(day_key(now - (days - 1) * 86400), day_key(now))
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(len(summary))
+        for row, (reminder_id, counts) in enumerate(summary.items()):
+            reminder = self.core.reminders_by_id.get(reminder_id)
+            action = reminder["action"] if reminder else "(已刪除的提醒 %d)" % reminder_id
+            fired = counts["fired"]
+            rate = "%d/%d" % (counts["dismissed"], fired) if fired else "-"
+            values = [action, fired, counts["dismissed"], counts["snoozed"], counts["missed"], rate]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem()
+                item.setData(Qt.ItemDataRole.DisplayRole, value)  # 數字欄位依數值排序
+                self.table.setItem(row, column, item)
+        self.table.setSortingEnabled(True)
+
+    def exec(self):
+        self.refresh()
+        return super().exec()
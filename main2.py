@@ -1,16 +1,20 @@
+import startup_timing
 import sys
-import json
-import time
-from PyQt6.QtWidgets import QApplication, QWidget, QPushButton, QMessageBox
-from PyQt6.QtCore import QTimer, QTime
-import settings_dialog
+from PyQt6.QtWidgets import QApplication, QWidget, QPushButton
+startup_timing.mark("import PyQt6")
+from reminder_shell import setup_reminders
+startup_timing.mark("import app modules")
 
 
 class ReminderApp(QWidget):
-    def __init__(self, reminders):
+    def __init__(self, store=None, client=None, load_in_background=False):
         super().__init__()
-        self.reminders = reminders  # 儲存提醒列表
+        self.settings_dialog = None  # 第一次開啟時才建立,之後重複使用
+        self.history_dialog = None
         self.initUI()  # 初始化介面
+        # 提醒的資料、排程與通知分派都由 reminder_core 處理,這裡只負責畫面;
+        # 未指定儲存後端時優先連線到背景服務,作為輕量前端
+        setup_reminders(self, self.start_button, store, client, load_in_background)
 
     def initUI(self):
         self.setWindowTitle('提醒 APP')  # 設定視窗標題
@@ -23,49 +27,41 @@ class ReminderApp(QWidget):
         self.start_button.move(100, 50)  # 設定按鈕位置
 
         # 創建設定按鈕
-        self.start_button = QPushButton('設定', self)
-        self.start_button.clicked.connect(self.openSettings)  # 連接按鈕點擊事件
-        self.start_button.resize(100, 30)  # 設定按鈕大小
-        self.start_button.move(100, 100)  # 設定按鈕位置
+        self.settings_button = QPushButton('設定', self)
+        self.settings_button.clicked.connect(self.openSettings)  # 連接按鈕點擊事件
+        self.settings_button.resize(100, 30)  # 設定按鈕大小
+        self.settings_button.move(100, 100)  # 設定按鈕位置
+
+        # 創建紀錄按鈕
+        self.history_button = QPushButton('紀錄', self)
+        self.history_button.clicked.connect(self.openHistory)  # 連接按鈕點擊事件
+        self.history_button.resize(100, 30)  # 設定按鈕大小
+        self.history_button.move(100, 150)  # 設定按鈕位置
 
     def openSettings(self):
-        # 創建設定對話框
-        self.settings_dialog = settings_dialog.SettingsDialog(self, self.reminders)
+        # 第一次開啟時才載入並創建設定對話框,之後重複使用
+        if self.settings_dialog is None:
+            import settings_dialog
+            self.settings_dialog = settings_dialog.SettingsDialog(self, self.core)
         self.settings_dialog.exec()
 
+    def openHistory(self):
+        # 顯示每個提醒的完成情況,只讀取每日統計
+        if self.history_dialog is None:
+            from history_dialog import HistoryDialog
+            self.history_dialog = HistoryDialog(self, self.core)
+        self.history_dialog.exec()
 
     def startTimer(self):
-        # 創建一個計時器
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.checkReminders)  # 連接計時器超時事件
-        self.timer.start(1000)  # 每秒檢查一次
-
-    def checkReminders(self):
-        # 獲取當前時間
-        current_time = QTime.currentTime().toString("HH:mm:ss")
-        for reminder in self.reminders:
-            # 檢查當前時間是否與提醒時間相符
-            if reminder['time'] == current_time:
-                self.showReminder(reminder)  # 顯示提醒
-
-    def showReminder(self, reminder):
-        # 根據提醒類型顯示彈窗
-        if reminder['type'] == '彈窗':
-            msg = QMessageBox()  # 創建彈窗
-            msg.setIcon(QMessageBox.Icon.Information)  # 設定圖示
-            msg.setText(reminder['action'])  # 設定提醒內容
-            if reminder['image']:
-                msg.setInformativeText(f"查看圖片: {reminder['image']}")  # 顯示圖片資訊
-            msg.setWindowTitle("提醒")  # 設定彈窗標題
-            msg.exec()  # 顯示彈窗
+        # 單次計時器只在最早到期的提醒時喚醒;有背景服務時改為訂閱它的觸發事件
+        self.driver.start()
 
 if __name__ == '__main__':
-    # JSON 資料
-    # 從 reminder.json 檔案讀取 JSON 資料
-    with open('reminders.json', 'r', encoding='utf-8') as file:
-        reminders = json.load(file)  # 將 JSON 資料轉換為 Python 物件
-
     app = QApplication(sys.argv)  # 創建應用程式實例
-    reminder_app = ReminderApp(reminders)  # 創建提醒 APP 實例
+    startup_timing.mark("QApplication")
+    # 優先連線到背景服務(reminder_daemon.py),沒有執行時才直接開啟提醒資料庫
+    reminder_app = ReminderApp(load_in_background=True)  # 創建提醒 APP 實例,提醒在背景載入
+    startup_timing.mark("create window")
+    startup_timing.watch_first_paint(reminder_app)
     reminder_app.show()  # 顯示應用程式視窗
     sys.exit(app.exec())  # 執行應用程式並等待結束
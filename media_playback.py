@@ -0,0 +1,191 @@
+"""
+彈幕提醒的音效播放服務。
+
+播放器的建立、音訊裝置設定與解碼都在獨立的執行緒進行,GUI 執行緒只送出播放要求。
+播放器與音訊輸出組成的頻道會重複使用,同時播放的音效數量有上限:
+相同音效正在播放時合併成一次,超過上限時捨棄新的要求。
+preload() 預先在閒置的頻道設定即將觸發的音效,觸發時不必再載入。
+"""
+import logging
+import os
+
+from PyQt6.QtCore import QCoreApplication, QObject, QThread, QUrl, pyqtSignal, pyqtSlot
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENT = 3
+
+
+class AudioChannel(QObject):
+    """
+    一組 QMediaPlayer 與 QAudioOutput,播放結束或失敗時發出 finished。
+    QtMultimedia 只在第一次建立頻道時才載入。
+    """
+
+    finished = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        from PyQt6.QtMultimedia import QAudioOutput, QMediaPlayer
+
+        self._done_statuses = (QMediaPlayer.MediaStatus.EndOfMedia, QMediaPlayer.MediaStatus.InvalidMedia)
+        self.player = QMediaPlayer(self)
+        self.player.setAudioOutput(QAudioOutput(self.player))
+        self.player.mediaStatusChanged.connect(self._on_status_changed)
+        self.player.errorOccurred.connect(lambda *args: self.finished.emit())
+        self.path = None  # 目前設定的音效
+
+    def load(self, path):
+        if self.path != path:
+            self.path = path
+            self.player.setSource(QUrl.fromLocalFile(path))  # 同一個音效重複播放時不必重新載入
+
+    def play(self, path):
+        self.load(path)
+        self.player.setPosition(0)
+        self.player.play()
+
+    def _on_status_changed(self, status):
+        if status in self._done_statuses:
+            self.finished.emit()
+
+
+class PlaybackWorker(QObject):
+    """
+    在播放執行緒中管理頻道池。所有方法都只在播放執行緒中執行。
+    """
+
+    def __init__(self, max_concurrent, channel_factory):
+        super().__init__()
+        self.max_concurrent = max_concurrent
+        self.channel_factory = channel_factory
+        self.available = True
+        self.idle = []  # 閒置、可重複使用的頻道
+        self.active = {}  # 路徑 -> 播放中的頻道
+        self.played = 0
+        self.merged = 0
+        self.dropped = 0
+        self.preloaded = 0
+
+    @pyqtSlot(str)
+    def play(self, path):
+        if path in self.active:
+            self.merged += 1  # 相同音效正在播放,不重疊播放
+            return
+        if len(self.active) >= self.max_concurrent or not self.available:
+            self.dropped += 1
+            return
+        channel = self._take_idle(path) or self._create_channel()
+        if channel is None:
+            self.dropped += 1
+            return
+        self.active[path] = channel
+        self.played += 1
+        channel.play(path)
+
+    def _take_idle(self, path):
+        # 優先使用已預先載入這個音效的頻道
+        for index, channel in enumerate(self.idle):
+            if channel.path == path:
+                return self.idle.pop(index)
+        return self.idle.pop() if self.idle else None
+
+    @pyqtSlot(list)
+    def preload(self, paths):
+        """
+        在閒置的頻道設定 paths 中的音效(最多 max_concurrent 個),已載入的頻道保留不動。
+        """
+        if not self.available:
+            return
+        wanted = [path for path in dict.fromkeys(paths) if path not in self.active and os.path.exists(path)][: self.max_concurrent]
+        loaded = {channel.path for channel in self.idle}
+        spare = [channel for channel in self.idle if channel.path not in wanted]
+        for path in wanted:
+            if path in loaded:
+                continue
+            if spare:
+                channel = spare.pop()
+            elif len(self.idle) + len(self.active) < self.max_concurrent:
+                channel = self._create_channel()
+                if channel is None:
+                    return
+                self.idle.append(channel)
+            else:
+                return
+            channel.load(path)
+            self.preloaded += 1
+
+    def _create_channel(self):
+        try:
+            channel = self.channel_factory(self)
+        except ImportError as error:
+            # 沒有可用的多媒體後端時只顯示文字提醒
+            logger.warning("無法播放音效: %s", error)
+            self.available = False
+            return None
+        channel.finished.connect(lambda channel=channel: self._release(channel))
+        return channel
+
+    def _release(self, channel):
+        for path, active in list(self.active.items()):
+            if active is channel:
+                del self.active[path]
+                self.idle.append(channel)
+                return
+
+
+class PlaybackService(QObject):
+    """
+    GUI 執行緒使用的播放介面,play() 只會把要求排入播放執行緒,不會阻塞。
+    threaded 為 False 時在呼叫端的執行緒播放(基準測試用來比較)。
+    """
+
+    play_requested = pyqtSignal(str)
+    preload_requested = pyqtSignal(list)
+
+    def __init__(self, max_concurrent=DEFAULT_MAX_CONCURRENT, channel_factory=AudioChannel, threaded=True, parent=None):
+        super().__init__(parent)
+        self.worker = PlaybackWorker(max_concurrent, channel_factory)
+        self.thread = None
+        if threaded:
+            self.thread = QThread(self)
+            self.worker.moveToThread(self.thread)
+            self.thread.finished.connect(self.worker.deleteLater)
+            self.thread.start()
+            app = QCoreApplication.instance()
+            if app is not None:
+                app.aboutToQuit.connect(self.stop)
+        self.play_requested.connect(self.worker.play)
+        self.preload_requested.connect(self.worker.preload)
+
+    def play(self, path):
+        """
+        要求播放音效,立即返回。
+        """
+        self.play_requested.emit(path)
+
+    def preload(self, paths):
+        """
+        要求在播放執行緒預先載入即將播放的音效,立即返回。
+        """
+        if paths:
+            self.preload_requested.emit(list(paths))
+
+    def stop(self):
+        """
+        結束播放執行緒。
+        """
+        if self.thread is not None and self.thread.isRunning():
+            self.thread.quit()
+            self.thread.wait()
+
+    def stats(self):
+        worker = self.worker
+        return {
+            "played": worker.played,
+            "merged": worker.merged,
+            "dropped": worker.dropped,
+            "preloaded": worker.preloaded,
+            "active": len(worker.active),
+            "channels": len(worker.active) + len(worker.idle),
+        }
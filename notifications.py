@@ -0,0 +1,209 @@
+from collections import deque
+
+from PyQt6.QtCore import QObject, QTimer, Qt, pyqtSignal
+from PyQt6.QtGui import QGuiApplication
+from PyQt6.QtWidgets import QHBoxLayout, QLabel, QPushButton, QVBoxLayout, QWidget
+
+TOAST_WIDTH = 320
+TOAST_MARGIN = 12
+
+
+class ToastWidget(QWidget):
+    """
+    非強制回應的提醒小視窗,關閉後會回收給 NotificationManager 重複使用。
+    """
+
+    closed = pyqtSignal(object)
+    movie_users = {}  # QMovie -> 正在使用它的視窗數;動畫由資源快取共用,沒有視窗使用時才停止
+
+    def __init__(self):
+        super().__init__(None, Qt.WindowType.Tool | Qt.WindowType.FramelessWindowHint | Qt.WindowType.WindowStaysOnTopHint)
+        self.setAttribute(Qt.WidgetAttribute.WA_ShowWithoutActivating)
+        self.setFixedWidth(TOAST_WIDTH)
+        self.movie = None
+        self.slot = None
+        self.snooze = None  # 按下「稍後提醒」時呼叫的函式
+        self.on_close = None  # 關閉時以結果呼叫:dismissed、snoozed 或 missed
+
+        # 建立主要佈局
+        main_layout = QHBoxLayout()
+        self.setLayout(main_layout)
+
+        # 建立動畫與文字區塊
+        self.movie_label = QLabel()
+        main_layout.addWidget(self.movie_label)
+        text_layout = QVBoxLayout()
+        self.title_label = QLabel()
+        self.message_label = QLabel()
+        self.message_label.setWordWrap(True)
+        text_layout.addWidget(self.title_label)
+        text_layout.addWidget(self.message_label)
+        main_layout.addLayout(text_layout, 1)
+
+        # 建立稍後提醒與確定按鈕
+        self.snooze_button = QPushButton("稍後提醒")
+        self.snooze_button.clicked.connect(self.snooze_and_dismiss)
+        main_layout.addWidget(self.snooze_button)
+        ok_button = QPushButton("確定")
+        ok_button.clicked.connect(lambda: self.dismiss("dismissed"))
+        main_layout.addWidget(ok_button)
+
+        # 逾時自動關閉
+        self.hide_timer = QTimer(self)
+        self.hide_timer.setSingleShot(True)
+        self.hide_timer.timeout.connect(lambda: self.dismiss("missed"))
+
+    def show_notification(self, notification, slot, timeout_ms):
+        """
+        顯示提醒內容並移動到螢幕右下角第 slot 個位置。
+        """
+        self.slot = slot
+        self.title_label.setText(notification["title"])
+        self.message_label.setText(notification["message"])
+        self.movie = notification.get("movie")
+        self.snooze = notification.get("snooze")
+        self.on_close = notification.get("on_close")
+        self.snooze_button.setVisible(self.snooze is not None)
+        self.movie_label.setMovie(self.movie)
+        self.movie_label.setVisible(self.movie is not None)
+        if self.movie is not None:
+            users = ToastWidget.movie_users
+            users[self.movie] = users.get(self.movie, 0) + 1
+            self.movie.start()
+        self.adjustSize()
+
+        screen = QGuiApplication.primaryScreen()
+        if screen is not None:
+            area = screen.availableGeometry()
+            y = area.bottom() - (slot + 1) * (self.height() + TOAST_MARGIN)
+            self.move(area.right() - TOAST_WIDTH - TOAST_MARGIN, y)
+        self.show()
+        if timeout_ms:
+            self.hide_timer.start(timeout_ms)
+
+    def snooze_and_dismiss(self):
+        snooze = self.snooze
+        self.dismiss("snoozed")
+        if snooze is not None:
+            snooze()
+
+    def dismiss(self, outcome="missed"):
+        if not self.isVisible():
+            return
+        self.hide_timer.stop()
+        self.hide()
+        # 動畫由資源快取共用,這裡只解除綁定不刪除;沒有其他視窗使用時停止,不再有影格計時器喚醒
+        self.movie_label.setMovie(None)
+        if self.movie is not None:
+            users = ToastWidget.movie_users
+            users[self.movie] -= 1
+            if not users[self.movie]:
+                del users[self.movie]
+                self.movie.stop()
+        self.movie = None
+        self.snooze = None
+        on_close, self.on_close = self.on_close, None
+        if on_close is not None:
+            on_close(outcome)
+        self.closed.emit(self)
+
+
+class NotificationManager(QObject):
+    """
+    非強制回應的提醒佇列。
+    同一輪事件迴圈內送出的大量提醒會合併成一則,同時顯示的視窗數量有上限,
+    notify() 只把提醒放入佇列,永遠不會阻塞排程器。
+    搭配 DispatchQueue 時以 available() 只送出有空位顯示的提醒,視窗關閉時發出 slot_freed,
+    積壓的提醒留在 DispatchQueue 依優先順序排隊。
+    """
+
+    slot_freed = pyqtSignal()  # 有視窗關閉,騰出了空位
+
+    def __init__(self, max_visible=3, timeout_ms=15000, coalesce_threshold=3, parent=None):
+        super().__init__(parent)
+        self.max_visible = max_visible
+        self.timeout_ms = timeout_ms
+        self.coalesce_threshold = coalesce_threshold
+        self._pending = []  # 本輪事件迴圈尚未處理的提醒
+        self._queue = deque()  # 等待顯示的提醒
+        self._visible = []  # 目前顯示中的視窗
+        self._pool = []  # 可重複使用的視窗
+        self.posted = 0
+        self.shown = 0
+        self.coalesced = 0
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.timeout.connect(self._flush)
+
+    def notify(self, message, title="提醒", movie=None, snooze=None, on_close=None):
+        """
+        將提醒放入佇列,於下一輪事件迴圈顯示。
+        snooze 是選用的函式,指定時提醒會顯示「稍後提醒」按鈕;
+        on_close 會在通知關閉時以結果(dismissed、snoozed 或 missed)呼叫。
+        """
+        self._pending.append({"title": title, "message": message, "movie": movie, "snooze": snooze, "on_close": on_close})
+        self.posted += 1
+        if not self._flush_timer.isActive():
+            self._flush_timer.start(0)
+
+    def _flush(self):
+        batch, self._pending = self._pending, []
+        if len(batch) > self.coalesce_threshold:
+            # 同一時間觸發太多提醒時合併為一則摘要
+            self.coalesced += len(batch) - 1
+            preview = "、".join(item["message"] for item in batch[: self.coalesce_threshold])
+            # 摘要的稍後提醒會一起延後所有合併的提醒
+            snoozes = [item["snooze"] for item in batch if item["snooze"] is not None]
+            snooze = (lambda: [snooze() for snooze in snoozes]) if snoozes else None
+            closers = [item["on_close"] for item in batch if item["on_close"] is not None]
+            on_close = (lambda outcome: [on_close(outcome) for on_close in closers]) if closers else None
+            batch = [{"title": "%d 個提醒" % len(batch), "message": preview + " …", "movie": None, "snooze": snooze, "on_close": on_close}]
+        self._queue.extend(batch)
+        self._show_next()
+
+    def _show_next(self):
+        while self._queue and len(self._visible) < self.max_visible:
+            toast = self._pool.pop() if self._pool else self._create_toast()
+            used_slots = {visible.slot for visible in self._visible}
+            slot = next(index for index in range(self.max_visible) if index not in used_slots)
+            self._visible.append(toast)
+            toast.show_notification(self._queue.popleft(), slot, self.timeout_ms)
+            self.shown += 1
+
+    def _create_toast(self):
+        toast = ToastWidget()
+        toast.closed.connect(self._on_toast_closed)
+        return toast
+
+    def _on_toast_closed(self, toast):
+        self._visible.remove(toast)
+        self._pool.append(toast)
+        self._show_next()
+        self.slot_freed.emit()
+
+    def available(self):
+        """
+        目前還能立即顯示的提醒數(扣掉顯示中與尚未顯示的提醒)。
+        """
+        return max(0, self.max_visible - len(self._visible) - len(self._queue) - len(self._pending))
+
+    def dismiss_all(self):
+        """
+        關閉所有顯示中的提醒並清空佇列,未顯示的提醒視為沒有回應。
+        """
+        for notification in self._queue:
+            if notification["on_close"] is not None:
+                notification["on_close"]("missed")
+        self._queue.clear()
+        for toast in list(self._visible):
+            toast.dismiss()
+
+    def stats(self):
+        return {
+            "posted": self.posted,
+            "shown": self.shown,
+            "coalesced": self.coalesced,
+            "queued": len(self._queue) + len(self._pending),
+            "visible": len(self._visible),
+        }
@@ -0,0 +1,192 @@
+"""
+提醒的重複規則。
+
+規則字串(儲存在提醒的 "repeat" 欄位):
+    ""                  每天在 time 觸發(預設,與舊資料相容)
+    "daily"             每天
+    "weekdays"          週一到週五
+    "weekly:0,2,4"      每週指定的星期(0 = 週一 … 6 = 週日)
+    "every:15"          從 time 開始每 15 分鐘一次,直到當天結束
+    "monthly:15"        每月 15 日(超過當月天數時改為最後一天)
+    "cron:*/30 9-17 * * 1-5"
+                        cron 格式(分 時 日 月 星期),星期與 cron 相同:0 或 7 = 週日、1 = 週一,秒數取自 time
+"""
+import calendar
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+DAY_SECONDS = 86400
+MAX_CRON_DAYS = 366 * 5
+CRON_CHECK_START = datetime(2000, 1, 1)
+
+
+class RecurrenceError(ValueError):
+    pass
+
+
+def _parse_cron_field(field, low, high):
+    values = set()
+    for part in field.split(","):
+        step = 1
+        if "/" in part:
+            part, step_text = part.split("/", 1)
+            step = int(step_text)
+            if step <= 0:
+                raise RecurrenceError("cron 間隔必須大於 0")
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start, end = (int(value) for value in part.split("-", 1))
+        else:
+            start = end = int(part)
+            if step != 1:
+                end = high
+        if start < low or end > high or start > end:
+            raise RecurrenceError("cron 欄位超出範圍: %s" % field)
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+@lru_cache(maxsize=4096)
+def parse_rule(rule):
+    """
+    解析規則字串,回傳 (種類, 參數)。相同規則只解析一次。
+    """
+    rule = (rule or "").strip()
+    if rule in ("", "daily"):
+        return ("daily", None)
+    if rule == "weekdays":
+        return ("weekly", frozenset(range(5)))
+    kind, _, argument = rule.partition(":")
+    try:
+        if kind == "weekly":
+            days = frozenset(int(day) for day in argument.split(","))
+            if not days or min(days) < 0 or max(days) > 6:
+                raise RecurrenceError("星期必須介於 0 到 6")
+            return ("weekly", days)
+        if kind == "every":
+            minutes = int(argument)
+            if minutes <= 0:
+                raise RecurrenceError("間隔分鐘數必須大於 0")
+            return ("every", minutes * 60)
+        if kind == "monthly":
+            day = int(argument)
+            if not 1 <= day <= 31:
+                raise RecurrenceError("日期必須介於 1 到 31")
+            return ("monthly", day)
+        if kind == "cron":
+            fields = argument.split()
+            if len(fields) != 5:
+                raise RecurrenceError("cron 規則需要 5 個欄位")
+            minutes, hours, days, months, weekdays = (
+                _parse_cron_field(field, low, high)
+                for field, (low, high) in zip(fields, ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7)))
+            )
+            weekdays = frozenset(weekday % 7 for weekday in weekdays)  # 7 與 0 都是週日
+            # 與 cron 相同:日與星期都有限制時,符合任一即可
+            day_restricted = fields[2] != "*"
+            weekday_restricted = fields[4] != "*"
+            return ("cron", (tuple(sorted(minutes)), tuple(sorted(hours)), days, months, weekdays, day_restricted, weekday_restricted))
+    except ValueError as error:
+        if isinstance(error, RecurrenceError):
+            raise
+        raise RecurrenceError("無法解析重複規則: %s" % rule) from error
+    raise RecurrenceError("不支援的重複規則: %s" % rule)
+
+
+def validate_rule(rule):
+    """
+    檢查規則字串是否合法並且會觸發,不合法時拋出 RecurrenceError。
+    cron 規則可能每個欄位都合法卻永遠不會觸發(例如 2 月 31 日),因此實際計算一次觸發時間。
+    """
+    kind, argument = parse_rule(rule)
+    if kind == "cron":
+        _check_cron(argument)
+
+
+@lru_cache(maxsize=1024)
+def _check_cron(spec):
+    # 任何連續 MAX_CRON_DAYS 天都包含所有月份的所有日期(含 2 月 29 日),所以從固定日期開始找即可
+    _next_cron(spec, 0, CRON_CHECK_START)
+
+
+def _at(day, seconds):
+    return datetime.combine(day, datetime.min.time()) + timedelta(seconds=seconds)
+
+
+def next_occurrence(rule, seconds, after):
+    """
+    計算規則在 after 之後(含 after,精確到秒)的下一次觸發時間。
+    seconds 為提醒 time 欄位換算的當日秒數。除 cron 外皆為 O(1)。
+    """
+    kind, argument = parse_rule(rule)
+    after = after.replace(microsecond=0)
+    today = after.date()
+    now_seconds = after.hour * 3600 + after.minute * 60 + after.second
+
+    if kind == "daily":
+        return _at(today if seconds >= now_seconds else today + timedelta(days=1), seconds)
+
+    if kind == "weekly":
+        offset = 0 if seconds >= now_seconds else 1
+        for extra in range(offset, offset + 7):
+            day = today + timedelta(days=extra)
+            if day.weekday() in argument:
+                return _at(day, seconds)
+
+    if kind == "every":
+        if now_seconds <= seconds:
+            return _at(today, seconds)
+        steps = -(-(now_seconds - seconds) // argument)  # 無條件進位
+        candidate = seconds + steps * argument
+        if candidate < DAY_SECONDS:
+            return _at(today, candidate)
+        return _at(today + timedelta(days=1), seconds)
+
+    if kind == "monthly":
+        year, month = today.year, today.month
+        for _ in range(2):
+            day = min(argument, calendar.monthrange(year, month)[1])
+            candidate = _at(today.replace(day=day), seconds)
+            if candidate >= after:
+                return candidate
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+            today = today.replace(year=year, month=month, day=1)
+
+    if kind == "cron":
+        return _next_cron(argument, seconds % 60, after)
+
+    raise RecurrenceError("無法計算下一次觸發時間: %s" % rule)
+
+
+def _next_cron(spec, second, after):
+    minutes, hours, days, months, weekdays, day_restricted, weekday_restricted = spec
+    day = after.date()
+    for offset in range(MAX_CRON_DAYS):
+        if day.month in months:
+            day_match = day.day in days
+            weekday_match = (day.weekday() + 1) % 7 in weekdays  # cron 的星期從週日 = 0 開始
+            if day_restricted and weekday_restricted:
+                matched = day_match or weekday_match
+            else:
+                matched = day_match and weekday_match
+            if matched:
+                for hour in hours:
+                    if offset == 0 and hour < after.hour:
+                        continue
+                    for minute in minutes:
+                        candidate = _at(day, hour * 3600 + minute * 60 + second)
+                        if candidate >= after:
+                            return candidate
+        day += timedelta(days=1)
+    raise RecurrenceError("cron 規則在 %d 天內沒有觸發時間" % MAX_CRON_DAYS)
+
+
+def occurrences(rule, seconds, start, end):
+    """
+    依序產生 [start, end] 區間內的所有觸發時間。
+    """
+    current = next_occurrence(rule, seconds, start)
+    while current <= end:
+        yield current
+        current = next_occurrence(rule, seconds, current + timedelta(seconds=1))
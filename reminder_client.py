@@ -0,0 +1,129 @@
+import getpass
+import json
+import os
+import socket
+import tempfile
+
+
+def default_socket_path():
+    """
+    背景服務的 Unix socket 路徑,可用 REMINDER_SOCKET 環境變數覆寫。
+    """
+    path = os.environ.get("REMINDER_SOCKET")
+    if path:
+        return path
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    user = os.getuid() if hasattr(os, "getuid") else getpass.getuser()  # Windows 沒有 getuid
+    return os.path.join(runtime_dir, "worklife-reminder-%s.sock" % user)
+
+
+def encode_message(message):
+    return (json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+class DaemonError(Exception):
+    pass
+
+
+class ReminderClient:
+    """
+    連線到 reminder_daemon 的同步用戶端,不依賴 Qt。
+    協定為每行一個 JSON 物件。
+    """
+
+    def __init__(self, path=None, timeout=5):
+        if not hasattr(socket, "AF_UNIX"):
+            # 與連線失敗相同,呼叫端會改為直接開啟提醒資料庫
+            raise OSError("此平台不支援 Unix socket,無法連線到背景服務")
+        self.path = path or default_socket_path()
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        try:
+            self.sock.connect(self.path)
+        except OSError:
+            self.sock.close()
+            raise
+        self._file = self.sock.makefile("rb")
+
+    def close(self):
+        self._file.close()
+        self.sock.close()
+
+    def _read_message(self):
+        line = self._file.readline()
+        if not line:
+            raise DaemonError("背景服務已中斷連線")
+        return json.loads(line)
+
+    def request(self, command, **fields):
+        """
+        送出指令並等待回應,失敗時拋出 DaemonError。
+        """
+        fields["command"] = command
+        self.sock.sendall(encode_message(fields))
+        response = self._read_message()
+        if not response.get("ok"):
+            raise DaemonError(response.get("error", "未知錯誤"))
+        return response
+
+    def list(self):
+        return self.request("list")["reminders"]
+
+    def add(self, reminder):
+        """
+        新增提醒事件,並將背景服務產生的 id 寫回 reminder["id"]。
+        """
+        reminder["id"] = self.request("add", reminder=reminder)["id"]
+        return reminder["id"]
+
+    def update(self, reminder):
+        self.request("update", reminder=reminder)
+
+    def delete(self, reminder_id):
+        self.request("delete", id=reminder_id)
+
+    def groups(self):
+        """
+        回傳 {群組名稱: 是否啟用}。
+        """
+        return self.request("groups")["groups"]
+
+    def disabled_groups(self):
+        return {name for name, enabled in self.groups().items() if not enabled}
+
+    def set_group_enabled(self, name, enabled):
+        self.request("set_group", name=name, enabled=enabled)
+
+    def snooze(self, reminder_id, seconds):
+        """
+        請背景服務在 seconds 秒後再觸發一次提醒,回傳觸發的 epoch 秒數。
+        """
+        return self.request("snooze", id=reminder_id, seconds=seconds)["due"]
+
+    def reload(self):
+        """
+        請背景服務立即套用其他行程直接寫入資料庫的變更,回傳是否有變更。
+        """
+        return self.request("reload")["changed"]
+
+    def history_path(self):
+        """
+        背景服務的觸發紀錄檔案(絕對路徑),前端在同一個檔案記錄使用者的回應。
+        """
+        return self.request("ping")["history"]
+
+    def stats(self):
+        """
+        取得背景服務的排程量測資料(觸發延遲、延遲/錯過次數、事件迴圈卡住次數)。
+        """
+        return self.request("stats")["stats"]
+
+    def events(self):
+        """
+        訂閱觸發事件,逐一產生背景服務推送的事件(會阻塞)。
+        訂閱後此連線只能用來接收事件。
+        """
+        self.request("subscribe")
+        self.sock.settimeout(None)
+        while True:
+            yield self._read_message()
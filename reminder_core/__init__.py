@@ -0,0 +1,40 @@
+"""
+提醒核心:提醒的資料格式、儲存、排程與通知分派,不依賴 Qt,可以在沒有顯示器的環境匯入與量測。
+
+    from reminder_core import ReminderStore, open_core
+
+    core = open_core(ReminderStore())
+    core.load()
+    core.add(new_reminder("09:00:00", "喝水"))
+    core.fire_due()  # 將已到期的提醒排入通知佇列
+    core.dispatcher.drain()  # 依優先順序與速率限制顯示通知
+
+main.py 與 main2.py 只是外殼:以 reminder_core.qt_driver.CoreDriver 的 Qt 計時器驅動核心,
+通知、音效與設定頁面透過 core.dispatcher.attach() 與 core.view 接上。
+"""
+from fire_history import FireHistory, history_path
+from reminder_index import ReminderIndex
+from reminder_scheduler import ReminderScheduler
+from reminder_store import ReminderStore
+
+from .dispatch import Dispatcher, DispatchQueue, TokenBucket
+from .engine import ReminderCore, connect_backend, open_core
+from .model import QT_TIME_FORMAT, SNOOZE_MINUTES, new_reminder, normalize_reminder
+
+__all__ = [
+    "DispatchQueue",
+    "Dispatcher",
+    "FireHistory",
+    "QT_TIME_FORMAT",
+    "ReminderCore",
+    "ReminderIndex",
+    "ReminderScheduler",
+    "ReminderStore",
+    "SNOOZE_MINUTES",
+    "TokenBucket",
+    "connect_backend",
+    "history_path",
+    "new_reminder",
+    "normalize_reminder",
+    "open_core",
+]
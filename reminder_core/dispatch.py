@@ -0,0 +1,298 @@
+import time
+from collections import deque
+
+from reminder_store import PRIORITIES
+
+OVERFLOW_POLICIES = ("drop_lowest", "drop_oldest", "drop_new")
+DEFAULT_RATE = 1.0  # 每秒最多顯示的通知數
+DEFAULT_BURST = 3  # 一次最多連續顯示的通知數(與同時顯示的視窗數相同)
+DEFAULT_DEDUP_SECONDS = 60  # 這段時間內內容相同的提醒只顯示一次
+DEFAULT_MAX_DEPTH = 50  # 佇列最多保留的通知數
+
+
+def _reminder_key(reminder):
+    # 有 id 的提醒以 id 識別(背景服務推送的觸發每次都是新的 dict),沒有 id 時以物件身分識別
+    reminder_id = reminder.get("id")
+    return reminder_id if reminder_id is not None else id(reminder)
+
+
+def priority_rank(reminder):
+    """
+    回傳提醒的優先順序(0 最高),未設定的視為「一般」。
+    """
+    return PRIORITIES.index(reminder.get("priority") or "一般")
+
+
+class TokenBucket:
+    """
+    權杖桶:每秒補充 rate 個權杖,最多累積 burst 個,每顯示一則通知用掉一個。
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST, now=time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.now = now
+        self.tokens = float(burst)
+        self.updated = now()
+
+    def _refill(self):
+        current = self.now()
+        self.tokens = min(self.burst, self.tokens + (current - self.updated) * self.rate)
+        self.updated = current
+
+    def take(self):
+        """
+        有權杖時用掉一個並回傳 True。
+        """
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def seconds_until_token(self):
+        self._refill()
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+
+class DispatchQueue:
+    """
+    依優先順序排隊的通知佇列,不依賴 Qt:
+    - 每個優先順序一個 deque,取出時由高到低、同順序先進先出,put()/pop() 都是 O(1);
+    - 佇列中已有內容(action)相同的通知時合併成一則;其他提醒剛顯示過相同內容時,
+      dedup_seconds 內不再顯示(同一個提醒的下一次觸發不受影響,例如 every:1);
+    - 超過 max_depth 時依 overflow 丟棄:drop_lowest 丟優先順序最低的一則(同順序時丟最新的,
+      通常就是新加入的一則)、drop_oldest 丟最舊的一則、drop_new 丟新加入的一則;
+    - 由權杖桶限制顯示速率。
+    佇列中的項目是 {"action": 內容, "reminders": [提醒, ...]},被丟棄或去重的提醒交給 on_drop(提醒)。
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST, dedup_seconds=DEFAULT_DEDUP_SECONDS,
+                 max_depth=DEFAULT_MAX_DEPTH, overflow="drop_lowest", on_drop=None, now=time.monotonic):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError("overflow 必須是 %s 之一: %r" % ("、".join(OVERFLOW_POLICIES), overflow))
+        self.bucket = TokenBucket(rate, burst, now)
+        self.dedup_seconds = dedup_seconds
+        self.max_depth = max_depth
+        self.overflow = overflow
+        self.on_drop = on_drop
+        self.now = now
+        self._levels = [deque() for _ in PRIORITIES]
+        self._pending = {}  # action -> 佇列中的項目
+        self._recent = {}  # action -> (最後顯示的時間, 該則通知包含的提醒)
+        self._order = deque()  # 依加入順序排列的項目,drop_oldest 使用;已取出的項目延後移除
+        self.depth = 0
+        self.queued = 0
+        self.released = 0
+        self.merged = 0
+        self.deduped = 0
+        self.dropped = 0
+
+    def __len__(self):
+        return self.depth
+
+    def put(self, reminder):
+        """
+        加入一筆觸發的提醒,回傳是否排入佇列(合併到既有的項目也算)。
+        """
+        action = reminder.get("action") or ""
+        entry = self._pending.get(action)
+        if entry is not None:
+            entry["reminders"].append(reminder)
+            # 合併後取較高的優先順序
+            rank = priority_rank(reminder)
+            if rank < entry["rank"]:
+                self._levels[entry["rank"]].remove(entry)
+                entry["rank"] = rank
+                self._levels[rank].append(entry)
+            self.merged += 1
+            return True
+        recent = self._recent.get(action)
+        if recent is not None and self.now() - recent[0] < self.dedup_seconds and _reminder_key(reminder) not in recent[1]:
+            self.deduped += 1
+            self._drop(reminder)
+            return False
+        rank = priority_rank(reminder)
+        if self.depth >= self.max_depth and not self._make_room(rank):
+            self.dropped += 1
+            self._drop(reminder)
+            return False
+        entry = {"action": action, "reminders": [reminder], "rank": rank, "live": True}
+        self._levels[rank].append(entry)
+        self._pending[action] = entry
+        self._order.append(entry)
+        self.depth += 1
+        self.queued += 1
+        return True
+
+    def _make_room(self, rank):
+        # 依 overflow 政策丟棄一個既有項目,回傳是否騰出空間
+        if self.overflow == "drop_new":
+            return False
+        if self.overflow == "drop_oldest":
+            while not self._order[0]["live"]:
+                self._order.popleft()
+            victim = self._order.popleft()
+            self._levels[victim["rank"]].remove(victim)
+        else:
+            lowest = max(level for level, entries in enumerate(self._levels) if entries)
+            if lowest <= rank:
+                return False
+            victim = self._levels[lowest].pop()
+        self._discard(victim)
+        self.dropped += len(victim["reminders"])
+        for reminder in victim["reminders"]:
+            self._drop(reminder)
+        return True
+
+    def _discard(self, entry):
+        entry["live"] = False
+        del self._pending[entry["action"]]
+        self.depth -= 1
+        if len(self._order) > 2 * self.max_depth:
+            self._order = deque(item for item in self._order if item["live"])
+
+    def _drop(self, reminder):
+        if self.on_drop is not None:
+            self.on_drop(reminder)
+
+    def pop(self):
+        """
+        有權杖時取出優先順序最高的項目,否則回傳 None。
+        """
+        if not self.depth or not self.bucket.take():
+            return None
+        entry = next(level for level in self._levels if level).popleft()
+        self._discard(entry)
+        self.released += 1
+        current = self.now()
+        self._recent[entry["action"]] = (current, {_reminder_key(reminder) for reminder in entry["reminders"]})
+        if len(self._recent) > 4 * self.max_depth:
+            self._recent = {action: recent for action, recent in self._recent.items() if current - recent[0] < self.dedup_seconds}
+        return entry
+
+    def seconds_until_ready(self):
+        """
+        距離下一個項目可以取出的秒數,佇列為空時回傳 None。
+        """
+        if not self.depth:
+            return None
+        return self.bucket.seconds_until_token()
+
+    def clear(self):
+        """
+        清空佇列,回傳尚未顯示的提醒。
+        """
+        reminders = [reminder for level in self._levels for entry in level for reminder in entry["reminders"]]
+        for level in self._levels:
+            level.clear()
+        self._pending.clear()
+        self._order.clear()
+        self.depth = 0
+        return reminders
+
+    def stats(self):
+        return {
+            "queued": self.queued,
+            "released": self.released,
+            "merged": self.merged,
+            "deduped": self.deduped,
+            "dropped": self.dropped,
+            "depth": self.depth,
+        }
+
+
+class Dispatcher:
+    """
+    將觸發的提醒轉成通知:依提醒類型決定顯示方式,並把觸發與使用者的回應寫入觸發紀錄。
+    實際的顯示由外殼以 attach() 提供的函式負責,未提供時只計數,方便無頭執行與基準測試。
+
+    dispatch() 只把提醒排入 DispatchQueue,不會阻塞排程器;drain() 依優先順序與速率限制
+    顯示佇列中的通知。設定 wake 時由外殼在排程器之外呼叫 drain()(例如 CoreDriver 的計時器),
+    否則 dispatch() 會立即 drain()。
+    提供 available 時只在外殼還有空位時取出通知,其餘留在佇列中,之後到期的高優先順序提醒
+    仍可以插隊;外殼騰出空位時應再呼叫 drain()(例如 NotificationManager.slot_freed)。
+    """
+
+    def __init__(self, history=None, snooze=None, queue=None, record_fired=True):
+        self.history = history  # 選用的 FireHistory
+        self.record_fired = record_fired  # 由背景服務排程時它已記錄觸發,這裡只記錄回應
+        self.snooze = snooze  # snooze(提醒):按下「稍後提醒」時呼叫
+        self.notify = None  # notify(訊息, movie=, snooze=, on_close=),例如 NotificationManager.notify
+        self.play = None  # play(路徑):播放彈幕提醒的音效,例如 PlaybackService.play
+        self.movie = None  # movie(路徑):取得已解碼的提醒圖片,例如 AssetCache.movie
+        self.available = None  # available():外殼目前還能顯示幾則通知,例如 NotificationManager.available
+        self.wake = None  # wake():佇列有新的通知時呼叫,由外殼安排稍後 drain()
+        self.queue = queue if queue is not None else DispatchQueue()
+        self.queue.on_drop = self._on_drop
+        self.dispatched = 0
+        self.shown = 0
+
+    def attach(self, notify=None, play=None, movie=None, available=None):
+        self.notify = notify
+        self.play = play
+        self.movie = movie
+        self.available = available
+
+    def dispatch(self, reminder):
+        """
+        記錄觸發並把提醒排入佇列。
+        """
+        self.dispatched += 1
+        if self.history is not None and self.record_fired and "id" in reminder:
+            self.history.record(reminder["id"], "fired")
+        self.queue.put(reminder)
+        if self.wake is not None:
+            self.wake()
+        else:
+            self.drain()
+
+    def drain(self):
+        """
+        顯示速率限制內可以顯示的通知,回傳距離下一則可以顯示的秒數
+        (佇列已空,或外殼沒有空位、要等它騰出空位時為 None)。
+        """
+        while True:
+            if self.available is not None and self.available() <= 0:
+                return None
+            entry = self.queue.pop()
+            if entry is None:
+                return self.queue.seconds_until_ready()
+            self._show(entry["reminders"])
+
+    def _show(self, reminders):
+        # 合併的提醒顯示成一則,稍後提醒與回應套用到每一筆
+        self.shown += 1
+        reminder = reminders[0]
+        on_close = None
+        recorded = [item["id"] for item in reminders if "id" in item]
+        if self.history is not None and recorded:
+            on_close = lambda outcome: [self.history.record(reminder_id, outcome) for reminder_id in recorded]
+        snooze = (lambda: [self.snooze(item) for item in reminders]) if self.snooze is not None else None
+        movie = None
+        if reminder["type"] == "彈窗":
+            if reminder.get("image") and self.movie is not None:
+                movie = self.movie(reminder["image"])  # 使用快取中已解碼的圖片
+        elif reminder["type"] == "彈幕":
+            if reminder.get("image") and self.play is not None:
+                self.play(reminder["image"])  # 只排入播放執行緒
+        if self.notify is not None:
+            self.notify(reminder["action"], movie=movie, snooze=snooze, on_close=on_close)
+
+    def _on_drop(self, reminder):
+        # 被丟棄或去重的提醒不會顯示,視為沒有回應
+        if self.history is not None and "id" in reminder:
+            self.history.record(reminder["id"], "missed")
+
+    def clear(self):
+        """
+        清空佇列,尚未顯示的提醒記錄為沒有回應。
+        """
+        for reminder in self.queue.clear():
+            self._on_drop(reminder)
+
+    def stats(self):
+        stats = self.queue.stats()
+        stats["dispatched"] = self.dispatched
+        stats["shown"] = self.shown
+        return stats
@@ -0,0 +1,261 @@
+import logging
+import time
+
+from fire_history import FireHistory, history_path
+from reminder_client import DaemonError
+from reminder_index import ReminderIndex
+from reminder_scheduler import ReminderScheduler
+from reminder_store import diff_changes
+from scheduler_metrics import SchedulerMetrics
+
+from .dispatch import Dispatcher
+from .model import SNOOZE_MINUTES, normalize_reminder
+
+logger = logging.getLogger(__name__)
+
+
+class ReminderCore:
+    """
+    不依賴 Qt 的提醒核心。持有提醒列表、儲存後端(ReminderStore 或背景服務的 ReminderClient)、
+    排程器、搜尋索引、群組狀態與通知分派,所有前端都透過這裡讀寫提醒。
+
+    提醒列表 reminders 在整個生命週期都是同一個 list 物件,表格模型可以直接引用;
+    設定 view(ReminderTableModel 或相同介面的物件)後,列表的變動會同時發出對應的列訊號。
+    每次變動後以事件名稱呼叫 listeners:"loaded"、"changed" 或 "groups"。
+    """
+
+    def __init__(self, store=None, client=None, history=None, now=time.time, tz=None):
+        self.store = store
+        self.client = client
+        self.backend = client or store  # 背景服務執行時由它負責寫入與排程
+        self.now = now
+        self.tz = tz
+        self.reminders = []
+        self.reminders_by_id = {}
+        self.disabled_groups = set()  # 排程器與表格模型共用同一個集合
+        self.metrics = SchedulerMetrics()
+        self.scheduler = self._new_scheduler()
+        self.index = ReminderIndex()
+        self.history = history
+        self.dispatcher = Dispatcher(history, snooze=self.snooze, record_fired=client is None)
+        self.view = None
+        self.listeners = []
+
+    def _new_scheduler(self, reminders=()):
+        scheduler = ReminderScheduler(reminders, now=self.now, tz=self.tz, metrics=self.metrics)
+        scheduler.disabled_groups = self.disabled_groups
+        return scheduler
+
+    def _notify(self, event):
+        for listener in list(self.listeners):
+            listener(event)
+
+    def use_store(self, store):
+        """
+        背景服務中斷後改為直接讀寫提醒資料庫(之後應呼叫 load() 重新載入)。
+        """
+        if self.client is not None:
+            self.client.close()
+        self.client = None
+        self.store = store
+        self.backend = store
+        self.dispatcher.record_fired = True  # 之後由本機排程
+
+    def read_all(self):
+        """
+        從儲存後端讀取全部提醒(不修改核心的狀態,可在背景執行緒以另一個連線呼叫)。
+        """
+        return self.client.list() if self.client is not None else self.store.load()
+
+    def load(self, reminders=None):
+        """
+        以 reminders(預設從儲存後端讀取)取代目前的提醒,重建排程器與索引。
+        """
+        if reminders is None:
+            reminders = self.read_all()
+        if self.view is not None:
+            self.view.beginResetModel()
+        self.reminders[:] = reminders
+        if self.view is not None:
+            self.view.endResetModel()
+        self.reminders_by_id = {reminder["id"]: reminder for reminder in self.reminders}
+        self.disabled_groups.clear()
+        self.disabled_groups.update(self.backend.disabled_groups())
+        self.scheduler = self._new_scheduler(self.reminders)
+        self.index.rebuild(self.reminders)
+        self._notify("loaded")
+
+    def add(self, reminder):
+        """
+        檢查並新增提醒:寫入儲存後端(產生 id)、加入列表、排程器與索引。
+        """
+        reminder.update(normalize_reminder(reminder))
+        self.backend.add(reminder)
+        if self.view is not None:
+            self.view.insert_reminder(reminder)  # 表格只插入一列
+        else:
+            self.reminders.append(reminder)
+        self.reminders_by_id[reminder["id"]] = reminder
+        self.scheduler.add(reminder)
+        self.index.add(reminder)
+        self._notify("changed")
+        return reminder
+
+    def update(self, reminder):
+        """
+        提醒內容修改後寫入儲存後端,並重新排程與更新索引。
+        """
+        reminder.update(normalize_reminder(reminder))
+        self.backend.update(reminder)
+        self.scheduler.add(reminder)  # 已在排程器中的提醒會重新計算觸發時間
+        self.index.add(reminder)
+        if self.view is not None:
+            self.view.update_rows(row for row, item in enumerate(self.reminders) if item is reminder)
+        self._notify("changed")
+
+    def remove(self, reminder):
+        self.remove_many([reminder])
+
+    def remove_many(self, reminders):
+        """
+        刪除多筆提醒(以物件身分比對,避免誤刪內容相同的提醒),全部刪除後才通知一次。
+        """
+        targets = {id(reminder) for reminder in reminders}
+        rows = [row for row, item in enumerate(self.reminders) if id(item) in targets]
+        if self.view is not None:
+            self.view.remove_rows(rows)  # 表格只移除對應的列
+        else:
+            for row in reversed(rows):
+                del self.reminders[row]
+        for reminder in reminders:
+            self.backend.delete(reminder["id"])
+            self.reminders_by_id.pop(reminder["id"], None)
+            self.scheduler.remove(reminder)
+            self.index.remove(reminder["id"])
+        self._notify("changed")
+
+    def apply_changes(self, changes):
+        """
+        套用其他行程的變更 {id: 提醒或 None(已刪除)},只更新有差異的提醒。回傳是否有變更。
+        """
+        added, updated, removed = diff_changes(self.reminders_by_id, changes)
+        if not (added or updated or removed):
+            return False
+        view = self.view
+        rows = {id(reminder): row for row, reminder in enumerate(self.reminders)} if updated or removed else {}
+        for reminder in updated:
+            self.scheduler.add(reminder)
+            self.index.add(reminder)
+        if view is not None:
+            view.update_rows(rows[id(reminder)] for reminder in updated)
+        removed_rows = [rows[id(reminder)] for reminder in removed]
+        if view is not None:
+            view.remove_rows(removed_rows)
+        else:
+            for row in sorted(removed_rows, reverse=True):
+                del self.reminders[row]
+        for reminder in removed:
+            self.scheduler.remove(reminder)
+            self.index.remove(reminder["id"])
+        for reminder in added:
+            if view is not None:
+                view.insert_reminder(reminder)
+            else:
+                self.reminders.append(reminder)
+            self.scheduler.add(reminder)
+            self.index.add(reminder)
+        self._notify("changed")
+        return True
+
+    def groups(self):
+        """
+        回傳 {群組名稱: 是否啟用}。
+        """
+        return self.backend.groups()
+
+    def set_group_enabled(self, name, enabled):
+        """
+        啟用或停用群組:只寫入一列群組狀態,提醒列表、排程堆積與表格都不需要重建。
+        """
+        self.backend.set_group_enabled(name, enabled)
+        self.scheduler.set_group_enabled(name, enabled)
+        self._notify("groups")
+
+    def apply_disabled_groups(self, groups):
+        """
+        其他行程切換群組後更新共用的停用集合。
+        """
+        self.disabled_groups.clear()
+        self.disabled_groups.update(groups)
+        self._notify("groups")
+
+    def snooze(self, reminder, minutes=SNOOZE_MINUTES):
+        """
+        在 minutes 分鐘後再觸發一次提醒,不影響原本的重複規則。
+        通知顯示期間提醒已被刪除時不做任何事。
+        """
+        if reminder.get("id") not in self.reminders_by_id:
+            return
+        if self.client is not None:
+            try:
+                self.client.snooze(reminder["id"], minutes * 60)
+            except DaemonError as error:
+                # 由通知的按鈕呼叫,例外不能傳回 Qt(例如其他前端剛刪除了這個提醒)
+                logger.warning("snooze %s failed: %s", reminder["id"], error)
+            return
+        self.scheduler.snooze(reminder, minutes * 60)
+        self._notify("changed")
+
+    def seconds_until_next(self):
+        return self.scheduler.seconds_until_next()
+
+    def upcoming(self, until):
+        return self.scheduler.upcoming(until)
+
+    def fire_due(self):
+        """
+        分派所有已到期的提醒(錯過的各一次),回傳觸發的提醒列表。
+        """
+        fired = self.scheduler.pop_due()
+        for reminder in fired:
+            self.dispatcher.dispatch(reminder)
+        return fired
+
+    def clock_jumped(self):
+        """
+        休眠喚醒、調整時間或改變時區後:先補發錯過的提醒,再以目前時間重新排程。
+        """
+        fired = self.fire_due()
+        self.scheduler.reschedule()
+        self._notify("changed")
+        return fired
+
+    def close(self):
+        self.dispatcher.clear()  # 尚未顯示的通知記錄為沒有回應
+        if self.history is not None:
+            self.history.close()
+
+
+def connect_backend():
+    """
+    優先連線到背景服務(reminder_daemon.py),沒有執行或平台不支援時才直接開啟提醒資料庫
+    (第一次執行時會匯入 reminders.json)。回傳 (client, store),其中一個是 None。
+    """
+    from reminder_client import ReminderClient
+    from reminder_store import ReminderStore
+
+    try:
+        return ReminderClient(), None
+    except OSError:
+        return None, ReminderStore()
+
+
+def open_core(store=None, client=None, **options):
+    """
+    建立 ReminderCore,觸發紀錄存放在提醒資料庫旁邊(連線到背景服務時與它共用同一個檔案)。
+    store 與 client 都未指定時以 connect_backend() 選擇儲存後端。
+    """
+    if store is None and client is None:
+        client, store = connect_backend()
+    path = history_path(store.path) if store is not None else client.history_path()
+    return ReminderCore(store, client, history=FireHistory(path), **options)
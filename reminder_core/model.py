@@ -0,0 +1,28 @@
+"""
+提醒事件的資料格式。
+
+提醒是一般的 dict,欄位見 FIELDS;存入儲存後端後會多一個整數 "id"。
+time 一律是 24 小時制的 "HH:mm:ss" 字串,所有前端都用 QT_TIME_FORMAT 轉換 QTime。
+"""
+from reminder_store import FIELDS, PRIORITIES, REMINDER_TYPES, validate_reminder
+
+QT_TIME_FORMAT = "HH:mm:ss"  # QTime.toString() 的格式,24 小時制
+SNOOZE_MINUTES = 10  # 按下「稍後提醒」後延後的分鐘數
+
+
+def new_reminder(time, action, type=REMINDER_TYPES[0], image="", repeat="", group="", priority=""):
+    """
+    建立並檢查一筆提醒,不合法時拋出 ValueError。
+    """
+    return normalize_reminder({"time": time, "action": action, "type": type, "image": image, "repeat": repeat, "group": group, "priority": priority})
+
+
+def normalize_reminder(reminder):
+    """
+    補齊缺少的欄位並檢查內容,回傳新的 dict(保留 id)。
+    """
+    normalized = {field: reminder.get(field) or "" for field in FIELDS}
+    if "id" in reminder:
+        normalized["id"] = reminder["id"]
+    validate_reminder(normalized)
+    return normalized
@@ -0,0 +1,178 @@
+import time
+
+from PyQt6.QtCore import QObject, QTimer, Qt, pyqtSignal
+
+from asset_cache import DEFAULT_PRELOAD_MINUTES
+from background_loader import BackgroundLoader, reminder_loader
+from reminder_scheduler import ClockMonitor
+from scheduler_metrics import metrics_log_settings
+
+
+class CoreDriver(QObject):
+    """
+    以 Qt 計時器驅動 ReminderCore(只需要 QtCore,不需要顯示器):
+    - 單次計時器只在最早到期的提醒時喚醒;
+    - 每次醒來(最多等待 60 秒)都比對系統時間與單調時鐘,休眠喚醒、調整時間或改變時區後補發並重新排程;
+    - 設定 REMINDER_METRICS_LOG 時以看門狗計時器量測事件迴圈是否被卡住;
+    - 通知佇列由另一個計時器在排程器之外依速率限制顯示,大量提醒同時觸發也不會延誤下一次觸發;
+    - 監看資料庫檔案,套用其他行程的變更;連線到背景服務時改為訂閱它的事件,
+      服務中斷後改為直接開啟提醒資料庫並在本機排程。
+    """
+
+    loaded = pyqtSignal()  # 提醒載入完成(包含背景載入)
+    load_failed = pyqtSignal(str)  # 背景與同步讀取都失敗,附上錯誤訊息
+    daemon_lost = pyqtSignal()  # 背景服務中斷,已改為直接開啟提醒資料庫
+
+    def __init__(self, core, parent=None, preload=None):
+        super().__init__(parent)
+        self.core = core
+        self.preload = preload  # preload(即將觸發的提醒):預先載入圖片與音效
+        self.started = False
+        self.loader = None
+        self.watcher = None
+        self.subscriber = None
+        self.clock_monitor = None
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self.check)
+        self.watchdog_timer = QTimer(self)
+        self.watchdog_timer.timeout.connect(core.metrics.watchdog.tick)
+        self.metrics_log_timer = None
+        self.dispatch_timer = QTimer(self)
+        self.dispatch_timer.setSingleShot(True)
+        self.dispatch_timer.timeout.connect(self.drain)
+        core.dispatcher.wake = self.wake_dispatch
+
+        core.listeners.append(self._on_core_event)
+        # 載入前就開始監看,載入期間的變更之後仍會套用
+        if core.client is not None:
+            self._subscribe()
+        else:
+            self._watch_store()
+
+    def _subscribe(self):
+        # 背景服務推送其他前端的新增/修改/刪除與群組切換,以及觸發事件
+        from daemon_subscriber import DaemonSubscriber
+        self.subscriber = DaemonSubscriber(self.core.client.path, self)
+        self.subscriber.event_received.connect(self._on_daemon_event)
+        self.subscriber.disconnected.connect(self._on_daemon_disconnected)
+
+    def _on_daemon_event(self, message):
+        event = message["event"]
+        if event == "fire":
+            if self.started:
+                reminder = message["reminder"]
+                self.core.dispatcher.dispatch(self.core.reminders_by_id.get(reminder.get("id"), reminder))
+        elif event in ("added", "updated"):
+            self.core.apply_changes({message["reminder"]["id"]: message["reminder"]})  # 自己的修改內容相同,會被略過
+        elif event == "deleted":
+            self.core.apply_changes({message["id"]: None})
+        elif event == "groups":
+            self.core.apply_disabled_groups(message["disabled"])
+
+    def _on_daemon_disconnected(self):
+        """
+        背景服務中斷:改為直接開啟提醒資料庫並在本機排程,提醒不會因此停止。
+        """
+        from reminder_store import ReminderStore
+        self.subscriber.deleteLater()
+        self.subscriber = None
+        self.core.use_store(ReminderStore())
+        self._watch_store()
+        self.core.load()
+        if self.started:
+            self._start_local()
+            self.arm()
+        self.daemon_lost.emit()
+
+    def _watch_store(self):
+        store = self.core.store
+        if store is None or store.path == ":memory:":
+            return
+        from reminder_watcher import ReminderWatcher
+        self.watcher = ReminderWatcher(store, self)
+        self.watcher.changed.connect(self.core.apply_changes)
+        self.watcher.reloaded.connect(self.core.load)
+        self.watcher.groups_changed.connect(self.core.apply_disabled_groups)
+
+    def load(self, in_background=False):
+        """
+        載入提醒。背景模式下在背景執行緒以另一個連線讀取,完成後發出 loaded。
+        """
+        load = reminder_loader(self.core.store, self.core.client) if in_background else None
+        if load is None:
+            self.core.load()
+            return
+        self.loader = BackgroundLoader(load, self)
+        self.loader.loaded.connect(self.core.load)
+        self.loader.failed.connect(self._on_load_failed)
+        self.loader.start()
+
+    def _on_load_failed(self, error):
+        """
+        背景讀取失敗(例如資料庫被鎖定或背景服務中斷)時改在 GUI 執行緒讀取一次,仍失敗就發出 load_failed。
+        """
+        try:
+            self.core.load()
+        except Exception as sync_error:
+            self.load_failed.emit(str(sync_error))
+
+    def _on_core_event(self, event):
+        if event == "loaded":
+            self.loaded.emit()
+        self.arm()
+
+    def start(self):
+        """
+        開始提醒。可以重複呼叫。連線到背景服務時由它排程,這裡只顯示它推送的觸發事件。
+        """
+        if not self.started:
+            self.started = True
+            if self.core.client is None:
+                self._start_local()
+        self.arm()
+
+    def _start_local(self):
+        self.clock_monitor = ClockMonitor()
+        # 設定 REMINDER_METRICS_LOG 時才啟動看門狗,並定期寫出 JSON 快照
+        log_path, log_interval = metrics_log_settings()
+        if log_path:
+            self.watchdog_timer.start(int(self.core.metrics.watchdog.interval * 1000))
+            self.metrics_log_timer = QTimer(self)
+            self.metrics_log_timer.timeout.connect(lambda: self.core.metrics.write_snapshot(log_path))
+            self.metrics_log_timer.start(int(log_interval * 1000))
+
+    def arm(self):
+        """
+        依排程器的下一個到期時間重新設定計時器,並預先載入即將觸發的提醒所需的圖片與音效。
+        """
+        if not self.started or self.core.client is not None:
+            return
+        seconds = self.core.seconds_until_next()
+        if seconds is None:
+            self.timer.stop()
+            return
+        # 限制單次等待時間,讓系統休眠後或時鐘調整後能重新校正
+        self.timer.start(int(min(seconds, 60) * 1000))
+        if self.preload is not None:
+            self.preload(self.core.upcoming(time.time() + DEFAULT_PRELOAD_MINUTES * 60))
+
+    def check(self):
+        if self.clock_monitor is not None and self.clock_monitor.check():
+            self.core.clock_jumped()  # 錯過的提醒各補發一次,之後由 "changed" 事件重新設定計時器
+            return
+        # 分派所有已到期的提醒(包含事件迴圈卡住時錯過的)
+        self.core.fire_due()
+        self.arm()
+
+    def wake_dispatch(self):
+        # 通知在下一輪事件迴圈才顯示;正在等待權杖時不需要提早喚醒
+        if not self.dispatch_timer.isActive():
+            self.dispatch_timer.start(0)
+
+    def drain(self):
+        seconds = self.core.dispatcher.drain()
+        if seconds is not None:
+            self.dispatch_timer.start(max(1, int(seconds * 1000)))
@@ -0,0 +1,278 @@
+"""
+不依賴 Qt 的背景提醒服務。
+
+持有提醒資料庫與排程器,透過 Unix socket 提供新增、列出、修改、刪除提醒
+以及訂閱觸發事件的 API,讓多個前端共用同一份排程。
+
+用法: python reminder_daemon.py [--db reminders.db] [--socket PATH]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import signal
+import socket
+
+from fire_history import FireHistory, history_path
+from reminder_client import default_socket_path, encode_message
+from reminder_scheduler import ClockMonitor, ReminderScheduler
+from reminder_store import DEFAULT_DB_PATH, FIELDS, ReminderStore, diff_changes, validate_reminder
+from scheduler_metrics import SchedulerMetrics, metrics_log_settings
+
+logger = logging.getLogger("reminder_daemon")
+
+MAX_WAIT_SECONDS = 60
+MAX_SUBSCRIBER_BUFFER = 1024 * 1024
+
+
+class ReminderDaemon:
+    def __init__(self, store, socket_path=None, history=None):
+        self.store = store
+        # 排程由背景服務持有,觸發只在這裡記錄一次;前端只記錄使用者的回應
+        self.history = history if history is not None else FireHistory(history_path(store.path))
+        self.socket_path = socket_path or default_socket_path()
+        # 先記下版本號再載入,載入期間其他行程的變更之後仍會套用
+        self.version = store.version()
+        self._data_version = store.data_version()
+        self.reminders = {reminder["id"]: reminder for reminder in store.load()}
+        self.metrics = SchedulerMetrics()
+        self.scheduler = ReminderScheduler(self.reminders.values(), metrics=self.metrics)
+        self.scheduler.disabled_groups = store.disabled_groups()
+        self.subscribers = set()
+        self._wakeup = None
+
+    async def serve(self):
+        """
+        啟動 socket 伺服器與排程迴圈,直到被取消為止。
+        """
+        self._wakeup = asyncio.Event()
+        # 收到 SIGTERM 時正常結束,讓 finally 清除 socket 檔案
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+        self._remove_stale_socket()
+        server = await asyncio.start_unix_server(self._handle_client, path=self.socket_path)
+        os.chmod(self.socket_path, 0o600)
+        logger.info("listening on %s with %d reminders", self.socket_path, len(self.reminders))
+        try:
+            async with server:
+                await asyncio.gather(server.serve_forever(), self._run_scheduler(), self._run_watchdog())
+        finally:
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+    def _remove_stale_socket(self):
+        if not os.path.exists(self.socket_path):
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.socket_path)
+        except OSError:
+            os.unlink(self.socket_path)  # 上一次執行遺留的 socket 檔案
+        else:
+            raise RuntimeError("背景服務已在執行: %s" % self.socket_path)
+        finally:
+            probe.close()
+
+    async def _run_scheduler(self):
+        # 睡到下一個提醒到期或排程變更為止(最多 MAX_WAIT_SECONDS),不做固定頻率輪詢
+        monitor = ClockMonitor()
+        while True:
+            # 其他行程直接寫入資料庫的變更在每次醒來時套用(最多晚 MAX_WAIT_SECONDS),
+            # bulk_io.py 匯入後會送出 reload 指令立即套用
+            self.reload_changes()
+            # 休眠喚醒、調整時間或改變時區後立即補發錯過的提醒(各一次)並重新排程
+            if monitor.check():
+                logger.info("clock jumped by %.1f s, rescheduling", monitor.last_jump)
+                for reminder in self.scheduler.pop_due():
+                    self.fire(reminder)
+                self.scheduler.reschedule()
+            for reminder in self.scheduler.pop_due():
+                self.fire(reminder)
+            seconds = self.scheduler.seconds_until_next()
+            timeout = MAX_WAIT_SECONDS if seconds is None else min(seconds, MAX_WAIT_SECONDS)
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _run_watchdog(self):
+        # 只在設定 REMINDER_METRICS_LOG 時執行:固定間隔喚醒,偵測事件迴圈是否被卡住,並定期寫出量測快照
+        log_path, log_interval = metrics_log_settings()
+        if not log_path:
+            return
+        loop = asyncio.get_running_loop()
+        next_log = loop.time() + log_interval
+        while True:
+            await asyncio.sleep(self.metrics.watchdog.interval)
+            self.metrics.watchdog.tick()
+            if log_path and loop.time() >= next_log:
+                self.metrics.write_snapshot(log_path)
+                next_log = loop.time() + log_interval
+
+    def reload_changes(self):
+        """
+        依 id 比對資料庫的變更並套用到排程器,同時推送事件給訂閱者。回傳是否有變更。
+        """
+        data_version = self.store.data_version()
+        if data_version == self._data_version:
+            return False  # 沒有其他連線提交變更
+        self._data_version = data_version
+        self._reload_groups()
+        result = self.store.changes_since(self.version)
+        if result is None:
+            # 變更紀錄已被清除,改為與整份資料比對
+            changes = dict.fromkeys(self.reminders)
+            changes.update((reminder["id"], reminder) for reminder in self.store.load())
+            result = self.store.version(), changes
+        self.version, changes = result
+        added, updated, removed = diff_changes(self.reminders, changes)
+        for event, reminders in (("added", added), ("updated", updated)):
+            for reminder in reminders:
+                self.scheduler.add(reminder)
+                self.broadcast({"event": event, "reminder": reminder})
+        for reminder in removed:
+            self.scheduler.remove(reminder)
+            self.broadcast({"event": "deleted", "id": reminder["id"]})
+        if added or updated or removed:
+            logger.info("reloaded %d added, %d updated, %d removed", len(added), len(updated), len(removed))
+            self._reschedule()
+            return True
+        return False
+
+    def _reload_groups(self):
+        # 群組的啟用狀態不在變更紀錄中,表很小,直接整份比對
+        disabled = self.store.disabled_groups()
+        if disabled != self.scheduler.disabled_groups:
+            self.scheduler.disabled_groups = disabled
+            self.broadcast({"event": "groups", "disabled": sorted(disabled)})
+
+    def _reschedule(self):
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def fire(self, reminder):
+        """
+        記錄觸發並推送給訂閱者。
+        """
+        self.history.record(reminder["id"], "fired")
+        self.broadcast({"event": "fire", "reminder": reminder})
+
+    def broadcast(self, event):
+        """
+        將事件推送給所有訂閱者。緩衝區塞滿的訂閱者會被斷線,避免拖慢服務。
+        """
+        data = encode_message(event)
+        for writer in list(self.subscribers):
+            if writer.transport.get_write_buffer_size() > MAX_SUBSCRIBER_BUFFER:
+                self.subscribers.discard(writer)
+                writer.close()
+                continue
+            writer.write(data)
+
+    async def _handle_client(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    response = self.handle_request(json.loads(line), writer)
+                except (ValueError, KeyError, TypeError, AttributeError) as error:
+                    response = {"ok": False, "error": str(error)}
+                writer.write(encode_message(response))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.subscribers.discard(writer)
+            writer.close()
+
+    def handle_request(self, request, writer=None):
+        """
+        處理單一指令並回傳回應物件。格式不正確時拋出 ValueError,回應 {"ok": False}。
+        """
+        if not isinstance(request, dict):
+            raise ValueError("指令必須是 JSON 物件")
+        command = request.get("command")
+        if command == "list":
+            return {"ok": True, "reminders": list(self.reminders.values())}
+        if command == "add":
+            reminder = {field: _reminder_payload(request).get(field) or "" for field in FIELDS}
+            validate_reminder(reminder)
+            self.store.add(reminder)
+            self.reminders[reminder["id"]] = reminder
+            self.scheduler.add(reminder)
+            self._reschedule()
+            self.broadcast({"event": "added", "reminder": reminder})
+            return {"ok": True, "id": reminder["id"]}
+        if command == "update":
+            changes = _reminder_payload(request)
+            reminder = self.reminders[changes["id"]]
+            updated = dict(reminder, **changes)
+            validate_reminder(updated)
+            reminder.update(updated)
+            self.store.update(reminder)
+            self.scheduler.add(reminder)
+            self._reschedule()
+            self.broadcast({"event": "updated", "reminder": reminder})
+            return {"ok": True}
+        if command == "delete":
+            reminder = self.reminders.pop(request["id"])
+            self.store.delete(reminder["id"])
+            self.scheduler.remove(reminder)
+            self._reschedule()
+            self.broadcast({"event": "deleted", "id": reminder["id"]})
+            return {"ok": True}
+        if command == "groups":
+            return {"ok": True, "groups": self.store.groups()}
+        if command == "set_group":
+            name, enabled = request["name"], bool(request["enabled"])
+            self.store.set_group_enabled(name, enabled)
+            self.scheduler.set_group_enabled(name, enabled)
+            self.broadcast({"event": "groups", "disabled": sorted(self.scheduler.disabled_groups)})
+            return {"ok": True}
+        if command == "snooze":
+            reminder = self.reminders[request["id"]]
+            due = self.scheduler.snooze(reminder, float(request["seconds"]))
+            self._reschedule()
+            return {"ok": True, "due": due}
+        if command == "subscribe":
+            if writer is not None:
+                self.subscribers.add(writer)
+            return {"ok": True}
+        if command == "reload":
+            return {"ok": True, "changed": self.reload_changes()}
+        if command == "stats":
+            return {"ok": True, "stats": self.metrics.snapshot()}
+        if command == "ping":
+            return {"ok": True, "reminders": len(self.reminders), "subscribers": len(self.subscribers), "history": self.history.path}
+        raise ValueError("未知的指令: %s" % command)
+
+
+def _reminder_payload(request):
+    reminder = request["reminder"]
+    if not isinstance(reminder, dict):
+        raise ValueError("reminder 必須是 JSON 物件")
+    return reminder
+
+
+def main():
+    parser = argparse.ArgumentParser(description="背景提醒服務")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help="提醒資料庫路徑")
+    parser.add_argument("--socket", default=None, help="Unix socket 路徑")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    daemon = ReminderDaemon(ReminderStore(args.db), args.socket)
+    try:
+        asyncio.run(daemon.serve())
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+    finally:
+        daemon.history.close()
+        daemon.store.close()
+
+
+if __name__ == "__main__":
+    main()
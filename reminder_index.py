@@ -0,0 +1,196 @@
+"""
+提醒事件的記憶體索引,以提醒 id 為鍵。
+
+- 時間索引:依當日秒數排序,支援 "08:00-12:00" 這類區間查詢(可跨午夜)。
+- 反向索引:提醒內容、類型與群組的詞彙 -> id。英數字以單字為詞並支援前綴比對,
+  中日文以單字與相鄰兩字(bigram)為詞。
+新增/刪除都是增量更新,不需要重建索引;整批建立則延後到第一次使用時才進行,
+不拖慢啟動。
+"""
+import bisect
+import re
+from collections import defaultdict
+
+from reminder_scheduler import parse_time_of_day
+
+TOKEN_PATTERN = re.compile(r"[0-9a-z]+|[぀-ヿ㐀-鿿豈-﫿]+")
+RANGE_PATTERN = re.compile(r"(\d{1,2}:\d{2}(?::\d{2})?)\s*[-–~〜至到]\s*(\d{1,2}:\d{2}(?::\d{2})?)")
+
+
+def _is_cjk(run):
+    return not run[0].isascii()
+
+
+def index_tokens(text):
+    """
+    建立索引用的詞彙:英數字單字、中日文單字與 bigram。
+    """
+    tokens = set()
+    for run in TOKEN_PATTERN.findall(text.lower()):
+        if _is_cjk(run):
+            tokens.update(run)
+            tokens.update(run[index:index + 2] for index in range(len(run) - 1))
+        else:
+            tokens.add(run)
+    return tokens
+
+
+def query_terms(text):
+    """
+    將查詢字串切成詞:英數字為單字(前綴比對),中日文為 bigram(單一字時為該字)。
+    """
+    words, cjk_terms = [], []
+    for run in TOKEN_PATTERN.findall(text.lower()):
+        if _is_cjk(run):
+            if len(run) == 1:
+                cjk_terms.append(run)
+            else:
+                cjk_terms.extend(run[index:index + 2] for index in range(len(run) - 1))
+        else:
+            words.append(run)
+    return words, cjk_terms
+
+
+def _parse_clock(text):
+    parts = text.split(":")
+    if len(parts) == 2:
+        parts.append("00")
+    return parse_time_of_day(":".join(part.zfill(2) for part in parts))
+
+
+class ReminderIndex:
+    def __init__(self, reminders=()):
+        self.rebuild(reminders)
+
+    def rebuild(self, reminders):
+        """
+        以新的提醒列表重建索引,實際建立延後到第一次查詢或更新時。
+        """
+        self._pending = {reminder["id"]: reminder for reminder in reminders}  # 尚未建立索引的提醒
+
+    def _build(self):
+        # 一次建立整個索引(比逐筆插入排序列表快)
+        reminders, self._pending = self._pending.values(), None
+        self._times = []  # 依時間排序的 (當日秒數, id)
+        self._seconds = {}  # id -> 當日秒數
+        self._texts = {}  # id -> 小寫後的可搜尋文字
+        self._postings = defaultdict(set)  # 詞彙 -> id 集合
+        self._vocabulary = []  # 排序後的英數字詞彙,用於前綴比對
+        for reminder in reminders:
+            self._add_text(reminder)
+            self._times.append((self._seconds[reminder["id"]], reminder["id"]))
+        self._times.sort()
+        self._vocabulary = sorted(token for token in self._postings if not _is_cjk(token))
+
+    def _ensure_built(self):
+        if self._pending is not None:
+            self._build()
+
+    def __len__(self):
+        self._ensure_built()
+        return len(self._seconds)
+
+    def _add_text(self, reminder):
+        reminder_id = reminder["id"]
+        text = "%s %s %s" % (reminder.get("action") or "", reminder.get("type") or "", reminder.get("group") or "")
+        self._seconds[reminder_id] = parse_time_of_day(reminder["time"])
+        self._texts[reminder_id] = text.lower()
+        new_words = []
+        for token in index_tokens(text):
+            postings = self._postings[token]
+            if not postings and not _is_cjk(token):
+                new_words.append(token)
+            postings.add(reminder_id)
+        return new_words
+
+    def add(self, reminder):
+        """
+        加入一筆提醒(必須已有 id)。若 id 已存在則先移除舊內容。
+        """
+        if self._pending is not None:
+            self._pending[reminder["id"]] = reminder  # 尚未建立時只需記下,建立時一起處理
+            return
+        if reminder["id"] in self._seconds:
+            self.remove(reminder["id"])
+        for word in self._add_text(reminder):
+            bisect.insort(self._vocabulary, word)
+        bisect.insort(self._times, (self._seconds[reminder["id"]], reminder["id"]))
+
+    def update(self, reminder):
+        self.add(reminder)
+
+    def remove(self, reminder_id):
+        """
+        依 id 移除一筆提醒。
+        """
+        if self._pending is not None:
+            self._pending.pop(reminder_id, None)
+            return
+        seconds = self._seconds.pop(reminder_id, None)
+        if seconds is None:
+            return
+        position = bisect.bisect_left(self._times, (seconds, reminder_id))
+        del self._times[position]
+        text = self._texts.pop(reminder_id)
+        for token in index_tokens(text):
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            postings.discard(reminder_id)
+            if not postings:
+                del self._postings[token]
+                if not _is_cjk(token):
+                    del self._vocabulary[bisect.bisect_left(self._vocabulary, token)]
+
+    def ids_between(self, start, end):
+        """
+        回傳時間介於 [start, end] 秒的 id 集合;start > end 時視為跨越午夜。
+        """
+        self._ensure_built()
+        if start > end:
+            return self.ids_between(start, 86399) | self.ids_between(0, end)
+        low = bisect.bisect_left(self._times, (start, float("-inf")))
+        high = bisect.bisect_right(self._times, (end, float("inf")))
+        return {reminder_id for _, reminder_id in self._times[low:high]}
+
+    def _word_ids(self, word):
+        # 前綴比對:找出所有以 word 開頭的詞彙
+        ids = set()
+        position = bisect.bisect_left(self._vocabulary, word)
+        while position < len(self._vocabulary) and self._vocabulary[position].startswith(word):
+            ids |= self._postings[self._vocabulary[position]]
+            position += 1
+        return ids
+
+    def search_text(self, text):
+        """
+        全文搜尋,回傳 id 集合;查詢沒有任何詞時回傳 None(代表不篩選)。
+        """
+        self._ensure_built()
+        words, cjk_terms = query_terms(text)
+        if not words and not cjk_terms:
+            return None
+        candidate_sets = [self._postings.get(term, set()) for term in cjk_terms]
+        candidate_sets.extend(self._word_ids(word) for word in words)
+        candidate_sets.sort(key=len)
+        candidates = set(candidate_sets[0]).intersection(*candidate_sets[1:])
+        # bigram 只保證各片段都出現,最後確認中日文片段連續出現
+        phrases = [run for run in TOKEN_PATTERN.findall(text.lower()) if _is_cjk(run) and len(run) > 2]
+        if phrases:
+            candidates = {reminder_id for reminder_id in candidates if all(phrase in self._texts[reminder_id] for phrase in phrases)}
+        return candidates
+
+    def search(self, query):
+        """
+        解析查詢字串:時間區間(例如 "08:00-12:00")加上文字,回傳符合的 id 集合。
+        沒有任何條件時回傳 None。
+        """
+        result = None
+        match = RANGE_PATTERN.search(query)
+        if match:
+            result = self.ids_between(_parse_clock(match.group(1)), _parse_clock(match.group(2)))
+            query = query[:match.start()] + " " + query[match.end():]
+        text_ids = self.search_text(query)
+        if text_ids is not None:
+            result = text_ids if result is None else result & text_ids
+        return result
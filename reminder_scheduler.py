@@ -0,0 +1,317 @@
+"""
+提醒排程器。
+
+提醒的 time 與重複規則都是當地時間;排程器先依規則算出下一次的當地時間,
+再換算成絕對時間(UTC epoch 秒數)排入堆積,因此夏令時間切換不會造成誤差:
+- 夏令時間開始時不存在的時間(例如 02:30)會順延跳過的長度(03:30)。
+- 夏令時間結束時重複出現的時間只觸發第一次。
+休眠喚醒或時鐘被調整後,錯過的提醒各觸發一次;時區改變後以 reschedule() 重新換算。
+停用群組內的提醒照常排程但不會回傳;稍後提醒(snooze)是只觸發一次的絕對時間。
+"""
+import heapq
+import itertools
+import logging
+import math
+import time
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+from recurrence import next_occurrence
+
+logger = logging.getLogger(__name__)
+
+@lru_cache(maxsize=86400)
+def parse_time_of_day(time_string):
+    """
+    將 "HH:mm:ss" 字串轉換為當日秒數。一天最多 86400 種時間,結果全部快取。
+    """
+    hours, minutes, seconds = (int(part) for part in time_string.split(":"))
+    return hours * 3600 + minutes * 60 + seconds
+
+
+def next_fire_after(reminder, now):
+    """
+    計算提醒在 now 之後(含 now)的下一次觸發時間,依 "repeat" 欄位的重複規則計算。
+    now 與回傳值都是不含時區的當地時間。
+    """
+    return next_occurrence(reminder.get("repeat"), parse_time_of_day(reminder["time"]), now)
+
+
+def to_local(timestamp, tz=None):
+    """
+    將 epoch 秒數轉換為不含時區資訊的當地時間。tz 為 None 時使用系統時區。
+    """
+    return datetime.fromtimestamp(timestamp, tz).replace(tzinfo=None)
+
+
+def to_timestamp(local, tz=None):
+    """
+    將當地時間轉換為 epoch 秒數(fold=0):
+    不存在的時間順延跳過的長度,重複的時間取第一次。
+    """
+    if tz is None:
+        return local.replace(fold=0).timestamp()
+    return local.replace(tzinfo=tz, fold=0).timestamp()
+
+
+def deadline_after(reminder, timestamp, tz=None):
+    """
+    計算提醒在 timestamp(epoch 秒數)之後(含)下一次觸發的絕對時間。
+    換算後早於 timestamp 的當地時間(夏令時間結束後重複的那一小時)會被略過。
+    """
+    rule = reminder.get("repeat")
+    seconds = parse_time_of_day(reminder["time"])
+    local = next_occurrence(rule, seconds, to_local(math.ceil(timestamp), tz))
+    while True:
+        deadline = to_timestamp(local, tz)
+        if deadline >= timestamp:
+            return deadline
+        local = next_occurrence(rule, seconds, local + timedelta(seconds=1))
+
+
+class ClockMonitor:
+    """
+    比較系統時間與單調時鐘的差距,偵測休眠喚醒與時鐘被調整;同時偵測系統時區改變。
+    單調時鐘在休眠期間不會前進,所以喚醒後兩者的差距會突然改變。
+    差距會一直保留到下一次檢查,所以只需要在排程器醒來時(最多每 60 秒)檢查,不需要固定頻率輪詢。
+    """
+
+    def __init__(self, threshold=2.0, wall=time.time, monotonic=time.monotonic):
+        self.threshold = threshold
+        self.wall = wall
+        self.monotonic = monotonic
+        self.jumps = 0
+        self.last_jump = 0.0  # 最近一次跳動的秒數,休眠或調快為正、調慢為負
+        self._offset = wall() - monotonic()
+        self._zone = self._zone_key()
+
+    @staticmethod
+    def _zone_key():
+        if hasattr(time, "tzset"):  # Windows 沒有 tzset
+            time.tzset()  # 重新讀取 TZ 環境變數與 /etc/localtime
+        return time.tzname, time.timezone, time.altzone
+
+    def check(self):
+        """
+        回傳自上次檢查後是否發生休眠喚醒、時鐘調整或時區改變。
+        """
+        offset = self.wall() - self.monotonic()
+        jump = offset - self._offset
+        self._offset = offset
+        zone = self._zone_key()
+        zone_changed = zone != self._zone
+        self._zone = zone
+        if abs(jump) <= self.threshold and not zone_changed:
+            return False
+        self.jumps += 1
+        self.last_jump = jump
+        return True
+
+
+class ReminderScheduler:
+    """
+    以最小堆積(min-heap)依下一次觸發的絕對時間排序提醒事件。
+    只需要在最早到期的時間點喚醒一次,新增/刪除皆為 O(log n)。
+    停用群組記錄在 disabled_groups 集合中,觸發時每個提醒只做一次集合查詢,
+    切換群組不需要重建堆積。
+    """
+
+    def __init__(self, reminders=(), now=time.time, tz=None, metrics=None):
+        self.now = now  # 回傳 epoch 秒數的時鐘,可注入模擬時鐘方便測試與基準測試
+        self.tz = tz  # 提醒時間所在的時區(zoneinfo),None 代表系統時區
+        self.metrics = metrics  # 選用的 SchedulerMetrics,記錄觸發延遲
+        self.disabled_groups = set()  # 停用的群組名稱
+        self._heap = []  # (觸發的 epoch 秒數, 序號, 提醒, 是否為稍後提醒)
+        self._entries = {}  # id(提醒) -> 堆積中的項目
+        self._snoozed = {}  # id(提醒) -> 稍後提醒的單次項目
+        self._counter = itertools.count()
+        self.skipped = 0  # 無法計算觸發時間而略過的提醒數
+        current = self.now()
+        for reminder in reminders:
+            due = self._deadline(reminder, current)
+            if due is not None:
+                self._heap.append(self._new_entry(reminder, due))
+        heapq.heapify(self._heap)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _deadline(self, reminder, timestamp):
+        """
+        計算下一次觸發時間;規則或時間無法計算時記錄警告並回傳 None,
+        避免一筆壞資料讓整個排程器(以及 GUI 與背景服務)無法啟動。
+        """
+        try:
+            return deadline_after(reminder, timestamp, self.tz)
+        except ValueError as error:  # 包含 RecurrenceError
+            self.skipped += 1
+            logger.warning("略過無法排程的提醒 %r: %s", reminder.get("id", reminder.get("action")), error)
+            return None
+
+    def _new_entry(self, reminder, due):
+        entry = [due, next(self._counter), reminder, False]
+        self._entries[id(reminder)] = entry
+        return entry
+
+    def is_enabled(self, reminder):
+        return not self.disabled_groups or reminder.get("group") not in self.disabled_groups
+
+    def set_group_enabled(self, group, enabled):
+        """
+        啟用或停用群組。只更新集合,堆積不變;停用期間到期的提醒照常重新排程但不回傳。
+        """
+        if enabled:
+            self.disabled_groups.discard(group)
+        else:
+            self.disabled_groups.add(group)
+
+    def snooze(self, reminder, seconds):
+        """
+        在 seconds 秒後額外觸發一次提醒,不影響原本的重複規則。
+        同一個提醒重複稍後提醒時以最後一次為準。
+        """
+        self.cancel_snooze(reminder)
+        entry = [self.now() + seconds, next(self._counter), reminder, True]
+        self._snoozed[id(reminder)] = entry
+        heapq.heappush(self._heap, entry)
+        return entry[0]
+
+    def cancel_snooze(self, reminder):
+        entry = self._snoozed.pop(id(reminder), None)
+        if entry is not None:
+            entry[2] = None
+
+    def add(self, reminder):
+        """
+        新增提醒事件並排入堆積。
+        """
+        self.remove(reminder)
+        due = self._deadline(reminder, self.now())
+        if due is None:
+            return None
+        entry = self._new_entry(reminder, due)
+        heapq.heappush(self._heap, entry)
+        return entry[0]
+
+    def remove(self, reminder):
+        """
+        移除提醒事件。採用延遲刪除:只將項目標記為無效,彈出時再丟棄。
+        """
+        entry = self._entries.pop(id(reminder), None)
+        if entry is not None:
+            entry[2] = None
+        self.cancel_snooze(reminder)
+        # 無效項目過多時重建堆積,避免堆積無限增長
+        if len(self._heap) > 2 * (len(self._entries) + len(self._snoozed)) + 64:
+            self._heap = [item for item in self._heap if item[2] is not None]
+            heapq.heapify(self._heap)
+
+    def _discard_removed(self):
+        while self._heap and self._heap[0][2] is None:
+            heapq.heappop(self._heap)
+
+    def next_due(self):
+        """
+        回傳最早的觸發時間(epoch 秒數),沒有提醒時回傳 None。
+        """
+        self._discard_removed()
+        return self._heap[0][0] if self._heap else None
+
+    def seconds_until_next(self):
+        """
+        回傳距離下一次觸發的秒數(不小於 0),沒有提醒時回傳 None。
+        """
+        due = self.next_due()
+        if due is None:
+            return None
+        return max(0.0, due - self.now())
+
+    def _entries_until(self, until):
+        # 沿著堆積往下走並剪掉根節點已超過 until 的子樹,成本只與結果數量有關
+        heap = self._heap
+        stack = [0] if heap else []
+        while stack:
+            index = stack.pop()
+            entry = heap[index]
+            if entry[0] > until:
+                continue
+            if entry[2] is not None and self.is_enabled(entry[2]):
+                yield entry
+            stack.extend(child for child in (2 * index + 1, 2 * index + 2) if child < len(heap))
+
+    def upcoming(self, until):
+        """
+        列出觸發時間不晚於 until(epoch 秒數)的提醒,略過停用的群組。
+        同時有稍後提醒的提醒可能出現兩次。
+        """
+        for entry in self._entries_until(until):
+            yield entry[2]
+
+    def fires_between(self, start, end):
+        """
+        回傳 [start, end](epoch 秒數)區間內的所有觸發 (時間, 提醒),依時間排序。
+        start 不得早於排程器目前的時間;只會展開下一次觸發落在區間內的提醒。
+        """
+        fires = []
+        for due, _, reminder, snoozed in self._entries_until(end):
+            if snoozed:
+                if due >= start:
+                    fires.append((due, reminder))
+                continue
+            due = self._deadline(reminder, start)
+            while due is not None and due <= end:
+                fires.append((due, reminder))
+                due = self._deadline(reminder, math.floor(due) + 1)
+        fires.sort(key=lambda item: item[0])
+        return fires
+
+    def pop_due(self):
+        """
+        取出所有已到期(含事件迴圈卡住或休眠期間錯過)的提醒,
+        並將它們重新排到 now 之後的下一次觸發時間;到期的稍後提醒則直接移除。
+        每個提醒即使錯過多次也只回傳一次,停用群組內的提醒不會回傳。
+        """
+        current = self.now()
+        fired = []
+        seen = set()
+        self._discard_removed()
+        while self._heap and self._heap[0][0] <= current:
+            entry = self._heap[0]
+            reminder = entry[2]
+            if entry[3]:
+                heapq.heappop(self._heap)
+                del self._snoozed[id(reminder)]
+            else:
+                # 直接更新堆頂項目再下沉,省去一次 pop + push
+                due = entry[0]
+                next_due = self._deadline(reminder, math.floor(current) + 1)
+                if next_due is None:
+                    heapq.heappop(self._heap)
+                    del self._entries[id(reminder)]
+                else:
+                    entry[0] = next_due
+                    entry[1] = next(self._counter)
+                    heapq.heapreplace(self._heap, entry)
+                if self.metrics is not None and self.is_enabled(reminder):
+                    self.metrics.record_fire(due, current)
+            if id(reminder) not in seen and self.is_enabled(reminder):
+                seen.add(id(reminder))
+                fired.append(reminder)
+            self._discard_removed()
+        return fired
+
+    def reschedule(self):
+        """
+        時鐘被調整或時區改變後,以目前時間重新計算所有提醒的觸發時間。
+        稍後提醒是絕對時間,維持不變。
+        應先以 pop_due() 處理已到期的提醒,否則它們會被跳過。
+        """
+        current = self.now()
+        self._heap = [entry for entry in self._heap if entry[2] is not None]
+        for entry in self._heap:
+            if not entry[3]:
+                entry[0] = self._deadline(entry[2], current)
+                if entry[0] is None:
+                    del self._entries[id(entry[2])]
+        self._heap = [entry for entry in self._heap if entry[0] is not None]
+        heapq.heapify(self._heap)
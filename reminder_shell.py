@@ -0,0 +1,57 @@
+"""
+main.py 與 main2.py 共用的提醒元件:reminder_core、圖片快取、音效播放、提醒通知與 Qt 計時器驅動。
+兩個主視窗只負責自己的畫面與按鈕。
+"""
+import startup_timing
+from PyQt6.QtWidgets import QApplication, QMessageBox
+
+from asset_cache import AssetCache
+from media_playback import PlaybackService
+from notifications import NotificationManager
+from reminder_core import open_core
+from reminder_core.qt_driver import CoreDriver
+
+
+def setup_reminders(window, start_button, store=None, client=None, load_in_background=False):
+    """
+    為主視窗建立 core、assets、playback、notifier 與 driver,並開始載入提醒。
+    store 與 client 都未指定時優先連線到背景服務,沒有執行時才直接開啟提醒資料庫。
+    背景載入期間停用 start_button,載入完成或失敗後再啟用。
+    """
+    window.core = open_core(store, client)
+    if QApplication.instance() is not None:
+        QApplication.instance().aboutToQuit.connect(window.core.close)  # 寫入剩下的觸發紀錄
+
+    # 圖片快取、音效播放服務(在獨立執行緒中解碼與播放)與非強制回應的提醒通知
+    window.assets = AssetCache()
+    window.playback = PlaybackService(parent=window)
+    window.notifier = NotificationManager(parent=window)
+    window.core.dispatcher.attach(notify=window.notifier.notify, play=window.playback.play, movie=window.assets.movie,
+                                  available=window.notifier.available)
+
+    def preload(reminders):
+        # 預先解碼彈窗的圖片,並在播放執行緒預先載入彈幕的音效
+        window.assets.preload(reminders)
+        window.playback.preload([reminder["image"] for reminder in reminders if reminder.get("type") == "彈幕" and reminder.get("image")])
+
+    # 以 Qt 計時器驅動排程,並監看資料庫或訂閱背景服務以套用其他行程的變更
+    window.driver = CoreDriver(window.core, window, preload=preload)
+    window.notifier.slot_freed.connect(window.driver.wake_dispatch)  # 通知視窗關閉後顯示佇列中的下一則
+
+    def on_loaded():
+        start_button.setEnabled(True)
+        startup_timing.mark("reminders loaded")
+
+    def on_load_failed(message):
+        # 讀取失敗時仍讓使用者可以操作,之後可以在設定頁面新增提醒
+        start_button.setEnabled(True)
+        QMessageBox.warning(window, "讀取失敗", "無法讀取提醒事件:%s" % message)
+
+    window.driver.loaded.connect(on_loaded)
+    window.driver.load_failed.connect(on_load_failed)
+    # 背景服務中斷後已改為直接開啟提醒資料庫,提醒不會停止
+    window.driver.daemon_lost.connect(lambda: window.notifier.notify("背景服務已中斷,改為直接開啟提醒資料庫", title="背景服務"))
+
+    if load_in_background:
+        start_button.setEnabled(False)  # 提醒在背景執行緒讀取,先顯示視窗
+    window.driver.load(load_in_background)
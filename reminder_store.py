@@ -0,0 +1,300 @@
+import json
+import os
+import re
+import sqlite3
+import tempfile
+
+from compact_reminders import CompactReminders
+from recurrence import validate_rule
+
+DEFAULT_DB_PATH = "reminders.db"
+LEGACY_JSON_PATH = "reminders.json"
+FIELDS = ("time", "action", "type", "image", "repeat", "group", "priority")
+# group 是 SQL 保留字,欄位名稱一律加上引號
+COLUMNS = tuple('"%s"' % field for field in FIELDS)
+SELECT_SQL = "SELECT %s FROM reminders" % ", ".join(("id",) + COLUMNS)
+INSERT_SQL = "INSERT INTO reminders (%s) VALUES (%s)" % (", ".join(COLUMNS), ", ".join("?" * len(FIELDS)))
+UPDATE_SQL = "UPDATE reminders SET %s WHERE id = ?" % ", ".join("%s = ?" % column for column in COLUMNS)
+# 只在資料庫中沒有完全相同的提醒時才新增
+INSERT_UNIQUE_SQL = "INSERT INTO reminders (%s) SELECT %s WHERE NOT EXISTS (SELECT 1 FROM reminders WHERE %s)" % (
+    ", ".join(COLUMNS),
+    ", ".join("?%d" % (index + 1) for index in range(len(FIELDS))),
+    " AND ".join("%s = ?%d" % (column, index + 1) for index, column in enumerate(COLUMNS)),
+)
+# 每次新增/修改/刪除都由觸發程序記錄到 changes 表,版本號即為 changes.version
+CHANGE_TRIGGERS = (
+    "CREATE TRIGGER IF NOT EXISTS reminders_inserted AFTER INSERT ON reminders"
+    " BEGIN INSERT INTO changes (reminder_id) VALUES (new.id); END",
+    "CREATE TRIGGER IF NOT EXISTS reminders_updated AFTER UPDATE ON reminders"
+    " BEGIN INSERT INTO changes (reminder_id) VALUES (new.id); END",
+    "CREATE TRIGGER IF NOT EXISTS reminders_deleted AFTER DELETE ON reminders"
+    " BEGIN INSERT INTO changes (reminder_id) VALUES (old.id); END",
+    # 提醒用到新的群組時自動加入 groups 表(預設啟用)
+    'CREATE TRIGGER IF NOT EXISTS reminders_grouped AFTER INSERT ON reminders WHEN new."group" != \'\''
+    ' BEGIN INSERT OR IGNORE INTO groups (name) VALUES (new."group"); END',
+    'CREATE TRIGGER IF NOT EXISTS reminders_regrouped AFTER UPDATE OF "group" ON reminders WHEN new."group" != \'\''
+    ' BEGIN INSERT OR IGNORE INTO groups (name) VALUES (new."group"); END',
+)
+CHANGE_LOG_SIZE = 100000  # 保留的變更紀錄筆數,落後更多的讀取端需要整份重新載入
+REMINDER_TYPES = ("彈窗", "彈幕")
+PRIORITIES = ("高", "一般", "低")  # 由高到低;空字串視為「一般」
+TIME_PATTERN = re.compile(r"([01]\d|2[0-3]):[0-5]\d:[0-5]\d")
+
+
+def validate_reminder(reminder):
+    """
+    檢查提醒事件的欄位,不合法時拋出 ValueError。
+    """
+    if not isinstance(reminder, dict):
+        raise ValueError("reminder 必須是物件")
+    time_string = reminder.get("time")
+    if not isinstance(time_string, str) or not TIME_PATTERN.fullmatch(time_string):
+        raise ValueError("time 必須是 HH:mm:ss 格式: %r" % (time_string,))
+    if reminder.get("type") not in REMINDER_TYPES:
+        raise ValueError("type 必須是 %s 之一: %r" % ("、".join(REMINDER_TYPES), reminder.get("type")))
+    for field in ("action", "image", "repeat", "group"):
+        if not isinstance(reminder.get(field) or "", str):
+            raise ValueError("%s 必須是字串" % field)
+    if (reminder.get("priority") or "") not in ("",) + PRIORITIES:
+        raise ValueError("priority 必須是 %s 之一: %r" % ("、".join(PRIORITIES), reminder.get("priority")))
+    validate_rule(reminder.get("repeat"))
+
+
+def write_json_atomic(path, data):
+    """
+    先寫入同目錄下的暫存檔再以 rename 取代,避免寫到一半時檔案損毀。
+    """
+    write_atomic(path, lambda file: json.dump(data, file, ensure_ascii=False, indent=4))
+
+
+def write_atomic(path, write):
+    """
+    以 write(檔案) 寫入同目錄下的暫存檔,完成後才以 rename 取代 path。
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=".reminders-", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            write(file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def diff_changes(reminders_by_id, changes):
+    """
+    將 changes_since() 取得的變更套用到以 id 為鍵的提醒 dict,內容相同的提醒會略過。
+    回傳 (新增, 修改, 刪除) 三個列表;修改會直接更新原本的 dict,保留物件身分。
+    """
+    added, updated, removed = [], [], []
+    for reminder_id, reminder in changes.items():
+        current = reminders_by_id.get(reminder_id)
+        if reminder is None:
+            if current is not None:
+                removed.append(reminders_by_id.pop(reminder_id))
+        elif current is None:
+            reminders_by_id[reminder_id] = reminder
+            added.append(reminder)
+        elif current != reminder:
+            current.update(reminder)
+            updated.append(current)
+    return added, updated, removed
+
+
+class ReminderStore:
+    """
+    以 SQLite(WAL 模式)儲存提醒事件。
+    每次新增/刪除/修改只寫入單筆資料,不再整份重寫 JSON 檔案。
+    多個行程可以同時開啟同一個資料庫,寫入由 SQLite 的檔案鎖序列化;
+    每次寫入都會產生新的版本號,其他行程可用 changes_since() 只讀取變更的提醒。
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH, legacy_json=LEGACY_JSON_PATH):
+        self.path = path
+        is_new = path == ":memory:" or not os.path.exists(path)
+        self.conn = sqlite3.connect(path, timeout=10)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS reminders ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " time TEXT NOT NULL,"
+            " action TEXT NOT NULL DEFAULT '',"
+            " type TEXT NOT NULL,"
+            " image TEXT NOT NULL DEFAULT '',"
+            " repeat TEXT NOT NULL DEFAULT '')"
+        )
+        self._migrate()
+        # 批次匯入時用來排除重複提醒
+        self.conn.execute("CREATE INDEX IF NOT EXISTS reminders_time_action ON reminders (time, action)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS changes (version INTEGER PRIMARY KEY AUTOINCREMENT, reminder_id INTEGER NOT NULL)")
+        # 群組的啟用狀態獨立存放,切換整個群組只需要更新一列
+        self.conn.execute("CREATE TABLE IF NOT EXISTS groups (name TEXT PRIMARY KEY, enabled INTEGER NOT NULL DEFAULT 1)")
+        for trigger in CHANGE_TRIGGERS:
+            self.conn.execute(trigger)
+        self.conn.commit()
+        self.prune_changes()
+        # 第一次建立資料庫時匯入舊的 reminders.json
+        if is_new and legacy_json and os.path.exists(legacy_json):
+            self.import_json(legacy_json)
+
+    def _migrate(self):
+        """
+        為舊版資料庫補上新增的欄位。
+        """
+        existing = {row[1] for row in self.conn.execute("PRAGMA table_info(reminders)")}
+        for field in FIELDS:
+            if field not in existing:
+                self.conn.execute("ALTER TABLE reminders ADD COLUMN \"%s\" TEXT NOT NULL DEFAULT ''" % field)
+
+    def close(self):
+        self.conn.close()
+
+    def data_version(self):
+        """
+        其他連線提交變更後這個值就會改變(自己的寫入不會),可以很便宜地判斷是否需要重新讀取。
+        """
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def version(self):
+        """
+        目前最新的變更版本號。
+        """
+        return self.conn.execute("SELECT COALESCE(MAX(version), 0) FROM changes").fetchone()[0]
+
+    def changes_since(self, version):
+        """
+        回傳 (最新版本號, {id: 提醒或 None(已刪除)}),只包含 version 之後變更過的提醒。
+        變更紀錄已被清除到 version 之後時回傳 None,呼叫端需要整份重新載入。
+        """
+        oldest, latest = self.conn.execute("SELECT MIN(version), MAX(version) FROM changes").fetchone()
+        if latest is None or latest <= version:
+            return version, {}
+        if oldest > version + 1:
+            return None
+        ids = [row[0] for row in self.conn.execute(
+            "SELECT DISTINCT reminder_id FROM changes WHERE version > ? AND version <= ?", (version, latest)
+        )]
+        changes = dict.fromkeys(ids)
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            for row in self.conn.execute(SELECT_SQL + " WHERE id IN (%s)" % ", ".join("?" * len(chunk)), chunk):
+                changes[row[0]] = self._row_to_reminder(row)
+        return latest, changes
+
+    def groups(self):
+        """
+        回傳 {群組名稱: 是否啟用}。
+        """
+        return {name: bool(enabled) for name, enabled in self.conn.execute("SELECT name, enabled FROM groups ORDER BY name")}
+
+    def disabled_groups(self):
+        return {row[0] for row in self.conn.execute("SELECT name FROM groups WHERE enabled = 0")}
+
+    def set_group_enabled(self, name, enabled):
+        """
+        啟用或停用整個群組。只寫入 groups 表的一列,不會改動群組內的提醒。
+        """
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO groups (name, enabled) VALUES (?, ?) ON CONFLICT (name) DO UPDATE SET enabled = excluded.enabled",
+                (name, int(bool(enabled))),
+            )
+
+    def prune_changes(self, keep=CHANGE_LOG_SIZE):
+        """
+        只保留最近 keep 筆變更紀錄。
+        """
+        with self.conn:
+            self.conn.execute("DELETE FROM changes WHERE version <= (SELECT MAX(version) FROM changes) - ?", (keep,))
+
+    def _row_to_reminder(self, row):
+        reminder = dict(zip(FIELDS, row[1:]))
+        reminder["id"] = row[0]
+        return reminder
+
+    def __iter__(self):
+        """
+        依 id 順序逐筆讀取提醒事件,不會一次載入全部資料。
+        """
+        cursor = self.conn.execute(SELECT_SQL + " ORDER BY id")
+        for row in cursor:
+            yield self._row_to_reminder(row)
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM reminders").fetchone()[0]
+
+    def load(self):
+        """
+        讀取全部提醒事件,回傳 dict 列表。
+        """
+        return list(self)
+
+    def get(self, reminder_id):
+        row = self.conn.execute(SELECT_SQL + " WHERE id = ?", (reminder_id,)).fetchone()
+        return self._row_to_reminder(row) if row else None
+
+    def add(self, reminder):
+        """
+        新增提醒事件,並將產生的 id 寫回 reminder["id"]。
+        """
+        self.add_many([reminder])
+        return reminder["id"]
+
+    def add_many(self, reminders):
+        """
+        在同一個交易中新增多筆提醒事件。
+        """
+        with self.conn:
+            for reminder in reminders:
+                cursor = self.conn.execute(INSERT_SQL, tuple(reminder.get(field) or "" for field in FIELDS))
+                reminder["id"] = cursor.lastrowid
+
+    def add_unique_batches(self, batches):
+        """
+        在同一個交易中匯入多批提醒,略過資料庫中已存在的相同提醒。
+        回傳實際新增的筆數;任何錯誤都會讓整個交易回復。
+        """
+        # total_changes 會包含觸發程序寫入 changes/groups 的列,所以改用 rowcount(只計算直接新增的列)
+        imported = 0
+        with self.conn:
+            for batch in batches:
+                cursor = self.conn.executemany(
+                    INSERT_UNIQUE_SQL, (tuple(reminder.get(field) or "" for field in FIELDS) for reminder in batch)
+                )
+                imported += cursor.rowcount
+        return imported
+
+    def update(self, reminder):
+        """
+        依 reminder["id"] 更新提醒事件內容。
+        """
+        with self.conn:
+            self.conn.execute(UPDATE_SQL, tuple(reminder.get(field) or "" for field in FIELDS) + (reminder["id"],))
+
+    def delete(self, reminder_id):
+        """
+        刪除指定 id 的提醒事件。
+        """
+        with self.conn:
+            self.conn.execute("DELETE FROM reminders WHERE id = ?", (reminder_id,))
+
+    def import_json(self, path):
+        """
+        從舊格式的 JSON 檔案匯入提醒事件。
+        """
+        with open(path, "r", encoding="utf-8") as file:
+            reminders = json.load(file)
+        self.add_many(reminders)
+        return len(reminders)
+
+    def export_json(self, path):
+        """
+        匯出成舊格式的 JSON 檔案(不含 id),以暫存檔 + rename 原子寫入。
+        先串流讀入 CompactReminders 欄位陣列(讀取交易很短),寫檔時也不需要為每筆提醒保留一個 dict。
+        空白的 repeat/group/priority 欄位省略,與舊版 reminders.json 相同。
+        """
+        write_atomic(path, CompactReminders(self).write_json)
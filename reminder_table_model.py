@@ -0,0 +1,106 @@
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, QSortFilterProxyModel, Qt
+from PyQt6.QtGui import QColor
+
+COLUMNS = (("time", "時間"), ("action", "提醒內容"), ("type", "提醒類型"), ("image", "提醒圖片"), ("repeat", "重複"), ("group", "群組"), ("priority", "優先順序"))
+DISABLED_COLOR = QColor("gray")
+
+
+class ReminderTableModel(QAbstractTableModel):
+    """
+    以提醒列表為資料來源的表格模型。
+    QTableView 只會向模型要求可見的儲存格,不必為每筆提醒建立 QTableWidgetItem。
+    """
+
+    def __init__(self, reminders, parent=None):
+        super().__init__(parent)
+        self.reminders = reminders
+        self.disabled_groups = set()  # 停用的群組以灰色顯示,與排程器共用同一個集合
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.reminders)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        reminder = self.reminders[index.row()]
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return DISABLED_COLOR if reminder.get("group") in self.disabled_groups else None
+        if role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            return None
+        return reminder.get(COLUMNS[index.column()][0], "")
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return COLUMNS[section][1]
+        return section + 1
+
+    def reminder_at(self, row):
+        return self.reminders[row]
+
+    def insert_reminder(self, reminder, add=None):
+        """
+        在表格尾端插入一筆提醒,只發出單列的插入訊號。
+        add 可指定實際加入資料的函式(例如同時寫入儲存後端與排程器)。
+        """
+        row = len(self.reminders)
+        self.beginInsertRows(QModelIndex(), row, row)
+        if add is None:
+            self.reminders.append(reminder)
+        else:
+            add(reminder)
+        self.endInsertRows()
+
+    def update_rows(self, rows):
+        """
+        通知視圖這些來源列的內容已經改變,只重繪對應的列。
+        """
+        for row in rows:
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(COLUMNS) - 1))
+
+    def remove_rows(self, rows, remove=None):
+        """
+        刪除指定的來源列,逐列發出刪除訊號而不重設整個模型。
+        remove 可指定實際移除資料的函式,未指定時直接從列表刪除。
+        """
+        for row in sorted(set(rows), reverse=True):
+            self.beginRemoveRows(QModelIndex(), row, row)
+            if remove is None:
+                del self.reminders[row]
+            else:
+                remove(self.reminders[row])
+            self.endRemoveRows()
+
+
+class ReminderFilterProxyModel(QSortFilterProxyModel):
+    """
+    提供排序與篩選的代理模型。
+    篩選結果由 ReminderIndex 查詢得到的 id 集合決定,每列只需要一次集合查詢,
+    不必對每個儲存格做字串比對。
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.matches = None  # 符合篩選條件的提醒 id,None 代表不篩選
+
+    def set_matches(self, ids):
+        """
+        設定符合篩選條件的提醒 id 集合(None 代表顯示全部)並重新篩選。
+        """
+        self.matches = ids
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self.matches is None:
+            return True
+        return self.sourceModel().reminders[source_row].get("id") in self.matches
+
+    def source_rows(self, proxy_indexes):
+        """
+        將視圖中選取的列轉換為來源模型的列號。
+        """
+        return [self.mapToSource(index).row() for index in proxy_indexes]
@@ -0,0 +1,63 @@
+from PyQt6.QtCore import QFileSystemWatcher, QObject, QTimer, pyqtSignal
+
+
+class ReminderWatcher(QObject):
+    """
+    監看提醒資料庫檔案,其他行程(另一個視窗、bulk_io.py 匯入等)寫入後,
+    只讀取變更過的提醒並以 changed 訊號送出 {id: 提醒或 None(已刪除)}。
+    變更紀錄已被清除時改送出 reloaded(完整的提醒列表);
+    群組的啟用狀態改變時送出 groups_changed(停用的群組集合)。
+    """
+
+    changed = pyqtSignal(dict)
+    reloaded = pyqtSignal(list)
+    groups_changed = pyqtSignal(object)
+
+    def __init__(self, store, parent=None, delay_ms=100):
+        super().__init__(parent)
+        self.store = store
+        self.version = store.version()
+        self._data_version = store.data_version()
+        self.disabled_groups = store.disabled_groups()
+        # WAL 模式下寫入的是 -wal 檔案,檢查點時才會寫回主檔案,兩個都要監看
+        self.paths = [store.path, store.path + "-wal"]
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self._on_file_changed)
+        self._watch_paths()
+        # 一次寫入會觸發多次檔案變更通知,合併後再檢查
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay_ms)
+        self.timer.timeout.connect(self.check)
+
+    def _watch_paths(self):
+        watched = set(self.watcher.files())
+        for path in self.paths:
+            if path not in watched:
+                self.watcher.addPath(path)  # 檔案不存在時 Qt 只會發出警告
+
+    def _on_file_changed(self, path):
+        # 檔案被取代或刪除後監看會失效,重新加入
+        self._watch_paths()
+        self.timer.start()
+
+    def check(self):
+        """
+        若有其他連線提交變更,讀取並送出這些變更。
+        """
+        data_version = self.store.data_version()
+        if data_version == self._data_version:
+            return  # 只有自己的寫入
+        self._data_version = data_version
+        disabled_groups = self.store.disabled_groups()
+        if disabled_groups != self.disabled_groups:
+            self.disabled_groups = disabled_groups
+            self.groups_changed.emit(disabled_groups)
+        result = self.store.changes_since(self.version)
+        if result is None:
+            self.version = self.store.version()
+            self.reloaded.emit(self.store.load())
+            return
+        self.version, changes = result
+        if changes:
+            self.changed.emit(changes)
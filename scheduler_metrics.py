@@ -0,0 +1,142 @@
+"""
+排程器的量測資料:觸發延遲直方圖、延遲/錯過次數,以及事件迴圈卡住的偵測。
+
+設定環境變數 REMINDER_METRICS_LOG=檔案路徑 後,每 REMINDER_METRICS_INTERVAL 秒
+(預設 60)會附加一行 JSON 快照到該檔案。看門狗也只在設定記錄檔時執行,
+平常不會為了量測而定期喚醒(背景服務與 GUI 都只在提醒到期時喚醒)。
+"""
+import json
+import os
+import time
+
+LATENCY_BUCKETS_MS = (1, 5, 10, 50, 100, 250, 500, 1000, 5000, 60000)
+STALL_BUCKETS_MS = (50, 100, 250, 500, 1000, 5000, 30000)
+
+
+def metrics_log_settings():
+    """
+    回傳 (記錄檔路徑, 間隔秒數),未設定時路徑為 None。
+    """
+    return os.environ.get("REMINDER_METRICS_LOG") or None, float(os.environ.get("REMINDER_METRICS_INTERVAL", 60))
+
+
+class Histogram:
+    """
+    固定區間的直方圖,最後一格收集超過最大區間的值。
+    """
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        index = 0
+        while index < len(self.buckets) and value > self.buckets[index]:
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, fraction):
+        """
+        回傳第 fraction 百分位所在區間的上限(近似值)。
+        """
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return self.buckets[index] if index < len(self.buckets) else self.max
+        return self.max
+
+    def snapshot(self):
+        labels = ["<=%g" % bucket for bucket in self.buckets] + [">%g" % self.buckets[-1]]
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "max": self.max,
+            "p50": self.percentile(0.5),
+            "p99": self.percentile(0.99),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class StallDetector:
+    """
+    看門狗:以固定間隔呼叫 tick(),實際間隔超出預期太多時代表事件迴圈被卡住。
+    間隔取 1 秒,只偵測使用者感覺得到的卡頓(半秒以上)。
+    """
+
+    def __init__(self, interval=1.0, threshold=0.5):
+        self.interval = interval
+        self.threshold = threshold
+        self.stalls = 0
+        self.histogram = Histogram(STALL_BUCKETS_MS)
+        self._last = None
+
+    def tick(self, now=None):
+        now = time.monotonic() if now is None else now
+        if self._last is not None:
+            delay = now - self._last - self.interval
+            if delay > self.threshold:
+                self.stalls += 1
+                self.histogram.observe(delay * 1000)
+        self._last = now
+
+    def snapshot(self):
+        return {"stalls": self.stalls, "stall_ms": self.histogram.snapshot()}
+
+
+class SchedulerMetrics:
+    """
+    記錄每次觸發的預定時間與實際時間差。
+    超過 late_threshold 秒算延遲,超過 missed_threshold 秒算錯過
+    (在舊版逐秒比對字串的做法下這些提醒會直接消失)。
+    """
+
+    def __init__(self, late_threshold=1.0, missed_threshold=60.0, watchdog_interval=1.0):
+        self.late_threshold = late_threshold
+        self.missed_threshold = missed_threshold
+        self.fire_latency = Histogram(LATENCY_BUCKETS_MS)
+        self.watchdog = StallDetector(watchdog_interval)
+        self.fired = 0
+        self.late = 0
+        self.missed = 0
+        self.started = time.time()
+
+    def record_fire(self, scheduled, actual):
+        """
+        scheduled 與 actual 都是 epoch 秒數。
+        """
+        latency = max(0.0, actual - scheduled)
+        self.fired += 1
+        self.fire_latency.observe(latency * 1000)
+        if latency > self.missed_threshold:
+            self.missed += 1
+        elif latency > self.late_threshold:
+            self.late += 1
+
+    def snapshot(self):
+        snapshot = {
+            "time": time.time(),
+            "uptime": time.time() - self.started,
+            "fired": self.fired,
+            "late": self.late,
+            "missed": self.missed,
+            "fire_latency_ms": self.fire_latency.snapshot(),
+        }
+        snapshot.update(self.watchdog.snapshot())
+        return snapshot
+
+    def write_snapshot(self, path):
+        """
+        將目前的快照以一行 JSON 附加到記錄檔。
+        """
+        with open(path, "a", encoding="utf-8") as file:
+            file.write(json.dumps(self.snapshot(), ensure_ascii=False) + "\n")
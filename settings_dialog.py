@@ -1,14 +1,22 @@
-import json
-from PyQt6.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QWidget, QPushButton, QTimeEdit, QLabel, QMessageBox, QTableWidget, QTableWidgetItem, QAbstractItemView, QComboBox, QFileDialog, QDialog, QGridLayout, QHBoxLayout, QLineEdit
+from PyQt6.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QWidget, QPushButton, QTimeEdit, QLabel, QMessageBox, QTableView, QHeaderView, QAbstractItemView, QComboBox, QFileDialog, QDialog, QGridLayout, QHBoxLayout, QLineEdit, QListWidget, QListWidgetItem
+from PyQt6.QtCore import Qt
 import add_reminder_dialog
 from add_reminder_dialog import AddReminderDialog
+from reminder_table_model import ReminderTableModel, ReminderFilterProxyModel
 
 
 class SettingsDialog(QDialog):
-    def __init__(self, parent, reminders):
+    """
+    設定頁面,直接操作 ReminderCore:表格模型引用核心的提醒列表,
+    新增/刪除/切換群組都交給核心處理,核心再透過 view 只更新對應的列。
+    """
+
+    def __init__(self, parent, core):
         super().__init__(parent)
+        self.core = core
+        self.add_dialog = None
         self.init_UI()
-        self.reminders = reminders
+        core.listeners.append(self.on_core_event)
 
     def init_UI(self):
         self.setWindowTitle("設定提醒")
@@ -19,12 +27,28 @@ class SettingsDialog(QDialog):
         main_layout = QVBoxLayout()
         self.setLayout(main_layout)
 
-        # 建立表格
-        self.table = QTableWidget()
-        self.table.setColumnCount(4)
-        self.table.setHorizontalHeaderLabels(["時間", "提醒內容", "提醒類型", "提醒圖片"])
+        # 建立搜尋框
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("搜尋提醒(可輸入時間區間,例如 08:00-12:00)")
+        main_layout.addWidget(self.filter_edit)
+
+        # 建立表格(模型/視圖,只繪製可見的儲存格)
+        self.table = QTableView()
         self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
-        main_layout.addWidget(self.table)
+        self.table.setSortingEnabled(True)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+
+        # 建立群組列表,勾選代表啟用,切換時只寫入一列群組狀態
+        group_layout = QVBoxLayout()
+        group_layout.addWidget(QLabel("群組"))
+        self.group_list = QListWidget()
+        self.group_list.setMaximumWidth(150)
+        self.group_list.itemChanged.connect(self.toggle_group)
+        group_layout.addWidget(self.group_list)
+        content_layout = QHBoxLayout()
+        content_layout.addWidget(self.table, 1)
+        content_layout.addLayout(group_layout)
+        main_layout.addLayout(content_layout)
 
         # 建立按鈕
         button_layout = QGridLayout()
@@ -44,51 +68,74 @@ class SettingsDialog(QDialog):
 
     def populate_table(self):
         """
-        將現有的提醒事件填充到表格中。
+        將核心的提醒列表綁定到表格模型,並透過代理模型提供排序與篩選。
+        """
+        self.model = ReminderTableModel(self.core.reminders, self)  # 直接使用核心的提醒列表
+        self.model.disabled_groups = self.core.disabled_groups  # 與排程器共用,切換群組時不必重建模型
+        self.core.view = self.model
+        self.proxy_model = ReminderFilterProxyModel(self)
+        self.proxy_model.setSourceModel(self.model)
+        self.table.setModel(self.proxy_model)
+        self.filter_edit.textChanged.connect(self.apply_filter)
+        self.refresh_groups()
+
+    def refresh_groups(self):
+        """
+        重新列出群組與啟用狀態。
+        """
+        self.group_list.blockSignals(True)
+        self.group_list.clear()
+        for name, enabled in self.core.groups().items():
+            item = QListWidgetItem(name)
+            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            item.setCheckState(Qt.CheckState.Checked if enabled else Qt.CheckState.Unchecked)
+            self.group_list.addItem(item)
+        self.group_list.blockSignals(False)
+
+    def toggle_group(self, item):
+        """
+        啟用或停用群組,表格只重繪可見的列。
         """
-        self.table.setRowCount(0)  # 清空表格
-        reminders = self.parent().reminders  # 獲取父類別的提醒事件
-        for reminder in reminders:
-            row_position = self.table.rowCount()
-            self.table.insertRow(row_position)
-            self.table.setItem(row_position, 0, QTableWidgetItem(reminder["time"]))
-            self.table.setItem(row_position, 1, QTableWidgetItem(reminder["action"]))
-            self.table.setItem(row_position, 2, QTableWidgetItem(reminder["type"]))
-            self.table.setItem(row_position, 3, QTableWidgetItem(reminder.get("image", "")))
+        self.core.set_group_enabled(item.text(), item.checkState() == Qt.CheckState.Checked)
+
+    def on_core_event(self, event):
+        """
+        核心的提醒或群組改變後更新畫面。
+        """
+        if event == "groups":
+            self.refresh_groups()
+            self.table.viewport().update()  # 只重繪可見的列
+        elif event == "loaded" or self.filter_edit.text():
+            self.apply_filter()  # 新的或修改後的提醒符合搜尋條件時才顯示
+
+    def apply_filter(self, text=None):
+        """
+        以核心的提醒索引查詢符合的提醒 id,只顯示這些列。
+        """
+        text = self.filter_edit.text() if text is None else text
+        self.proxy_model.set_matches(self.core.index.search(text))
 
     def add_reminder(self):
         """
         新增提醒事件。
         """
-        self.add_dialog = AddReminderDialog(self)
-        # self.add_dialog.exec()
+        # 第一次新增時才創建對話框,之後重置欄位後重複使用
+        if self.add_dialog is None:
+            self.add_dialog = AddReminderDialog(self)
+        else:
+            self.add_dialog.reset()
+        self.add_dialog.set_groups(list(self.core.groups()))
         if self.add_dialog.exec() == QDialog.DialogCode.Accepted:
-            self.populate_table()  # 更新表格顯示
-        # add_dialog = AddReminderDialog(self)
-        # if add_dialog.exec() == QMessageBox.StandardButton.Ok:
-        #     new_reminder = {
-        #         "time": add_dialog.time_edit.time().toString("hh:mm:ss"),
-        #         "action": add_dialog.action_edit.text(),
-        #         "type": add_dialog.type_combo.currentText(),
-        #         "image": add_dialog.image_edit.text(),
-        #     }
-        #     self.parent().reminders.append(new_reminder)  # 將新提醒添加到父類別的提醒列表
-        #     self.populate_table()  # 更新表格顯示
-        #     self.save_reminders_to_json()  # 保存到 JSON
+            # 寫入儲存後端並排入排程器,表格只插入一列
+            self.core.add(self.add_dialog.reminder)
+            group = self.add_dialog.reminder["group"]
+            if group and not self.group_list.findItems(group, Qt.MatchFlag.MatchExactly):
+                self.refresh_groups()  # 新的群組
 
     def delete_reminder(self):
         """
         刪除選中的提醒事件。
         """
-        selected_rows = self.table.selectionModel().selectedRows()
-        for row in reversed(selected_rows):
-            del self.parent().reminders[row.row()]  # 刪除父類別中的提醒事件
-        self.populate_table()  # 更新表格顯示
-        self.save_reminders_to_json()  # 保存到 JSON
-
-    def save_reminders_to_json(self):
-        """
-        將提醒事件資料保存到 JSON 檔案中。
-        """
-        with open("reminders.json", "w") as f:
-            json.dump(self.parent().reminders, f, indent=4)  # 將父類別的提醒列表寫入 JSON
+        selected_rows = self.proxy_model.source_rows(self.table.selectionModel().selectedRows())
+        # 從儲存後端刪除並取消排程,表格只移除對應的列
+        self.core.remove_many([self.core.reminders[row] for row in selected_rows])
@@ -0,0 +1,38 @@
+class SimulatedClock:
+    """
+    模擬時鐘,取代 time.time / time.monotonic 注入 ReminderScheduler 與 ClockMonitor,
+    可以在幾秒內重播一整年的排程,也能模擬休眠與手動調整時間。
+    """
+
+    def __init__(self, start):
+        self.wall = float(start)  # epoch 秒數
+        self.elapsed = 0.0  # 單調時鐘
+
+    def time(self):
+        return self.wall
+
+    def monotonic(self):
+        return self.elapsed
+
+    def advance(self, seconds):
+        """
+        正常經過 seconds 秒,系統時間與單調時鐘一起前進。
+        """
+        self.wall += seconds
+        self.elapsed += seconds
+
+    def advance_to(self, timestamp):
+        if timestamp > self.wall:
+            self.advance(timestamp - self.wall)
+
+    def suspend(self, seconds):
+        """
+        休眠 seconds 秒:只有系統時間前進,單調時鐘停止。
+        """
+        self.wall += seconds
+
+    def set_time(self, timestamp):
+        """
+        手動調整系統時間(可往前或往後),單調時鐘不受影響。
+        """
+        self.wall = float(timestamp)
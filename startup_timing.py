@@ -0,0 +1,44 @@
+"""
+啟動時間分析。設定環境變數 REMINDER_STARTUP_TIMING=1 後,
+每個階段(匯入、建立視窗、第一次繪製、載入提醒)的耗時會輸出到 stderr。
+此模組應該最先匯入,才能涵蓋後續的匯入時間。
+"""
+import os
+import sys
+import time
+
+ENABLED = os.environ.get("REMINDER_STARTUP_TIMING", "") not in ("", "0")
+
+_start = time.perf_counter()
+_last = _start
+
+
+def mark(name):
+    """
+    記錄一個啟動階段,輸出與上一階段的間隔及累計時間。
+    """
+    global _last
+    if not ENABLED:
+        return
+    now = time.perf_counter()
+    print("[startup] %-24s +%8.1f ms  (累計 %8.1f ms)" % (name, (now - _last) * 1000, (now - _start) * 1000), file=sys.stderr, flush=True)
+    _last = now
+
+
+def watch_first_paint(widget):
+    """
+    在視窗第一次繪製時記錄 "first paint"。
+    """
+    if not ENABLED:
+        return
+    from PyQt6.QtCore import QEvent, QObject
+
+    class FirstPaintFilter(QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Type.Paint:
+                obj.removeEventFilter(self)
+                mark("first paint")
+            return False
+
+    widget._first_paint_filter = FirstPaintFilter(widget)
+    widget.installEventFilter(widget._first_paint_filter)
@@ -0,0 +1,22 @@
+from compact_reminders import CompactReminders
+
+
+def test_round_trip():
+    reminders = [
+        {"id": 1, "time": "09:00:00", "action": "喝水", "type": "彈窗", "image": "", "repeat": "every:30", "group": "健康", "priority": "高"},
+        {"time": "23:59:59", "action": "睡覺", "type": "彈幕", "image": "a.gif"},
+    ]
+    compact = CompactReminders(reminders)
+    assert list(compact) == [
+        {"id": 1, "time": "09:00:00", "action": "喝水", "type": "彈窗", "image": "", "repeat": "every:30", "group": "健康", "priority": "高"},
+        {"time": "23:59:59", "action": "睡覺", "type": "彈幕", "image": "a.gif"},
+    ]
+    del compact[0]
+    assert len(compact) == 1 and compact.seconds_at(0) == 86399
+
+
+def test_more_than_65535_distinct_groups():
+    compact = CompactReminders(
+        {"time": "09:00:00", "action": "", "type": "彈窗", "group": "群組 %d" % index} for index in range(70000)
+    )
+    assert compact[69999]["group"] == "群組 69999"
@@ -0,0 +1,159 @@
+import pytest
+
+from reminder_core.dispatch import DispatchQueue, Dispatcher, TokenBucket
+from simulated_clock import SimulatedClock
+
+
+def reminder(reminder_id, action, priority=""):
+    return {"id": reminder_id, "time": "09:00:00", "action": action, "type": "彈窗", "image": "", "priority": priority}
+
+
+def drain(queue, clock):
+    released = []
+    while len(queue):
+        entry = queue.pop()
+        if entry is None:
+            clock.advance(queue.seconds_until_ready())
+            continue
+        released.append(entry)
+    return released
+
+
+def test_token_bucket_limits_rate():
+    clock = SimulatedClock(0)
+    bucket = TokenBucket(rate=2, burst=3, now=clock.time)
+    assert [bucket.take() for _ in range(4)] == [True, True, True, False]
+    assert bucket.seconds_until_token() == pytest.approx(0.5)
+    clock.advance(0.5)
+    assert bucket.take()
+
+
+def test_releases_by_priority_then_fifo():
+    clock = SimulatedClock(0)
+    queue = DispatchQueue(now=clock.time)
+    for index, priority in enumerate(["低", "", "高", "", "高"]):
+        queue.put(reminder(index, "提醒 %d" % index, priority))
+    assert [entry["action"] for entry in drain(queue, clock)] == ["提醒 2", "提醒 4", "提醒 1", "提醒 3", "提醒 0"]
+
+
+def test_same_action_merges_and_takes_higher_priority():
+    clock = SimulatedClock(0)
+    queue = DispatchQueue(burst=1, now=clock.time)
+    queue.put(reminder(1, "佔用權杖"))
+    queue.pop()
+    queue.put(reminder(2, "喝水", "低"))
+    queue.put(reminder(3, "開會"))
+    queue.put(reminder(4, "喝水", "高"))
+    released = drain(queue, clock)
+    assert [entry["action"] for entry in released] == ["喝水", "開會"]
+    assert [item["id"] for item in released[0]["reminders"]] == [2, 4]
+    assert queue.merged == 1
+
+
+def test_dedup_suppresses_other_reminders_with_same_action():
+    clock = SimulatedClock(0)
+    dropped = []
+    queue = DispatchQueue(dedup_seconds=60, on_drop=dropped.append, now=clock.time)
+    queue.put(reminder(1, "喝水"))
+    queue.pop()
+    clock.advance(30)
+    assert not queue.put(reminder(2, "喝水"))
+    assert [item["id"] for item in dropped] == [2]
+    clock.advance(30)
+    assert queue.put(reminder(3, "喝水"))  # 超過 dedup_seconds
+
+
+def test_dedup_never_suppresses_the_same_reminders_next_occurrence():
+    # every:1 每 60 秒觸發一次;上一次 drain 稍晚也不能被當成重複
+    clock = SimulatedClock(0)
+    queue = DispatchQueue(dedup_seconds=60, now=clock.time)
+    every_minute = reminder(1, "站起來")
+    queue.put(every_minute)
+    clock.advance(0.05)
+    queue.pop()
+    clock.advance(59.96)
+    assert queue.put(dict(every_minute))  # 背景服務推送的是新的 dict,但 id 相同
+    assert queue.deduped == 0
+
+
+@pytest.mark.parametrize("overflow, kept", [
+    ("drop_lowest", ["高 a", "一般 b", "高 d"]),
+    ("drop_oldest", ["一般 b", "低 c", "高 d"]),
+    ("drop_new", ["高 a", "一般 b", "低 c"]),
+])
+def test_overflow_policies(overflow, kept):
+    clock = SimulatedClock(0)
+    dropped = []
+    queue = DispatchQueue(max_depth=3, overflow=overflow, on_drop=dropped.append, now=clock.time)
+    for index, (priority, name) in enumerate([("高", "a"), ("", "b"), ("低", "c"), ("高", "d")]):
+        queue.put(reminder(index, "%s %s" % (priority or "一般", name), priority))
+    assert sorted(entry["action"] for entry in drain(queue, clock)) == sorted(kept)
+    assert len(dropped) == 1 and queue.dropped == 1
+
+
+def test_drop_lowest_drops_newcomer_on_tie():
+    clock = SimulatedClock(0)
+    queue = DispatchQueue(max_depth=2, now=clock.time)
+    queue.put(reminder(1, "a"))
+    queue.put(reminder(2, "b"))
+    assert not queue.put(reminder(3, "c"))
+    assert [entry["action"] for entry in drain(queue, clock)] == ["a", "b"]
+
+
+def test_invalid_overflow_policy():
+    with pytest.raises(ValueError):
+        DispatchQueue(overflow="drop_all")
+
+
+class History:
+    def __init__(self):
+        self.events = []
+
+    def record(self, reminder_id, kind):
+        self.events.append((reminder_id, kind))
+
+
+def test_dispatcher_records_missed_and_merged_outcomes():
+    clock = SimulatedClock(0)
+    history = History()
+    shown = []
+    dispatcher = Dispatcher(history, queue=DispatchQueue(burst=1, max_depth=1, overflow="drop_new", now=clock.time))
+    dispatcher.attach(notify=lambda message, **kwargs: shown.append((message, kwargs["on_close"])))
+    dispatcher.wake = lambda: None
+    dispatcher.dispatch(reminder(1, "a"))
+    dispatcher.dispatch(reminder(2, "a"))  # 合併
+    dispatcher.dispatch(reminder(3, "b"))  # 佇列已滿
+    dispatcher.drain()
+    shown[0][1]("dismissed")
+    assert history.events == [(1, "fired"), (2, "fired"), (3, "fired"), (3, "missed"), (1, "dismissed"), (2, "dismissed")]
+
+
+def test_late_high_priority_jumps_backlog_when_notifier_is_full():
+    # 與 NotificationManager 相同:最多同時顯示 3 則,關閉一則才騰出空位
+    clock = SimulatedClock(0)
+    visible, shown = [], []
+    dispatcher = Dispatcher(queue=DispatchQueue(dedup_seconds=0, now=clock.time))
+    dispatcher.attach(notify=lambda message, **kwargs: (visible.append(message), shown.append(message)),
+                      available=lambda: 3 - len(visible))
+    dispatcher.wake = lambda: None
+    for index in range(30):
+        dispatcher.dispatch(reminder(index, "一般 %d" % index))
+    assert dispatcher.drain() is None  # 沒有空位時等外殼騰出空位,不排定計時器
+    assert len(shown) == 3 and len(dispatcher.queue) == 27
+    clock.advance(3)
+    dispatcher.dispatch(reminder(99, "高", "高"))
+    assert dispatcher.drain() is None and len(shown) == 3
+    visible.pop(0)  # 使用者關閉一則通知
+    dispatcher.drain()
+    assert shown[3] == "高"
+
+
+def test_frontend_of_daemon_records_only_the_outcome():
+    # 背景服務已記錄觸發,前端只記錄回應,多個前端也不會重複計算觸發
+    history = History()
+    shown = []
+    dispatcher = Dispatcher(history, record_fired=False)
+    dispatcher.attach(notify=lambda message, **kwargs: shown.append(kwargs["on_close"]))
+    dispatcher.dispatch(reminder(1, "a"))
+    shown[0]("dismissed")
+    assert history.events == [(1, "dismissed")]
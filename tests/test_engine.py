@@ -0,0 +1,40 @@
+from reminder_client import DaemonError
+from reminder_core import ReminderCore
+from reminder_store import ReminderStore
+from simulated_clock import SimulatedClock
+
+
+def new_reminder(action="喝水"):
+    return {"time": "09:00:00", "action": action, "type": "彈窗", "image": ""}
+
+
+def test_snooze_ignores_reminder_deleted_while_shown():
+    clock = SimulatedClock(0)
+    core = ReminderCore(ReminderStore(":memory:", legacy_json=None), now=clock.time)
+    core.load()
+    reminder = core.add(new_reminder())
+    core.remove(reminder)
+    core.snooze(reminder)
+    assert core.seconds_until_next() is None
+
+
+def test_snooze_survives_daemon_error():
+    class Client:
+        def snooze(self, reminder_id, seconds):
+            raise DaemonError("KeyError: %d" % reminder_id)
+
+    core = ReminderCore(client=Client())
+    reminder = dict(new_reminder(), id=1)
+    core.reminders_by_id[1] = reminder
+    core.snooze(reminder)  # 不會拋出例外
+
+
+def test_fallback_to_local_store_records_fires():
+    class Client:
+        def close(self):
+            pass
+
+    core = ReminderCore(client=Client())
+    assert not core.dispatcher.record_fired  # 背景服務記錄觸發
+    core.use_store(ReminderStore(":memory:", legacy_json=None))
+    assert core.dispatcher.record_fired
@@ -0,0 +1,36 @@
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from media_playback import PlaybackWorker
+
+
+class Channel(QObject):
+    finished = pyqtSignal()
+    loads = []
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.path = None
+
+    def load(self, path):
+        if path != self.path:
+            Channel.loads.append(path)
+            self.path = path
+
+    def play(self, path):
+        self.load(path)
+
+
+def test_preload_sets_sources_on_idle_channels(tmp_path):
+    paths = []
+    for name in ("a.wav", "b.wav", "c.wav", "d.wav"):
+        (tmp_path / name).write_bytes(b"")
+        paths.append(str(tmp_path / name))
+    Channel.loads = []
+    worker = PlaybackWorker(3, Channel)
+    worker.preload(paths + [str(tmp_path / "missing.wav")])
+    assert Channel.loads == paths[:3]  # 最多 max_concurrent 個,不存在的檔案略過
+    worker.preload(paths[:2])
+    assert worker.preloaded == 3  # 已載入的頻道保留不動
+    worker.play(paths[1])
+    assert worker.active[paths[1]].path == paths[1]
+    assert Channel.loads == paths[:3]  # 播放時使用已預先載入的頻道,不必重新載入
@@ -0,0 +1,69 @@
+from datetime import datetime
+
+import pytest
+
+from recurrence import RecurrenceError, next_occurrence, occurrences, validate_rule
+from reminder_core import ReminderCore, ReminderStore
+from reminder_scheduler import ReminderScheduler
+
+
+def test_daily_and_weekly():
+    after = datetime(2024, 3, 4, 10, 0, 0)  # 週一
+    assert next_occurrence("", 9 * 3600, after) == datetime(2024, 3, 5, 9, 0, 0)
+    assert next_occurrence("weekly:2", 9 * 3600, after) == datetime(2024, 3, 6, 9, 0, 0)
+    assert next_occurrence("weekdays", 9 * 3600, datetime(2024, 3, 8, 10, 0, 0)) == datetime(2024, 3, 11, 9, 0, 0)
+
+
+def test_every_stops_at_end_of_day():
+    fires = list(occurrences("every:10", 23 * 3600 + 30 * 60, datetime(2024, 3, 4, 23, 0), datetime(2024, 3, 5, 0, 0)))
+    assert fires == [datetime(2024, 3, 4, 23, 30), datetime(2024, 3, 4, 23, 40), datetime(2024, 3, 4, 23, 50)]
+
+
+def test_monthly_clamps_to_last_day():
+    assert next_occurrence("monthly:31", 0, datetime(2024, 2, 1)) == datetime(2024, 2, 29)
+
+
+def test_cron():
+    after = datetime(2024, 3, 4, 9, 10, 0)
+    assert next_occurrence("cron:*/30 9-17 * * 1-5", 0, after) == datetime(2024, 3, 4, 9, 30, 0)
+    validate_rule("cron:0 0 29 2 *")  # 每四年一次也算會觸發
+
+
+def test_cron_weekdays_use_cron_numbering():
+    # 與 crontab 相同:1-5 是週一到週五,0 與 7 都是週日
+    friday = datetime(2024, 3, 8, 10, 0, 0)
+    assert next_occurrence("cron:0 9 * * 1-5", 0, friday) == datetime(2024, 3, 11, 9, 0, 0)
+    assert next_occurrence("cron:0 9 * * 0", 0, friday) == datetime(2024, 3, 10, 9, 0, 0)
+    assert next_occurrence("cron:0 9 * * 7", 0, friday) == datetime(2024, 3, 10, 9, 0, 0)
+
+
+@pytest.mark.parametrize("rule", ["every:0", "weekly:7", "monthly:32", "cron:* * *", "cron:61 * * * *", "cron:0 9 * * 8", "hourly"])
+def test_invalid_rules(rule):
+    with pytest.raises(RecurrenceError):
+        validate_rule(rule)
+
+
+def test_cron_that_never_fires_is_rejected():
+    with pytest.raises(RecurrenceError):
+        validate_rule("cron:0 0 31 2 *")
+
+
+def test_core_rejects_never_firing_rule_before_writing():
+    store = ReminderStore(":memory:", legacy_json=None)
+    core = ReminderCore(store)
+    core.load()
+    with pytest.raises(RecurrenceError):
+        core.add({"time": "09:00:00", "action": "x", "type": "彈窗", "repeat": "cron:0 0 31 2 *"})
+    assert store.load() == []
+    core.load()
+    assert core.reminders == []
+
+
+def test_scheduler_skips_rules_that_fail_to_evaluate():
+    bad = {"id": 1, "time": "09:00:00", "action": "壞", "type": "彈窗", "repeat": "cron:0 0 31 2 *"}
+    good = {"id": 2, "time": "09:00:00", "action": "好", "type": "彈窗", "repeat": ""}
+    scheduler = ReminderScheduler([bad, good], now=lambda: datetime(2024, 3, 4, 8, 0).timestamp())
+    assert scheduler.skipped == 1
+    assert len(scheduler) == 1
+    assert scheduler.add(bad) is None
+    assert list(scheduler.upcoming(datetime(2024, 3, 5).timestamp())) == [good]
@@ -0,0 +1,32 @@
+import pytest
+
+from fire_history import FireHistory
+from reminder_daemon import ReminderDaemon
+from reminder_store import ReminderStore
+
+
+@pytest.fixture
+def daemon():
+    store = ReminderStore(":memory:", legacy_json=None)
+    daemon = ReminderDaemon(store, "/tmp/unused.sock", history=FireHistory(":memory:", threaded=False))
+    yield daemon
+    daemon.history.close()
+    store.close()
+
+
+@pytest.mark.parametrize("request_data", [
+    "x",
+    [1, 2],
+    {"command": "add", "reminder": "x"},
+    {"command": "update", "reminder": [1]},
+])
+def test_malformed_requests_raise_value_error(daemon, request_data):
+    # _handle_client 把 ValueError 轉成 {"ok": False},連線不會中斷
+    with pytest.raises(ValueError):
+        daemon.handle_request(request_data)
+
+
+def test_add_then_list(daemon):
+    response = daemon.handle_request({"command": "add", "reminder": {"time": "09:00:00", "action": "喝水", "type": "彈窗"}})
+    assert response["ok"]
+    assert [reminder["action"] for reminder in daemon.handle_request({"command": "list"})["reminders"]] == ["喝水"]
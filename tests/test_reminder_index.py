@@ -0,0 +1,66 @@
+from reminder_index import ReminderIndex, index_tokens, query_terms
+
+
+def reminder(reminder_id, time, action, group=""):
+    return {"id": reminder_id, "time": time, "action": action, "type": "彈窗", "image": "", "group": group}
+
+
+REMINDERS = [
+    reminder(1, "08:30:00", "喝水"),
+    reminder(2, "12:00:00", "午餐 lunch"),
+    reminder(3, "23:30:00", "吃藥", group="健康"),
+    reminder(4, "01:00:00", "review PR"),
+    reminder(5, "09:15:00", "daily standup"),
+]
+
+
+def test_tokens_split_words_and_cjk_bigrams():
+    assert index_tokens("喝水 Stand up") == {"喝", "水", "喝水", "stand", "up"}
+    assert query_terms("打電話 PR") == (["pr"], ["打電", "電話"])
+
+
+def test_search_text_matches_words_by_prefix():
+    index = ReminderIndex(REMINDERS)
+    assert index.search("stand") == {5}
+    assert index.search("REVIEW pr") == {4}
+    assert index.search("找不到") == set()
+
+
+def test_search_cjk_phrase_must_be_contiguous():
+    index = ReminderIndex(REMINDERS + [reminder(6, "10:00:00", "打電話"), reminder(7, "10:00:00", "打電 話說")])
+    assert index.search("打電話") == {6}
+    assert index.search("藥") == {3}
+
+
+def test_search_group_and_empty_query():
+    index = ReminderIndex(REMINDERS)
+    assert index.search("健康") == {3}
+    assert index.search("") is None
+
+
+def test_time_range_queries_wrap_midnight():
+    index = ReminderIndex(REMINDERS)
+    assert index.search("08:00-12:00") == {1, 2, 5}
+    assert index.search("22:00-02:00") == {3, 4}
+    assert index.search("22:00-02:00 吃藥") == {3}
+
+
+def test_incremental_add_update_remove():
+    index = ReminderIndex(REMINDERS)
+    assert len(index) == 5
+    index.add(reminder(6, "18:00:00", "stretch"))
+    assert index.search("str") == {6}
+    index.update(reminder(6, "07:00:00", "散步"))
+    assert index.search("stretch") == set()
+    assert index.search("07:00-07:30 散步") == {6}
+    index.remove(6)
+    assert index.search("散步") == set()
+    assert len(index) == 5
+
+
+def test_updates_before_first_build_are_applied():
+    index = ReminderIndex(REMINDERS)
+    index.remove(1)
+    index.add(reminder(6, "08:45:00", "喝茶"))
+    assert index.search("喝") == {6}
+    assert index.search("08:00-09:00") == {6}
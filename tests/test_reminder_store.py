@@ -0,0 +1,50 @@
+from reminder_store import ReminderStore, diff_changes
+
+
+def make(action, group=""):
+    return {"time": "09:00:00", "action": action, "type": "彈窗", "image": "", "repeat": "", "group": group}
+
+
+def test_add_unique_batches_counts_only_new_rows():
+    store = ReminderStore(":memory:", legacy_json=None)
+    assert store.add_unique_batches([[make("a", "工作"), make("b")], [make("a", "工作")]]) == 2
+    assert store.add_unique_batches([[make("a", "工作"), make("c")]]) == 1
+    assert len(store.load()) == 3
+
+
+def test_changes_since_reports_added_updated_and_deleted():
+    store = ReminderStore(":memory:", legacy_json=None)
+    first, second = make("a"), make("b")
+    store.add_many([first, second])
+    version = store.version()
+    first["action"] = "改過"
+    store.update(first)
+    store.delete(second["id"])
+    third = make("c")
+    store.add(third)
+    version, changes = store.changes_since(version)
+    assert changes[first["id"]]["action"] == "改過"
+    assert changes[second["id"]] is None
+    assert changes[third["id"]]["action"] == "c"
+    assert store.changes_since(version)[1] == {}
+
+
+def test_diff_changes_keeps_identity_and_skips_identical():
+    existing = {1: dict(make("a"), id=1), 2: dict(make("b"), id=2)}
+    original = existing[1]
+    added, updated, removed = diff_changes(existing, {1: dict(make("a2"), id=1), 2: None, 3: dict(make("c"), id=3)})
+    assert updated == [original] and original["action"] == "a2"
+    assert [reminder["action"] for reminder in removed] == ["b"]
+    assert [reminder["action"] for reminder in added] == ["c"]
+    assert diff_changes(existing, {1: dict(make("a2"), id=1)}) == ([], [], [])
+
+
+def test_export_json_round_trips_through_legacy_import(tmp_path):
+    store = ReminderStore(":memory:", legacy_json=None)
+    store.add_many([make("喝水", "健康"), dict(make("開會"), repeat="weekdays", priority="高")])
+    path = str(tmp_path / "export.json")
+    store.export_json(path)
+    imported = ReminderStore(str(tmp_path / "imported.db"), legacy_json=path)
+    strip = lambda reminders: [{key: value for key, value in reminder.items() if key != "id"} for reminder in reminders]
+    assert strip(imported.load()) == strip(store.load())
+    imported.close()